@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+"""
+Benchmarks of the scan engine against the local AWS stand-in (mock_aws.py)
+
+Every scenario starts its own mock_aws.py, then runs enumerate_iam() in a
+separate process with the endpoint URL pointing at it, and reports:
+
+    * throughput: tested operations per second
+    * p50 / p99: latency of the API calls as seen by the scanner, botocore
+      retries included
+    * peak RSS and CPU time per operation of the scan process
+
+The scan process only runs the scan, so its resource usage (from wait4())
+doesn't include the mock or the benchmark itself. Save the results with
+--output and compare a later run with --baseline to catch regressions in the
+thread pool, the rate limiter, the client cache or the result handling:
+
+    python benchmarks/bench_scan.py --output baseline.json
+    python benchmarks/bench_scan.py --baseline baseline.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MOCK_AWS = os.path.join(ROOT, 'benchmarks', 'mock_aws.py')
+
+DEFAULT_MOCK = {'allow_ratio': 0.1,
+                'throttle_rate': 0.0,
+                'latency': 0.02,
+                'latency_distribution': 'lognormal',
+                'payload_size': 256}
+
+SCENARIOS = {
+    'thread': {'scan': {'engine': 'thread'}},
+    'async': {'scan': {'engine': 'async'}},
+    'throttled-adaptive': {'mock': {'throttle_rate': 0.02},
+                           'scan': {'engine': 'thread', 'adaptive': True}},
+    'rate-limited': {'scan': {'engine': 'thread', 'rate_limit': 200}},
+    'multi-region-small-cache': {'scan': {'engine': 'thread',
+                                          'regions': ['us-east-1', 'eu-west-1', 'ap-southeast-2'],
+                                          'client_cache_size': 100}},
+    'large-payloads': {'mock': {'allow_ratio': 0.5, 'payload_size': 65536},
+                       'scan': {'engine': 'thread', 'result_detail': 'full'}},
+}
+
+# Metric: True when higher is better
+METRICS = {'throughput': True,
+           'p50_ms': False,
+           'p99_ms': False,
+           'peak_rss_mb': False,
+           'cpu_ms_per_operation': False}
+
+DEFAULT_THRESHOLD = 0.15
+
+
+def get_percentile(values, percentile):
+    if not values:
+        return
+
+    values = sorted(values)
+    return values[min(int(len(values) * percentile), len(values) - 1)]
+
+
+def run_worker(options, endpoint_url, report_file):
+    """
+    Run one scan in this process and write its measurements to report_file
+    """
+    from enumerate_iam.main import METRICS as SCAN_METRICS, enumerate_iam, get_session
+    from enumerate_iam.outcomes import OUTCOMES
+
+    latencies = []
+
+    def before_call(context, **kwargs):
+        context['benchmark_start'] = time.perf_counter()
+
+    def after_call(context, **kwargs):
+        start = context.get('benchmark_start')
+        if start is not None:
+            latencies.append(time.perf_counter() - start)
+
+    sessions = [get_session().events]
+
+    if options.get('engine') == 'async':
+        from enumerate_iam.async_engine import get_session as get_async_session
+        sessions.append(get_async_session())
+
+    for events in sessions:
+        events.register('before-call', before_call)
+        events.register('after-call', after_call)
+
+    start = time.perf_counter()
+
+    enumerate_iam('AKIABENCHMARK0000000',
+                  'benchmark-secret-key',
+                  None,
+                  options.get('region', 'us-east-1'),
+                  rate_limit=options.get('rate_limit'),
+                  engine=options.get('engine', 'thread'),
+                  client_cache_size=options.get('client_cache_size'),
+                  adaptive=options.get('adaptive', False),
+                  regions=options.get('regions'),
+                  result_detail=options.get('result_detail', 'full'),
+                  endpoint_url=endpoint_url)
+
+    elapsed = time.perf_counter() - start
+    counts = SCAN_METRICS.get_counts()
+
+    report = {'elapsed': elapsed,
+              'operations': sum(counts.get(outcome, 0) for outcome in OUTCOMES),
+              'requests': len(latencies),
+              'p50': get_percentile(latencies, 0.5),
+              'p99': get_percentile(latencies, 0.99),
+              'counts': counts}
+
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f)
+
+
+def start_mock(options):
+    """
+    :return: The mock_aws.py process and its URL
+    """
+    command = [sys.executable, MOCK_AWS]
+
+    for name, value in options.items():
+        command += ['--' + name.replace('_', '-'), str(value)]
+
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    return process, process.stdout.readline().strip()
+
+
+def get_peak_rss_mb(rusage):
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    if sys.platform == 'darwin':
+        return rusage.ru_maxrss / (1024 * 1024)
+
+    return rusage.ru_maxrss / 1024
+
+
+def run_scenario(name, scenario, mock_overrides):
+    mock_options = {**DEFAULT_MOCK, **scenario.get('mock', {}), **mock_overrides}
+    scan_options = scenario.get('scan', {})
+
+    mock, endpoint_url = start_mock(mock_options)
+
+    with tempfile.TemporaryDirectory() as directory:
+        report_file = os.path.join(directory, 'report.json')
+        log_file = os.path.join(directory, 'scan.log')
+
+        try:
+            with open(log_file, 'w', encoding='utf-8') as log:
+                worker = subprocess.Popen([sys.executable, os.path.abspath(__file__),
+                                           '--worker', json.dumps(scan_options),
+                                           '--endpoint-url', endpoint_url,
+                                           '--report', report_file],
+                                          stdout=log,
+                                          stderr=subprocess.STDOUT)
+
+                # wait4() gives the resource usage of this process only
+                _, status, rusage = os.wait4(worker.pid, 0)
+                worker.returncode = os.waitstatus_to_exitcode(status)
+        finally:
+            mock.terminate()
+            mock.wait()
+
+        if worker.returncode != 0 or not os.path.exists(report_file):
+            with open(log_file, 'r', encoding='utf-8') as log:
+                tail = log.read()[-2000:]
+
+            print(f'❌ {name} failed (exit code {worker.returncode}):\n{tail}', file=sys.stderr)
+            return
+
+        with open(report_file, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+
+    operations = report['operations'] or 1
+    cpu_seconds = rusage.ru_utime + rusage.ru_stime
+
+    return {'operations': report['operations'],
+            'requests': report['requests'],
+            'elapsed': report['elapsed'],
+            'throughput': report['operations'] / report['elapsed'],
+            'p50_ms': report['p50'] * 1000 if report['p50'] is not None else None,
+            'p99_ms': report['p99'] * 1000 if report['p99'] is not None else None,
+            'peak_rss_mb': get_peak_rss_mb(rusage),
+            'cpu_seconds': cpu_seconds,
+            'cpu_ms_per_operation': cpu_seconds * 1000 / operations,
+            'mock': mock_options,
+            'scan': scan_options}
+
+
+def format_value(value):
+    return '-' if value is None else '%.1f' % value
+
+
+def print_results(results):
+    columns = ['operations', 'elapsed', 'throughput', 'p50_ms', 'p99_ms', 'peak_rss_mb', 'cpu_ms_per_operation']
+    width = max([len(name) for name in results] + [8])
+
+    print('%-*s  %s' % (width, 'scenario', '  '.join('%10s' % column for column in columns)))
+
+    for name, result in results.items():
+        print('%-*s  %s' % (width, name, '  '.join('%*s' % (max(len(column), 10), format_value(result[column]))
+                                                    for column in columns)))
+
+
+def compare(results, baseline, threshold):
+    """
+    :return: The regressions, one line each, of the metrics which are more
+             than threshold worse than in the baseline
+    """
+    regressions = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        for metric, higher_is_better in METRICS.items():
+            value, previous = result.get(metric), baseline[name].get(metric)
+
+            if not value or not previous:
+                continue
+
+            change = (value - previous) / previous
+            worse = -change if higher_is_better else change
+
+            if worse > threshold:
+                regressions.append(f'{name} {metric}: {format_value(previous)} -> {format_value(value)} '
+                                   f'({change:+.0%})')
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the scan engine against a local AWS stand-in')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='Scenario to run, can be repeated (default: all)')
+    parser.add_argument('--output', metavar='FILE', help='Write the results to FILE as JSON')
+    parser.add_argument('--baseline', metavar='FILE',
+                        help='Compare with the results in FILE and exit with 1 on a regression')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Relative change of a metric reported as a regression (default: %(default)s)')
+    parser.add_argument('--latency', type=float, help='Median latency of the mock for every scenario')
+    parser.add_argument('--latency-distribution', choices=('fixed', 'uniform', 'exponential', 'lognormal'))
+    parser.add_argument('--allow-ratio', type=float, help='Allowed share of the operations for every scenario')
+    parser.add_argument('--throttle-rate', type=float, help='Throttled share of the requests for every scenario')
+    parser.add_argument('--payload-size', type=int, help='Padding of the allowed responses for every scenario')
+
+    # Internal, the scan process of one scenario
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--endpoint-url', help=argparse.SUPPRESS)
+    parser.add_argument('--report', help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(json.loads(args.worker), args.endpoint_url, args.report)
+        return 0
+
+    mock_overrides = {name: getattr(args, name)
+                      for name in ('latency', 'latency_distribution', 'allow_ratio', 'throttle_rate', 'payload_size')
+                      if getattr(args, name) is not None}
+
+    results = {}
+
+    for name in args.scenario or list(SCENARIOS):
+        print(f'Running {name}...', flush=True)
+
+        result = run_scenario(name, SCENARIOS[name], mock_overrides)
+        if result is not None:
+            results[name] = result
+
+    print()
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+
+        if regressions:
+            print('\nRegressions:')
+            for regression in regressions:
+                print('  ' + regression)
+            return 1
+
+        print('\nNo regression above %d%%' % (args.threshold * 100))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
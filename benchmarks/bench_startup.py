@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+"""
+Startup benchmark of enumerate-iam.py
+
+Wrappers start the tool thousands of times a day, and --help, invalid
+arguments and unreadable credential files have to return without loading
+boto3. Every scenario runs a command in a fresh interpreter and reports:
+
+    * wall: the median wall time of --repeat runs, the interpreter included
+    * imports: the median import time of the modules the command loads on
+      top of a bare interpreter, from --repeat runs with python -X importtime
+    * the slowest of these imports, with --top
+
+A scenario fails when its import time is over its budget, or when it loads
+one of its forbidden modules:
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --budget-scale 2 --top 10
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT, 'enumerate-iam.py')
+
+# Modules which are only needed once a scan starts
+SCAN_MODULES = ('boto3', 'botocore', 'aiobotocore', 'urllib3', 'asyncio', 'multiprocessing')
+
+# budget: import time in milliseconds
+SCENARIOS = {
+    'help': {'command': [CLI, '--help'],
+             'budget': 50,
+             'forbidden': SCAN_MODULES},
+    'invalid-arguments': {'command': [CLI, '--engine', 'invalid'],
+                          'budget': 50,
+                          'forbidden': SCAN_MODULES},
+    'missing-request-file': {'command': [CLI, '--no-update', '--request', os.path.join(ROOT, 'missing.txt')],
+                             'budget': 50,
+                             'forbidden': SCAN_MODULES},
+    'import-main': {'command': ['-c', 'import enumerate_iam.main'],
+                    'budget': 100,
+                    'forbidden': ('boto3', 'aiobotocore', 'urllib3', 'asyncio', 'multiprocessing')},
+}
+
+DEFAULT_REPEAT = 5
+DEFAULT_TOP = 5
+
+
+def parse_importtime(output):
+    """
+    :return: A dict of module -> (self time, cumulative time) in
+             milliseconds, from the -X importtime lines of output
+    """
+    modules = {}
+
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        modules[name.strip()] = (int(self_us) / 1000, int(cumulative_us) / 1000)
+
+    return modules
+
+
+def run_importtime(command):
+    process = subprocess.run([sys.executable, '-X', 'importtime'] + command,
+                             cwd=ROOT,
+                             stdin=subprocess.DEVNULL,
+                             stdout=subprocess.DEVNULL,
+                             stderr=subprocess.PIPE,
+                             text=True)
+
+    return parse_importtime(process.stderr)
+
+
+def run_wall(command, repeat):
+    """
+    :return: The median wall time of repeat runs of command, in milliseconds
+    """
+    times = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + command,
+                       cwd=ROOT,
+                       stdin=subprocess.DEVNULL,
+                       stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(times)
+
+
+def run_scenario(scenario, interpreter_modules, repeat, budget_scale):
+    runs = []
+
+    for _ in range(repeat):
+        modules = run_importtime(scenario['command'])
+
+        # The modules of a bare interpreter (site, encodings, .pth files)
+        # are not the tool's
+        loaded = {name: times for name, times in modules.items() if name not in interpreter_modules}
+        runs.append((sum(self_ms for self_ms, _ in loaded.values()), loaded))
+
+    # The run with the median import time, a single run is too noisy
+    imports_ms, loaded = sorted(runs, key=lambda run: run[0])[len(runs) // 2]
+    budget = scenario['budget'] * budget_scale
+
+    result = {'wall_ms': run_wall(scenario['command'], repeat),
+              'imports_ms': imports_ms,
+              'budget_ms': budget,
+              'modules': len(loaded),
+              'forbidden': sorted(name for name in loaded
+                                  if name.split('.')[0] in scenario['forbidden']),
+              'slowest': sorted(((name, self_ms) for name, (self_ms, _) in loaded.items()),
+                                key=lambda item: item[1], reverse=True)}
+
+    result['passed'] = result['imports_ms'] <= budget and not result['forbidden']
+    return result
+
+
+def print_results(results, top):
+    width = max([len(name) for name in results] + [8])
+
+    print('%-*s  %9s  %10s  %9s  %7s' % (width, 'scenario', 'wall_ms', 'imports_ms', 'budget_ms', 'modules'))
+
+    for name, result in results.items():
+        print('%-*s  %9.1f  %10.1f  %9.1f  %7d  %s' % (width,
+                                                      name,
+                                                      result['wall_ms'],
+                                                      result['imports_ms'],
+                                                      result['budget_ms'],
+                                                      result['modules'],
+                                                      '✅' if result['passed'] else '❌'))
+
+        for module, self_ms in result['slowest'][:top]:
+            print('%-*s      %8.1f  %s' % (width, '', self_ms, module))
+
+        if result['forbidden']:
+            print('%-*s      imports %s' % (width, '', ', '.join(result['forbidden'][:top])))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the startup time of enumerate-iam.py')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='Scenario to run, can be repeated (default: all)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help='Runs of each command for the median times (default: %(default)s)')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP,
+                        help='Slowest imports shown for each scenario (default: %(default)s)')
+    parser.add_argument('--budget-scale', type=float, default=1.0,
+                        help='Multiply every budget, e.g. on a slow CI runner (default: %(default)s)')
+    parser.add_argument('--output', metavar='FILE', help='Write the results to FILE as JSON')
+    args = parser.parse_args()
+
+    interpreter_modules = run_importtime(['-c', 'pass'])
+    results = {}
+
+    for name in args.scenario or list(SCENARIOS):
+        results[name] = run_scenario(SCENARIOS[name], interpreter_modules, args.repeat, args.budget_scale)
+
+    print_results(results, args.top)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    failed = [name for name, result in results.items() if not result['passed']]
+
+    if failed:
+        print(f'\nOver budget or loading scan modules: {", ".join(failed)}')
+        return 1
+
+    print('\nEvery scenario is within its startup budget')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,355 @@
+#!/usr/bin/env python
+"""
+Local stand-in for the AWS endpoints, for benchmarks of the scan engine
+
+Answers every request sent through an endpoint URL override in the format of
+the service's protocol (json, rest-json, query, ec2, rest-xml and
+smithy-rpc-v2-cbor), so botocore parses the responses as it parses real ones:
+
+    * each operation is allowed or denied, allow-ratio of the operations are
+      allowed and the same ones on every run
+    * allowed responses carry payload-size bytes of padding
+    * throttle-rate of the requests are answered with a throttling error
+    * every response is delayed by a latency drawn from a fixed, uniform,
+      exponential or lognormal distribution
+
+Usage:
+
+    python benchmarks/mock_aws.py --port 8765 --allow-ratio 0.1 --latency 0.02
+"""
+import sys
+import json
+import math
+import time
+import zlib
+import random
+import argparse
+import threading
+
+from urllib.parse import parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'exponential', 'lognormal')
+
+# The protocols which can't be told apart from the request alone, by signing name
+REST_XML_SIGNING_NAMES = {'cloudfront', 'route53', 's3'}
+EC2_SIGNING_NAMES = {'ec2'}
+
+THROTTLING_CODES = {
+    'json': (400, 'ThrottlingException'),
+    'rest-json': (429, 'ThrottlingException'),
+    'smithy-rpc-v2-cbor': (400, 'ThrottlingException'),
+    'query': (400, 'Throttling'),
+    'ec2': (503, 'RequestLimitExceeded'),
+    'rest-xml': (503, 'SlowDown'),
+}
+
+DENIED_CODES = {
+    'json': (400, 'AccessDeniedException'),
+    'rest-json': (403, 'AccessDeniedException'),
+    'smithy-rpc-v2-cbor': (400, 'AccessDeniedException'),
+    'query': (403, 'AccessDenied'),
+    'ec2': (403, 'UnauthorizedOperation'),
+    'rest-xml': (403, 'AccessDenied'),
+}
+
+# The IAM enumeration reads these members of its responses when the calls are
+# allowed, the other operations only need a well-formed response
+BENCHMARK_USER_ARN = 'arn:aws:iam::123456789012:user/benchmark'
+IAM_RESULTS = {
+    'GetUser': f'<User><Path>/</Path><UserName>benchmark</UserName><UserId>AIDABENCHMARK0000000</UserId>'
+               f'<Arn>{BENCHMARK_USER_ARN}</Arn><CreateDate>2020-01-01T00:00:00Z</CreateDate></User>',
+    'GetRole': '<Role><Path>/</Path><RoleName>benchmark</RoleName><RoleId>AROABENCHMARK0000000</RoleId>'
+               '<Arn>arn:aws:iam::123456789012:role/benchmark</Arn><CreateDate>2020-01-01T00:00:00Z</CreateDate>'
+               '</Role>',
+    'ListAttachedUserPolicies': '<AttachedPolicies/><IsTruncated>false</IsTruncated>',
+    'ListAttachedRolePolicies': '<AttachedPolicies/><IsTruncated>false</IsTruncated>',
+    'ListAttachedGroupPolicies': '<AttachedPolicies/><IsTruncated>false</IsTruncated>',
+    'ListUserPolicies': '<PolicyNames/><IsTruncated>false</IsTruncated>',
+    'ListRolePolicies': '<PolicyNames/><IsTruncated>false</IsTruncated>',
+    'ListGroupPolicies': '<PolicyNames/><IsTruncated>false</IsTruncated>',
+    'ListGroupsForUser': '<Groups/><IsTruncated>false</IsTruncated>',
+}
+CALLER_IDENTITY_RESULT = (f'<Arn>{BENCHMARK_USER_ARN}</Arn><UserId>AIDABENCHMARK0000000</UserId>'
+                          f'<Account>123456789012</Account>')
+
+
+def encode_cbor_text(text):
+    data = text.encode('utf-8')
+    length = len(data)
+
+    if length < 24:
+        header = bytes([0x60 + length])
+    elif length < 0x100:
+        header = bytes([0x78, length])
+    elif length < 0x10000:
+        header = bytes([0x79]) + length.to_bytes(2, 'big')
+    else:
+        header = bytes([0x7a]) + length.to_bytes(4, 'big')
+
+    return header + data
+
+
+def encode_cbor_map(values):
+    """
+    Encode a small dict of strings, all the rpc-v2-cbor responses need
+    """
+    body = bytes([0xa0 + len(values)])
+
+    for key, value in values.items():
+        body += encode_cbor_text(key) + encode_cbor_text(value)
+
+    return body
+
+
+def get_signing_name(headers):
+    # Credential=<access key>/<date>/<region>/<signing name>/aws4_request
+    authorization = headers.get('Authorization', '')
+    scope = authorization.partition('Credential=')[2].split(',')[0].split('/')
+    return scope[3] if len(scope) > 3 else ''
+
+
+def get_protocol(headers, form, signing_name):
+    if headers.get('smithy-protocol') == 'rpc-v2-cbor':
+        return 'smithy-rpc-v2-cbor'
+
+    if headers.get('X-Amz-Target'):
+        return 'json'
+
+    if 'Action' in form:
+        return 'ec2' if signing_name in EC2_SIGNING_NAMES else 'query'
+
+    if signing_name in REST_XML_SIGNING_NAMES:
+        return 'rest-xml'
+
+    return 'rest-json'
+
+
+def get_operation(headers, form, path):
+    target = headers.get('X-Amz-Target')
+    if target:
+        return target.rpartition('.')[2]
+
+    if 'Action' in form:
+        return form['Action'][0]
+
+    if '/operation/' in path:
+        # rpc-v2-cbor: /service/<service>/operation/<operation>
+        return path.rpartition('/')[2]
+
+    return path.split('?')[0]
+
+
+def is_allowed(signing_name, operation, allow_ratio):
+    """
+    The same operations are allowed on every run, a hash of the operation
+    decides rather than the random generator
+    """
+    return zlib.crc32(f'{signing_name}:{operation}'.encode('utf-8')) / 0xffffffff < allow_ratio
+
+
+def make_error(protocol, status, code, message):
+    if protocol == 'json':
+        return status, {'Content-Type': 'application/x-amz-json-1.1'}, \
+            json.dumps({'__type': code, 'message': message}).encode('utf-8')
+
+    if protocol == 'rest-json':
+        return status, {'Content-Type': 'application/json', 'x-amzn-ErrorType': code}, \
+            json.dumps({'message': message}).encode('utf-8')
+
+    if protocol == 'smithy-rpc-v2-cbor':
+        return status, {'Content-Type': 'application/cbor', 'smithy-protocol': 'rpc-v2-cbor'}, \
+            encode_cbor_map({'__type': code, 'message': message})
+
+    if protocol == 'ec2':
+        return status, {'Content-Type': 'text/xml;charset=UTF-8'}, \
+            (f'<Response><Errors><Error><Code>{code}</Code><Message>{message}</Message></Error></Errors>'
+             f'<RequestID>0</RequestID></Response>').encode('utf-8')
+
+    if protocol == 'rest-xml':
+        return status, {'Content-Type': 'application/xml'}, \
+            f'<Error><Code>{code}</Code><Message>{message}</Message><RequestId>0</RequestId></Error>'.encode('utf-8')
+
+    return status, {'Content-Type': 'text/xml'}, \
+        (f'<ErrorResponse><Error><Type>Sender</Type><Code>{code}</Code><Message>{message}</Message></Error>'
+         f'<RequestId>0</RequestId></ErrorResponse>').encode('utf-8')
+
+
+def make_allowed(protocol, operation, padding, signing_name=None):
+    if protocol in ('json', 'rest-json'):
+        content_type = 'application/x-amz-json-1.1' if protocol == 'json' else 'application/json'
+        return 200, {'Content-Type': content_type}, json.dumps({'Padding': padding}).encode('utf-8')
+
+    if protocol == 'smithy-rpc-v2-cbor':
+        return 200, {'Content-Type': 'application/cbor', 'smithy-protocol': 'rpc-v2-cbor'}, \
+            encode_cbor_map({'Padding': padding})
+
+    if protocol == 'ec2':
+        return 200, {'Content-Type': 'text/xml;charset=UTF-8'}, \
+            (f'<{operation}Response><requestId>0</requestId><padding>{padding}</padding>'
+             f'</{operation}Response>').encode('utf-8')
+
+    if protocol == 'rest-xml':
+        return 200, {'Content-Type': 'application/xml'}, f'<Response><Padding>{padding}</Padding></Response>'.encode('utf-8')
+
+    if signing_name == 'iam':
+        result = IAM_RESULTS.get(operation, '')
+    elif signing_name == 'sts' and operation == 'GetCallerIdentity':
+        result = CALLER_IDENTITY_RESULT
+    else:
+        result = ''
+
+    return 200, {'Content-Type': 'text/xml'}, \
+        (f'<{operation}Response><{operation}Result>{result}<Padding>{padding}</Padding></{operation}Result>'
+         f'<ResponseMetadata><RequestId>0</RequestId></ResponseMetadata></{operation}Response>').encode('utf-8')
+
+
+class MockAWS:
+    def __init__(self, allow_ratio=0.1, throttle_rate=0.0, latency=0.02, latency_distribution='fixed',
+                 latency_sigma=0.5, payload_size=256, seed=0):
+        self.allow_ratio = allow_ratio
+        self.throttle_rate = throttle_rate
+        self.latency = latency
+        self.latency_distribution = latency_distribution
+        self.latency_sigma = latency_sigma
+        self.padding = 'x' * payload_size
+
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {'requests': 0, 'allowed': 0, 'denied': 0, 'throttled': 0}
+
+    def get_latency(self):
+        with self.lock:
+            if self.latency_distribution == 'uniform':
+                return self.random.uniform(0, 2 * self.latency)
+
+            if self.latency_distribution == 'exponential':
+                return self.random.expovariate(1 / self.latency) if self.latency else 0
+
+            if self.latency_distribution == 'lognormal':
+                # latency is the median
+                return self.random.lognormvariate(math.log(self.latency), self.latency_sigma) if self.latency else 0
+
+            return self.latency
+
+    def count(self, name):
+        with self.lock:
+            self.counts['requests'] += 1
+            self.counts[name] += 1
+
+    def respond(self, headers, path, body):
+        """
+        :return: The status, headers and body of the response
+        """
+        form = parse_qs(body.decode('utf-8', 'replace')) if b'Action=' in body else {}
+        signing_name = get_signing_name(headers)
+        protocol = get_protocol(headers, form, signing_name)
+        operation = get_operation(headers, form, path)
+
+        with self.lock:
+            throttled = self.throttle_rate and self.random.random() < self.throttle_rate
+
+        if throttled:
+            self.count('throttled')
+            status, code = THROTTLING_CODES[protocol]
+            return make_error(protocol, status, code, 'Rate exceeded')
+
+        # Like AWS, which never denies it
+        allowed = (signing_name == 'sts' and operation == 'GetCallerIdentity' or
+                   is_allowed(signing_name, operation, self.allow_ratio))
+        self.count('allowed' if allowed else 'denied')
+
+        if form.get('DryRun') == ['true']:
+            if allowed:
+                return make_error(protocol, 412, 'DryRunOperation',
+                                  'Request would have succeeded, but DryRun flag is set.')
+
+            return make_error(protocol, 403, 'UnauthorizedOperation', 'You are not authorized.')
+
+        if allowed:
+            return make_allowed(protocol, operation, self.padding, signing_name)
+
+        status, code = DENIED_CODES[protocol]
+        return make_error(protocol, status, code, f'Not authorized to perform {operation}')
+
+
+def make_handler(mock):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def handle_request(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else b''
+
+            if self.path == '/__stats':
+                status, headers, response = 200, {'Content-Type': 'application/json'}, \
+                    json.dumps(mock.counts).encode('utf-8')
+            else:
+                time.sleep(mock.get_latency())
+                status, headers, response = mock.respond(self.headers, self.path, body)
+
+            self.send_response(status)
+
+            for name, value in headers.items():
+                self.send_header(name, value)
+
+            self.send_header('Content-Length', str(len(response)))
+            self.end_headers()
+
+            if self.command != 'HEAD':
+                self.wfile.write(response)
+
+        do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = do_HEAD = handle_request
+
+    return Handler
+
+
+class MockAWSServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    # Hundreds of connections are opened at once by the async engine
+    request_queue_size = 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the AWS endpoints')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0, help='0 to pick a free port (default: %(default)s)')
+    parser.add_argument('--allow-ratio', type=float, default=0.1,
+                        help='Share of the operations which are allowed (default: %(default)s)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0,
+                        help='Share of the requests answered with a throttling error (default: %(default)s)')
+    parser.add_argument('--latency', type=float, default=0.02, metavar='SECONDS',
+                        help='Median latency of the responses (default: %(default)s)')
+    parser.add_argument('--latency-distribution', choices=LATENCY_DISTRIBUTIONS, default='fixed')
+    parser.add_argument('--latency-sigma', type=float, default=0.5,
+                        help='Sigma of the lognormal latency distribution (default: %(default)s)')
+    parser.add_argument('--payload-size', type=int, default=256, metavar='BYTES',
+                        help='Padding added to the allowed responses (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    mock = MockAWS(allow_ratio=args.allow_ratio,
+                   throttle_rate=args.throttle_rate,
+                   latency=args.latency,
+                   latency_distribution=args.latency_distribution,
+                   latency_sigma=args.latency_sigma,
+                   payload_size=args.payload_size,
+                   seed=args.seed)
+
+    server = MockAWSServer((args.host, args.port), make_handler(mock))
+
+    # The benchmark reads the URL from the first line
+    print(f'http://{args.host}:{server.server_address[1]}', flush=True)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,14 +2,15 @@
 """
 EVA enumerate-iam - AWS IAM Permission Enumerator
 
-Automatically pulls latest updates from GitHub before execution.
+Pulls the latest updates from GitHub in the background, at most once per
+--update-interval, the pulled code is used from the next launch on.
 """
 import argparse
 import sys
-import subprocess
 import os
 import json
 import re
+import time
 from datetime import datetime, timezone
 
 
@@ -27,7 +28,8 @@ def parse_request_file(file_path):
         }
     }
     
-    Returns: tuple (access_key, secret_key, session_token)
+    Returns: tuple (access_key, secret_key, session_token, expire_time), expire_time
+             is a datetime or None when the Expiration is missing or can't be parsed
     """
     try:
         with open(file_path, 'r') as f:
@@ -93,6 +95,7 @@ def parse_request_file(file_path):
         
         # Check expiration time if available
         expiration = creds.get('Expiration')
+        expire_time = None
         if expiration:
             try:
                 # Handle both Unix timestamp (as number) and ISO format strings
@@ -113,11 +116,12 @@ def parse_request_file(file_path):
                 else:
                     print(f"   ⏰ Expiration:   {minutes_remaining} minutes remaining")
             except Exception as e:
+                expire_time = None
                 print(f"   ⏰ Expiration:   {expiration} (could not parse)")
         
         print()
         
-        return access_key, secret_key, session_token
+        return access_key, secret_key, session_token, expire_time
         
     except FileNotFoundError:
         print(f"❌ Error: Request file not found: {file_path}")
@@ -127,38 +131,147 @@ def parse_request_file(file_path):
         sys.exit(1)
 
 
-def main():
-    # Auto-update: Pull latest changes from GitHub BEFORE any imports
-    print("🔄 Checking for updates from GitHub...", flush=True)
-    try:
-        # Get the script directory
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        # Run git pull
-        result = subprocess.run(
-            ['git', 'pull', 'origin', 'master'],
-            cwd=script_dir,
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        
-        if result.returncode == 0:
-            output = result.stdout.strip()
-            if 'Already up to date' in output:
-                print("✅ Already up to date")
-            elif output:
-                print(f"📥 Updated from GitHub:")
-                print(f"   {output}")
-            print()
-    except subprocess.TimeoutExpired:
-        print("⚠️  Git pull timed out, continuing anyway...\n")
-    except Exception as e:
-        # Show error but don't block
-        print(f"⚠️  Could not check for updates: {type(e).__name__}\n")
+def start_metrics_exporter(args):
+    """
+    :return: A started MetricsExporter, None when no metrics file is requested
+    """
+    if not args.metrics_json and not args.metrics_prometheus:
+        return
 
-    # Import after git pull to ensure latest code is loaded
-    from enumerate_iam.main import enumerate_iam
+    from enumerate_iam.main import HISTOGRAMS, METRICS
+    from enumerate_iam.histograms import MetricsExporter
+
+    return MetricsExporter(HISTOGRAMS,
+                           METRICS,
+                           json_file=args.metrics_json,
+                           prometheus_file=args.metrics_prometheus,
+                           interval=args.metrics_interval).start()
+
+
+def report_last_update(state):
+    """
+    Print the result of the background update check of an earlier launch
+    """
+    from enumerate_iam.updater import UPDATED
+
+    if state is None:
+        return
+
+    if state['result'] == UPDATED:
+        print("📥 Updated from GitHub (in the background, during an earlier run):")
+        for line in state.get('output', '').splitlines():
+            print(f"   {line}")
+    else:
+        output = state.get('output') or 'git pull failed'
+        print(f"⚠️  Could not check for updates: {output.splitlines()[0]}")
+
+    print()
+
+
+def start_profiler(args):
+    """
+    :return: The Profiler of the selected phases, None when --profile is not set
+    """
+    from enumerate_iam.profiling import Profiler, set_profiler
+
+    if not args.profile:
+        return
+
+    profiler = Profiler(args.profile, phases=args.profile_phases, output=args.profile_output)
+    set_profiler(profiler)
+
+    return profiler
+
+
+def start_cassette(args):
+    """
+    :return: The CassetteRecorder or CassettePlayer, None when the scan sends
+             its requests to AWS
+    """
+    if not args.record_cassette and not args.replay_cassette:
+        return
+
+    from enumerate_iam.cassette import CassettePlayer, CassetteRecorder, set_cassette
+
+    if args.record_cassette:
+        cassette = CassetteRecorder(args.record_cassette)
+    else:
+        cassette = CassettePlayer(args.replay_cassette,
+                                  latency=args.replay_latency,
+                                  jitter=args.replay_jitter,
+                                  throttle_rate=args.replay_throttle_rate,
+                                  seed=args.replay_seed)
+
+    set_cassette(cassette)
+    return cassette
+
+
+def open_result_cache(args):
+    """
+    :return: The ResultCache, None when --cache-mode is off
+    """
+    from enumerate_iam.result_cache import OFF, ResultCache
+
+    if args.cache_mode == OFF:
+        return
+
+    return ResultCache(args.cache_file, mode=args.cache_mode, ttl=args.cache_ttl)
+
+
+def import_scan_modules(args):
+    """
+    Import every module the scan uses, and open the operation catalog, before
+    the update check starts: a git pull which lands during the scan must not
+    mix new modules with the ones this process already loaded
+    """
+    import enumerate_iam.main
+    from enumerate_iam.catalog import get_catalog
+    from enumerate_iam.engines import ASYNC
+
+    get_catalog()
+
+    if args.engine == ASYNC:
+        try:
+            import enumerate_iam.async_engine
+        except ImportError:
+            # aiobotocore is missing, the scan reports it and falls back to
+            # the thread engine
+            pass
+
+
+def start_update(args):
+    """
+    Start the background update check, once the scan modules are imported
+    """
+    if args.no_update:
+        return
+
+    from enumerate_iam.updater import start_update_check
+
+    import_scan_modules(args)
+
+    # git pull runs in the background and never delays the scan, what it
+    # pulls is used from the next launch on
+    start_update_check(os.path.dirname(os.path.abspath(__file__)), interval=args.update_interval)
+
+
+def main():
+    # Imported here rather than at the top, a pull from an earlier launch may
+    # have updated the code since this script started. These modules don't
+    # import boto3 / botocore, so --help and invalid arguments or credentials
+    # return without loading them: enumerate_iam.main is only imported when
+    # the scan starts
+    from enumerate_iam.engines import ENGINES, THREAD
+    from enumerate_iam.histograms import DEFAULT_EXPORT_INTERVAL
+    from enumerate_iam.batch import enumerate_batch, load_credential_sets, DEFAULT_CONCURRENCY
+    from enumerate_iam.rate_limiter import parse_service_rate_limit
+    from enumerate_iam.sinks import JSONLSink
+    from enumerate_iam.checkpoint import Checkpoint
+    from enumerate_iam.regions import parse_regions
+    from enumerate_iam.result_detail import FULL, RESULT_DETAILS
+    from enumerate_iam.profiling import DEFAULT_OUTPUT, PHASES, PROFILE_MODES, parse_phases
+    from enumerate_iam.updater import DEFAULT_UPDATE_INTERVAL, pop_update_notice
+    from enumerate_iam.result_cache import CACHE_MODES, DEFAULT_TTL, OFF, get_default_cache_file
     from enumerate_iam.__version__ import __version__
 
     # Parse arguments
@@ -166,29 +279,185 @@ def main():
         description=f'Enumerate IAM permissions (v{__version__})',
         epilog='''
 Regenerating Service List:
-  To regenerate the complete list of AWS services from the SDK:
-    cd enumerate_iam/
-    git clone https://github.com/aws/aws-sdk-js.git
-    python generate_bruteforce_tests.py
-    rm -rf aws-sdk-js
+  To regenerate the complete list of AWS services from botocore's service models:
+    pip install --upgrade botocore
+    python -m enumerate_iam.generate_bruteforce_tests
         ''',
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
 
     parser.add_argument('-r', '--request', help='Path to file containing AWS credentials (HTTP response with JSON)')
+    parser.add_argument('--batch', metavar='PATH',
+                       help='Scan every credential set in PATH (a file or a directory of files, in --request '
+                            'or JSON format) in one process')
+    parser.add_argument('--batch-concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                       help=f'Number of credential sets scanned at the same time in --batch mode '
+                            f'(default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--output-dir', default='results', metavar='DIR',
+                       help='Directory for the <access key>.json result files of --batch mode (default: results)')
     parser.add_argument('--access-key', help='AWS access key')
     parser.add_argument('--secret-key', help='AWS secret key')
     parser.add_argument('--session-token', help='STS session token')
     parser.add_argument('--region', help='AWS region to send API requests to', default='us-east-1')
+    parser.add_argument('--endpoint-url', metavar='URL',
+                       help='Send every request to URL instead of the AWS endpoints, e.g. a local stand-in '
+                            'or LocalStack')
+    parser.add_argument('--regions', type=parse_regions, metavar='REGION[,REGION...]',
+                       help='Comma separated regions to sweep in one scan, or "all" (the enabled regions). '
+                            'Global services are tested once and the results are keyed by region')
     parser.add_argument('--rate-limit', type=float, default=0.0,
                        help='Global requests per second across all threads (0 = unlimited)')
+    parser.add_argument('--service-rate-limit', type=parse_service_rate_limit, action='append', default=[],
+                       metavar='SERVICE[@REGION]=RATE',
+                       help='Requests per second for one service, or one service in one region, on top of '
+                            '--rate-limit. Use *=RATE to give every service its own bucket. Can be repeated')
+    parser.add_argument('--engine', choices=ENGINES, default=THREAD,
+                       help='Bruteforce scan engine: "thread" (25 threads) or "async" (hundreds of '
+                            'requests in flight, requires aiobotocore)')
+    parser.add_argument('--adaptive', action='store_true',
+                       help='Adapt the requests in flight and the request rate to throttling responses '
+                            '(multiplicative decrease on throttling, additive increase on success)')
+    parser.add_argument('--output-jsonl', metavar='FILE',
+                       help='Stream every allowed operation and its response to FILE as JSON lines, '
+                            'written as soon as each operation completes')
+    parser.add_argument('--checkpoint', metavar='FILE',
+                       help='Record the outcome of every tested operation in FILE')
+    parser.add_argument('--resume', action='store_true',
+                       help='Load --checkpoint FILE and skip the operations it already finished, '
+                            'e.g. to continue a scan with fresh credentials')
+    parser.add_argument('--time-budget', type=float, metavar='SECONDS',
+                       help='Stop sending operations after SECONDS and test the most valuable ones first. '
+                            'The Expiration in a --request file is used as a deadline automatically')
+    parser.add_argument('--prefetch', action='store_true',
+                       help='Resolve the endpoint hostname of every service before the scan starts, and skip '
+                            'the services whose hostname does not resolve')
+    parser.add_argument('--warm-connections', action='store_true',
+                       help='Like --prefetch, and also open one TLS connection per service before the scan '
+                            'starts (thread engine)')
+    parser.add_argument('--dry-run-probe', action='store_true',
+                       help='Call the operations which accept DryRun (mostly EC2) with DryRun=True: the answer '
+                            'only says whether the permission is granted, without the response payload, and '
+                            'operations with required parameters are probed with placeholder values')
+    parser.add_argument('--result-detail', choices=RESULT_DETAILS, default=FULL,
+                       help='How much of each allowed response is kept: "permission" (only that it is '
+                            'allowed), "summary" (size, top-level keys and item counts) or "full". With '
+                            '"full" and --output-jsonl or --batch the responses are streamed to disk and '
+                            'only their summary is kept in memory (default: %(default)s)')
+    parser.add_argument('--metrics-json', metavar='FILE',
+                       help='Write latency histograms (queue wait, rate limiter wait, client construction, '
+                            'request time, retries) per service and region, and the operation counts, to FILE '
+                            'as JSON')
+    parser.add_argument('--metrics-prometheus', metavar='FILE',
+                       help='Write the same metrics to FILE in the Prometheus text format, e.g. for the '
+                            'node_exporter textfile collector')
+    parser.add_argument('--metrics-interval', type=float, default=DEFAULT_EXPORT_INTERVAL, metavar='SECONDS',
+                       help='Also write the metrics files every SECONDS while the scan runs, 0 to only write '
+                            'them at the end (default: %(default)s)')
+    parser.add_argument('--profile', choices=PROFILE_MODES,
+                       help='Profile the scan phases selected with --profile-phases: "cprofile" writes a pstats '
+                            'file, "sampling" samples the stacks of every thread with a much lower overhead and '
+                            'writes collapsed stacks for flame graphs')
+    parser.add_argument('--profile-phases', type=parse_phases, default=list(PHASES), metavar='PHASE[,PHASE...]',
+                       help=f'Comma separated phases to profile, out of {", ".join(PHASES)} (default: all)')
+    parser.add_argument('--profile-output', default=DEFAULT_OUTPUT, metavar='PREFIX',
+                       help='The profile is written to PREFIX.pstats (cprofile) or PREFIX.collapsed (sampling) '
+                            '(default: %(default)s)')
+    parser.add_argument('--record-cassette', metavar='FILE',
+                       help='Record every response of the scan to FILE (.gz to compress it), without the '
+                            'credentials, to replay the scan offline with --replay-cassette')
+    parser.add_argument('--replay-cassette', metavar='FILE',
+                       help='Serve the responses recorded in FILE instead of sending the requests to AWS, '
+                            'for reproducible benchmarks without network access')
+    parser.add_argument('--replay-latency', type=float, default=0.05, metavar='SECONDS',
+                       help='Latency of every replayed response (default: %(default)s)')
+    parser.add_argument('--replay-jitter', type=float, default=0.0, metavar='SECONDS',
+                       help='Add a random delay between 0 and SECONDS to every replayed response '
+                            '(default: %(default)s)')
+    parser.add_argument('--replay-throttle-rate', type=float, default=0.0, metavar='FRACTION',
+                       help='Answer FRACTION of the replayed requests with a throttling error '
+                            '(default: %(default)s)')
+    parser.add_argument('--replay-seed', type=int, default=0,
+                       help='Seed of the replay jitter and throttling, for reproducible runs '
+                            '(default: %(default)s)')
+    parser.add_argument('--cache-mode', choices=CACHE_MODES, default=OFF,
+                       help='Cache of the outcomes of earlier scans of the same principal (sts '
+                            'get_caller_identity) and operation catalog: "read" reuses the fresh outcomes, '
+                            '"write" also stores the outcome of every tested operation, "refresh" tests '
+                            'every operation and stores the outcomes (default: %(default)s)')
+    parser.add_argument('--cache-file', default=get_default_cache_file(), metavar='FILE',
+                       help='SQLite database of the result cache (default: %(default)s)')
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_TTL, metavar='SECONDS',
+                       help='Cached outcomes older than SECONDS are tested again (default: %(default)s)')
+    parser.add_argument('--no-update', action='store_true',
+                       help='Do not check GitHub for updates')
+    parser.add_argument('--update-interval', type=float, default=DEFAULT_UPDATE_INTERVAL, metavar='SECONDS',
+                       help='Check GitHub for updates (git pull, in the background) at most once every SECONDS '
+                            '(default: %(default)s)')
+    parser.add_argument('--client-cache-size', type=int, default=None,
+                       help='Maximum number of boto3 clients kept alive, least recently used '
+                            'clients are evicted first (default: 1024)')
 
     args = parser.parse_args()
 
+    if not args.no_update:
+        report_last_update(pop_update_notice(os.path.dirname(os.path.abspath(__file__))))
+
+    if args.resume and not args.checkpoint:
+        parser.error('--resume requires --checkpoint')
+
+    if args.record_cassette and args.replay_cassette:
+        parser.error('--record-cassette and --replay-cassette are mutually exclusive')
+
+    if args.batch:
+        if args.checkpoint or args.output_jsonl:
+            parser.error('--checkpoint and --output-jsonl are not supported in --batch mode')
+
+        credential_sets = load_credential_sets(args.batch)
+        if not credential_sets:
+            parser.error(f'no credentials found in {args.batch}')
+
+        cassette = start_cassette(args)
+        exporter = start_metrics_exporter(args)
+        profiler = start_profiler(args)
+        result_cache = open_result_cache(args)
+
+        start_update(args)
+
+        try:
+            enumerate_batch(credential_sets,
+                            args.output_dir,
+                            args.region,
+                            concurrency=args.batch_concurrency,
+                            rate_limit=args.rate_limit,
+                            engine=args.engine,
+                            client_cache_size=args.client_cache_size,
+                            service_rate_limits=dict(args.service_rate_limit),
+                            adaptive=args.adaptive,
+                            time_budget=args.time_budget,
+                            regions=args.regions,
+                            prefetch=args.prefetch or args.warm_connections,
+                            dry_run=args.dry_run_probe,
+                            result_detail=args.result_detail,
+                            endpoint_url=args.endpoint_url,
+                            result_cache=result_cache)
+        finally:
+            if result_cache is not None:
+                result_cache.close()
+            if exporter is not None:
+                exporter.stop()
+            if profiler is not None:
+                profiler.write()
+            if cassette is not None:
+                cassette.close()
+
+        return
+
+    expire_time = None
+
     # Determine credential source
     if args.request:
         # Parse credentials from file
-        access_key, secret_key, session_token = parse_request_file(args.request)
+        access_key, secret_key, session_token, expire_time = parse_request_file(args.request)
         
         # Override with command-line args if provided
         if args.access_key:
@@ -206,12 +475,59 @@ Regenerating Service List:
         secret_key = args.secret_key
         session_token = args.session_token
 
+    # The scan stops sending operations at the earliest of the credential
+    # expiration and the time budget
+    expiration = None
+    if expire_time is not None and expire_time.timestamp() > time.time():
+        expiration = expire_time.timestamp()
+
+    sink = JSONLSink(args.output_jsonl) if args.output_jsonl else None
+    checkpoint = Checkpoint(args.checkpoint, resume=args.resume) if args.checkpoint else None
+
+    cassette = start_cassette(args)
+    exporter = start_metrics_exporter(args)
+    profiler = start_profiler(args)
+    result_cache = open_result_cache(args)
+
+    from enumerate_iam.main import enumerate_iam
+
+    start_update(args)
+
     # Run the enumeration
-    enumerate_iam(access_key,
-                  secret_key,
-                  session_token,
-                  args.region,
-                  rate_limit=args.rate_limit)
+    try:
+        enumerate_iam(access_key,
+                      secret_key,
+                      session_token,
+                      args.region,
+                      rate_limit=args.rate_limit,
+                      engine=args.engine,
+                      client_cache_size=args.client_cache_size,
+                      service_rate_limits=dict(args.service_rate_limit),
+                      adaptive=args.adaptive,
+                      sink=sink,
+                      checkpoint=checkpoint,
+                      expiration=expiration,
+                      time_budget=args.time_budget,
+                      regions=args.regions,
+                      prefetch=args.prefetch,
+                      warm_connections=args.warm_connections,
+                      dry_run=args.dry_run_probe,
+                      result_detail=args.result_detail,
+                      endpoint_url=args.endpoint_url,
+                      result_cache=result_cache)
+    finally:
+        if sink is not None:
+            sink.close()
+        if checkpoint is not None:
+            checkpoint.close()
+        if result_cache is not None:
+            result_cache.close()
+        if exporter is not None:
+            exporter.stop()
+        if profiler is not None:
+            profiler.write()
+        if cassette is not None:
+            cassette.close()
 
 
 if __name__ == '__main__':
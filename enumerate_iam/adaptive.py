@@ -0,0 +1,242 @@
+"""
+Adaptive concurrency and rate control driven by throttling responses
+
+A throttled call (Throttling, RequestLimitExceeded, ...) is not a denied
+permission: the operation has to be tested again. AdaptiveController applies
+AIMD (additive increase, multiplicative decrease) to the number of requests
+in flight and to the request rate:
+
+    * Every throttling response cuts both by decrease_factor, at most once per
+      cooldown seconds, so a burst of throttles from requests which were
+      already in flight only counts once.
+
+    * Every successful response (allowed or denied) grows the concurrency by
+      1 / concurrency and the rate by rate_increase / rate, which is roughly
+      +1 request in flight and +rate_increase requests/second per round trip.
+"""
+import time
+import random
+import logging
+import threading
+
+import botocore.exceptions
+
+from enumerate_iam.rate_limiter import RateLimiter
+
+# Quota (LimitExceededException) and conflict (TransactionInProgressException)
+# errors are not listed, retrying doesn't help. The services which answer a
+# throttle with LimitExceededException send it with a 429 status code
+THROTTLING_ERROR_CODES = {
+    'Throttling',
+    'ThrottlingException',
+    'ThrottledException',
+    'RequestThrottledException',
+    'TooManyRequestsException',
+    'ProvisionedThroughputExceededException',
+    'RequestLimitExceeded',
+    'BandwidthLimitExceeded',
+    'RequestThrottled',
+    'SlowDown',
+    'PriorRequestNotComplete',
+    'EC2ThrottledException',
+}
+
+MAX_THROTTLE_RETRIES = 5
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 20.0
+
+
+def is_throttling_error(error):
+    if not isinstance(error, botocore.exceptions.ClientError):
+        return False
+
+    response = getattr(error, 'response', None) or {}
+    error_code = response.get('Error', {}).get('Code', None)
+
+    if error_code in THROTTLING_ERROR_CODES:
+        return True
+
+    status_code = response.get('ResponseMetadata', {}).get('HTTPStatusCode', None)
+    return status_code == 429
+
+
+def get_retry_delay(attempt):
+    """
+    Exponential backoff with full jitter before re-testing a throttled
+    operation for the attempt-th time (starting at 0).
+    """
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+
+def _wake_up(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class AdaptiveController:
+    def __init__(self, max_concurrency, min_concurrency=1, rate=None, min_rate=1.0,
+                 decrease_factor=0.5, rate_increase=1.0, cooldown=1.0):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency = float(max_concurrency)
+        self.in_flight = 0
+
+        # The rate starts unlimited (or at the user's --rate-limit) and is
+        # only enforced after the first throttling response
+        self.max_rate = float(rate) if rate else None
+        self.min_rate = min_rate
+        self.rate_limiter = RateLimiter(rate) if rate else None
+
+        self.decrease_factor = decrease_factor
+        self.rate_increase = rate_increase
+        self.cooldown = cooldown
+        self.last_decrease = 0.0
+
+        # Requests sent during the last second, used to pick the initial rate
+        # on the first throttling response
+        self.window_start = time.monotonic()
+        self.window_sent = 0
+        self.observed_rate = 0.0
+
+        self.throttled = 0
+        self.condition = threading.Condition()
+
+        # (event loop, future) of the enter_async() callers waiting for room,
+        # the event loops of a batch scan run in different threads
+        self.async_waiters = []
+
+    def try_enter(self):
+        with self.condition:
+            if self.in_flight >= int(self.concurrency):
+                return False
+
+            self.in_flight += 1
+            self._count_sent()
+            return True
+
+    def enter(self):
+        """
+        Block until there is room for one more request in flight, and the
+        adaptive rate allows sending it.
+        """
+        with self.condition:
+            while self.in_flight >= int(self.concurrency):
+                self.condition.wait()
+
+            self.in_flight += 1
+            self._count_sent()
+
+        rate_limiter = self.rate_limiter
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+
+    async def enter_async(self):
+        """
+        Like enter(), waiting on a future which exit() and a growing
+        concurrency resolve
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+            with self.condition:
+                if self.in_flight < int(self.concurrency):
+                    self.in_flight += 1
+                    self._count_sent()
+                    break
+
+                waiter = (loop, loop.create_future())
+                self.async_waiters.append(waiter)
+
+            try:
+                await waiter[1]
+            except asyncio.CancelledError:
+                with self.condition:
+                    if waiter in self.async_waiters:
+                        self.async_waiters.remove(waiter)
+                    else:
+                        # Already woken up, hand the room to the next waiter
+                        self._notify()
+                raise
+
+        rate_limiter = self.rate_limiter
+        if rate_limiter is not None:
+            await rate_limiter.acquire_async()
+
+    def exit(self):
+        with self.condition:
+            self.in_flight -= 1
+            self._notify()
+
+    def _notify(self):
+        """
+        Wake up one enter() and one enter_async() caller, self.condition must
+        be held
+        """
+        self.condition.notify()
+
+        while self.async_waiters:
+            loop, future = self.async_waiters.pop(0)
+
+            try:
+                loop.call_soon_threadsafe(_wake_up, future)
+            except RuntimeError:
+                # The event loop was closed
+                continue
+
+            return
+
+    def _count_sent(self):
+        now = time.monotonic()
+        elapsed = now - self.window_start
+
+        if elapsed >= 1.0:
+            self.observed_rate = self.window_sent / elapsed
+            self.window_start = now
+            self.window_sent = 0
+
+        self.window_sent += 1
+
+    def on_success(self):
+        with self.condition:
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1.0 / self.concurrency)
+
+            if self.rate_limiter is not None:
+                rate = self.rate_limiter.rate + self.rate_increase / max(self.rate_limiter.rate, 1.0)
+                if self.max_rate is not None:
+                    rate = min(self.max_rate, rate)
+                self._set_rate(rate)
+
+            self._notify()
+
+    def on_throttle(self, service_name, operation_name):
+        with self.condition:
+            self.throttled += 1
+
+            now = time.monotonic()
+            if now - self.last_decrease < self.cooldown:
+                return
+
+            self.last_decrease = now
+            self.concurrency = max(self.min_concurrency, self.concurrency * self.decrease_factor)
+
+            current_rate = self.rate_limiter.rate if self.rate_limiter is not None else self.observed_rate
+            rate = max(self.min_rate, current_rate * self.decrease_factor)
+
+            if self.rate_limiter is None:
+                self.rate_limiter = RateLimiter(rate)
+            else:
+                self._set_rate(rate)
+
+        logger = logging.getLogger()
+        logger.info('Throttled by %s.%s(), reducing to %d requests in flight and %.1f requests/second',
+                    service_name,
+                    operation_name,
+                    int(self.concurrency),
+                    rate)
+
+    def _set_rate(self, rate):
+        with self.rate_limiter.lock:
+            self.rate_limiter.rate = rate
+            self.rate_limiter.capacity = max(rate, 1.0)
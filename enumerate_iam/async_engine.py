@@ -0,0 +1,252 @@
+"""
+Asyncio scan engine for enumerate_using_bruteforce()
+
+The thread engine is limited to MAX_THREADS blocking boto3 calls at the same
+time. This engine sends the same catalog operations over aiobotocore's
+non-blocking HTTP stack, so hundreds of requests can be in flight from a single
+thread. Results are reported in the same format check_one_permission() uses.
+
+aiobotocore is an optional dependency, importing this module raises
+ImportError when it is not installed:
+
+    pip install aiobotocore
+"""
+import time
+import asyncio
+import logging
+import threading
+
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session as get_aio_session
+
+from enumerate_iam.adaptive import MAX_THROTTLE_RETRIES, get_retry_delay, is_throttling_error
+from enumerate_iam.cassette import register_cassette
+from enumerate_iam.client_cache import make_client_key
+from enumerate_iam.outcomes import INVALID, THROTTLED, get_operation_errors, is_dry_run_allowed, make_record
+from enumerate_iam.histograms import CLIENT_CONSTRUCTION, QUEUE_WAIT, RATE_LIMIT_WAIT, REQUEST
+from enumerate_iam.main import (DRY_RUN_RESULT,
+                                HISTOGRAMS,
+                                check_deadline,
+                                check_endpoint,
+                                count_operation,
+                                get_action_function,
+                                get_endpoint_url,
+                                get_operation_params,
+                                handle_operation_error,
+                                report_permission,
+                                report_response,
+                                report_throttle)
+
+AIO_SESSION = None
+AIO_SESSION_LOCK = threading.Lock()
+
+
+def get_session():
+    """
+    Return the aiobotocore Session shared by every run_bruteforce() call, so
+    the service models are only loaded once when several credential sets are
+    scanned in the same process.
+    """
+    global AIO_SESSION
+
+    if AIO_SESSION is not None:
+        return AIO_SESSION
+
+    with AIO_SESSION_LOCK:
+        if AIO_SESSION is None:
+            AIO_SESSION = get_aio_session()
+            register_cassette(AIO_SESSION.get_component('event_emitter'), is_async=True)
+
+    return AIO_SESSION
+
+
+class AsyncClientPool:
+    """
+    aiobotocore clients keyed like CLIENT_CACHE. Each client is created by a
+    single task, concurrent callers for the same key await the same future.
+    """
+    def __init__(self, max_in_flight):
+        self.session = get_session()
+        self.max_in_flight = max_in_flight
+        self.clients = {}
+
+    async def get_client(self, access_key, secret_key, session_token, service_name, region):
+        key = make_client_key(access_key, secret_key, session_token, service_name, region)
+
+        future = self.clients.get(key, None)
+        if future is None:
+            future = asyncio.ensure_future(self._create_client(access_key,
+                                                               secret_key,
+                                                               session_token,
+                                                               service_name,
+                                                               region))
+            self.clients[key] = future
+
+        return await future
+
+    async def _create_client(self, access_key, secret_key, session_token, service_name, region):
+        logger = logging.getLogger()
+        logger.debug('Getting async client for %s in region %s' % (service_name, region))
+
+        # check_one_permission() retries the throttled calls, not aiobotocore
+        config = AioConfig(connect_timeout=5,
+                           read_timeout=5,
+                           retries={'total_max_attempts': 1, 'mode': 'standard'},
+                           max_pool_connections=self.max_in_flight,
+                           inject_host_prefix=get_endpoint_url() is None)
+
+        start = time.perf_counter()
+
+        try:
+            context = self.session.create_client(
+                service_name,
+                aws_access_key_id=access_key,
+                aws_secret_access_key=secret_key,
+                aws_session_token=session_token,
+                region_name=region,
+                endpoint_url=get_endpoint_url(),
+                verify=False,
+                config=config,
+            )
+            return await context.__aenter__()
+        except Exception:
+            # The service might not be available in this region
+            return
+        finally:
+            HISTOGRAMS.observe(CLIENT_CONSTRUCTION, service_name, region, time.perf_counter() - start)
+
+    async def close(self):
+        for future in list(self.clients.values()):
+            if not future.done() or future.cancelled():
+                continue
+
+            client = future.result()
+            if client is not None:
+                await client.close()
+
+
+async def check_queued_permission(queued, client_pool, rate_limiter, controller, scheduler=None):
+    queued_at, arg_tuple = queued
+
+    HISTOGRAMS.observe(QUEUE_WAIT, arg_tuple[4], arg_tuple[3], time.perf_counter() - queued_at)
+    return await check_one_permission(arg_tuple, client_pool, rate_limiter, controller, scheduler)
+
+
+async def check_one_permission(arg_tuple, client_pool, rate_limiter, controller, scheduler=None):
+    access_key, secret_key, session_token, region, service_name, operation_name = arg_tuple
+    logger = logging.getLogger()
+
+    skipped = check_deadline(service_name, operation_name, region, scheduler)
+    if skipped is not None:
+        return skipped
+
+    count_operation(service_name)
+
+    unavailable = check_endpoint(service_name, operation_name, region)
+    if unavailable is not None:
+        return unavailable
+
+    service_client = await client_pool.get_client(access_key, secret_key, session_token, service_name, region)
+    if service_client is None:
+        return make_record(service_name, operation_name, region, INVALID)
+
+    action_function = get_action_function(service_client, service_name, operation_name)
+    if action_function is None:
+        return make_record(service_name, operation_name, region, INVALID)
+
+    params = get_operation_params(service_name, operation_name)
+
+    logger.debug('Testing %s.%s() in region %s' % (service_name, operation_name, region))
+
+    for attempt in range(MAX_THROTTLE_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(get_retry_delay(attempt - 1))
+
+        try:
+            action_response = await call_operation(action_function, service_name, region,
+                                                   rate_limiter, controller, params)
+        except get_operation_errors() as error:
+            if params and is_dry_run_allowed(error):
+                report_response(service_name, region, attempt)
+                return report_permission(service_name, operation_name, region, dict(DRY_RUN_RESULT))
+
+            if is_throttling_error(error):
+                if report_throttle(service_name, operation_name, region, attempt):
+                    continue
+
+                return make_record(service_name, operation_name, region, THROTTLED)
+
+            report_response(service_name, region, attempt)
+            return handle_operation_error(error, service_name, operation_name, region)
+
+        report_response(service_name, region, attempt)
+        return report_permission(service_name, operation_name, region, action_response)
+
+
+async def call_operation(action_function, service_name, region, rate_limiter, controller, params=None):
+    start = time.perf_counter()
+
+    if controller:
+        await controller.enter_async()
+
+    try:
+        if rate_limiter:
+            await rate_limiter.acquire_async(service_name, region)
+
+        request_start = time.perf_counter()
+        HISTOGRAMS.observe(RATE_LIMIT_WAIT, service_name, region, request_start - start)
+
+        try:
+            return await action_function(**(params or {}))
+        finally:
+            HISTOGRAMS.observe(REQUEST, service_name, region, time.perf_counter() - request_start)
+    finally:
+        if controller:
+            controller.exit()
+
+
+async def _run_bruteforce(args_generator, on_result, rate_limiter, controller, max_in_flight, scheduler):
+    client_pool = AsyncClientPool(max_in_flight)
+
+    # max_in_flight workers pull the operations from a bounded queue, so they
+    # are taken from args_generator as the requests complete instead of all
+    # being turned into tasks before the first one is sent
+    queue = asyncio.Queue(maxsize=max_in_flight)
+
+    async def produce():
+        for arg_tuple in args_generator:
+            await queue.put((time.perf_counter(), arg_tuple))
+
+        for _ in range(max_in_flight):
+            await queue.put(None)
+
+    async def work():
+        while True:
+            queued = await queue.get()
+            if queued is None:
+                return
+
+            on_result(await check_queued_permission(queued, client_pool, rate_limiter, controller, scheduler))
+
+    try:
+        await asyncio.gather(produce(), *[work() for _ in range(max_in_flight)])
+    finally:
+        await client_pool.close()
+
+
+def run_bruteforce(args_generator, on_result, rate_limiter, controller=None, max_in_flight=250, scheduler=None):
+    """
+    Test every operation yielded by args_generator with at most max_in_flight
+    concurrent requests, calling on_result() with each check_one_permission()
+    result as soon as it completes. The operations are skipped once the
+    deadline of scheduler (a DeadlineScheduler) is near. Ctrl+C cancels the in-flight requests,
+    the results which were already handed to on_result() are kept.
+    """
+    logger = logging.getLogger()
+
+    try:
+        asyncio.run(_run_bruteforce(args_generator, on_result, rate_limiter, controller, max_in_flight,
+                                    scheduler))
+    except KeyboardInterrupt:
+        print('')
+        logger.info('Ctrl+C received, cancelled all in-flight requests.')
@@ -0,0 +1,272 @@
+"""
+Batch mode: scan many credential sets in one process
+
+Starting the tool once per key pays for the boto3 import, the operation
+catalog, the service models and every client again for each key. A batch scan
+loads all of that once and scans several credential sets at the same time,
+sharing the rate limiter, the adaptive controller and the botocore session
+(and its model cache). The output of each credential set is written to its
+own JSON file. With the full result detail the responses are streamed to a
+JSON lines file per credential set while the scan runs, and the JSON file
+only holds their summary.
+
+Credential sets are read from a file, or from every file in a directory.
+A file can contain:
+
+    * An HTTP response with a JSON body holding "Credentials", the format
+      used by --request
+    * A JSON object, or a list of JSON objects, with AccessKeyId,
+      SecretAccessKey (or SecretKey) and optionally SessionToken
+    * One such JSON object per line
+"""
+import os
+import json
+import time
+import logging
+
+from datetime import datetime, timezone
+
+from enumerate_iam.sinks import JSONLSink
+from enumerate_iam.profiling import profile_phase
+from enumerate_iam.result_detail import FULL
+from enumerate_iam.utils.json_utils import json_encoder
+
+DEFAULT_CONCURRENCY = 4
+
+
+def parse_expiration(expiration):
+    """
+    :return: The expiration as a time.time() timestamp, None if it can't be parsed
+    """
+    try:
+        if isinstance(expiration, (int, float)):
+            return float(expiration)
+
+        return datetime.fromisoformat(str(expiration).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return
+
+
+def parse_credentials(data):
+    """
+    :param data: A dict with the credentials, or with a "Credentials" key
+                 holding them (STS and Cognito responses)
+    :return: A credential set dict, or None if data has no access key
+    """
+    if not isinstance(data, dict):
+        return
+
+    creds = data.get('Credentials', data)
+
+    access_key = creds.get('AccessKeyId') or creds.get('access_key')
+    secret_key = creds.get('SecretKey') or creds.get('SecretAccessKey') or creds.get('secret_key')
+    session_token = creds.get('SessionToken') or creds.get('session_token')
+
+    if not access_key or not secret_key:
+        return
+
+    expiration = creds.get('Expiration')
+
+    return {'access_key': str(access_key).strip(),
+            'secret_key': str(secret_key).strip(),
+            'session_token': str(session_token).strip() if session_token else None,
+            'expiration': parse_expiration(expiration) if expiration else None}
+
+
+def load_credential_file(filename):
+    """
+    :return: The list of credential sets found in filename
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # Skip the HTTP headers of a --request style file
+    json_start = min([index for index in (content.find('{'), content.find('[')) if index != -1], default=-1)
+    if json_start == -1:
+        return []
+
+    content = content[json_start:]
+
+    try:
+        documents = [json.loads(content)]
+    except ValueError:
+        # One JSON object per line
+        documents = [json.loads(line) for line in content.splitlines() if line.strip()]
+
+    credential_sets = []
+
+    for document in documents:
+        for data in document if isinstance(document, list) else [document]:
+            credentials = parse_credentials(data)
+
+            if credentials is not None:
+                credential_sets.append(credentials)
+
+    return credential_sets
+
+
+def load_credential_sets(path):
+    """
+    :param path: A credential file, or a directory of credential files
+    :return: The list of credential sets, without duplicate access keys
+    """
+    logger = logging.getLogger()
+
+    if os.path.isdir(path):
+        filenames = [os.path.join(path, name) for name in sorted(os.listdir(path))
+                     if not name.startswith('.') and os.path.isfile(os.path.join(path, name))]
+    else:
+        filenames = [path]
+
+    credential_sets = []
+    access_keys = set()
+
+    for filename in filenames:
+        try:
+            loaded = load_credential_file(filename)
+        except (OSError, ValueError) as e:
+            logger.warning(f'⚠️  Could not load credentials from {filename}: {e}')
+            continue
+
+        if not loaded:
+            logger.warning(f'⚠️  No credentials found in {filename}')
+
+        for credentials in loaded:
+            if credentials['access_key'] in access_keys:
+                logger.debug('Skipping duplicate access key %s from %s' % (credentials['access_key'], filename))
+                continue
+
+            access_keys.add(credentials['access_key'])
+            credential_sets.append(credentials)
+
+    return credential_sets
+
+
+def get_results_filename(output_dir, access_key):
+    return os.path.join(output_dir, '%s.jsonl' % access_key)
+
+
+def write_output(output_dir, access_key, output):
+    filename = os.path.join(output_dir, '%s.json' % access_key)
+
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=4, default=json_encoder)
+
+    return filename
+
+
+def enumerate_batch(credential_sets, output_dir, region, concurrency=DEFAULT_CONCURRENCY, rate_limit=None,
+                    engine='thread', client_cache_size=None, service_rate_limits=None, adaptive=False,
+                    time_budget=None, regions=None, prefetch=False, dry_run=False, result_detail=FULL,
+                    endpoint_url=None, result_cache=None):
+    """
+    Scan every credential set, up to concurrency of them at the same time,
+    and write the output of each one to output_dir/<access key>.json, and
+    with the full result detail the responses to output_dir/<access key>.jsonl
+
+    rate_limit, service_rate_limits and the adaptive controller apply to all
+    the credential sets together, not to each one. result_cache (a
+    ResultCache) is shared by the credential sets, each principal reuses
+    its own outcomes. Each credential set stops before its own Expiration,
+    or time_budget seconds after its bruteforce starts, whichever comes first.
+
+    :return: A dict with the output file of each scanned access key
+    """
+    # Imported here, the command line loads this module (and validates the
+    # credential sets) before the scan starts
+    from multiprocessing.dummy import Pool as ThreadPool
+    from enumerate_iam.main import (DNS_CACHE,
+                                    TIMINGS,
+                                    configure_logging,
+                                    configure_scan,
+                                    prefetch_scan_endpoints,
+                                    report_summary,
+                                    scan_identity)
+
+    configure_logging()
+    logger = logging.getLogger()
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    scannable = []
+
+    for credentials in credential_sets:
+        expiration = credentials['expiration']
+
+        if expiration is not None and expiration < time.time():
+            logger.warning(f'⚠️  Skipping {credentials["access_key"]}, the credentials expired at '
+                           f'{datetime.fromtimestamp(expiration, tz=timezone.utc).isoformat()}')
+            continue
+
+        scannable.append(credentials)
+
+    concurrency = max(min(concurrency, len(scannable)), 1)
+
+    logger.info(f'Batch scan of {len(scannable)} credential sets, {concurrency} at a time')
+
+    with profile_phase('setup'):
+        configure_scan(rate_limit=rate_limit,
+                       engine=engine,
+                       client_cache_size=client_cache_size,
+                       service_rate_limits=service_rate_limits,
+                       adaptive=adaptive,
+                       identities=concurrency,
+                       dry_run=dry_run,
+                       result_detail=result_detail,
+                       endpoint_url=endpoint_url)
+
+        # Endpoint availability doesn't depend on the credentials, the
+        # hostnames are resolved once for the whole batch
+        if prefetch:
+            prefetch_scan_endpoints(region, regions)
+
+    output_files = dict()
+
+    def scan_one(credentials):
+        access_key = credentials['access_key']
+
+        sink = JSONLSink(get_results_filename(output_dir, access_key)) if result_detail == FULL else None
+
+        try:
+            output = scan_identity(access_key,
+                                   credentials['secret_key'],
+                                   credentials['session_token'],
+                                   region,
+                                   engine=engine,
+                                   sink=sink,
+                                   regions=regions,
+                                   result_cache=result_cache,
+                                   expiration=credentials['expiration'],
+                                   time_budget=time_budget)
+        finally:
+            if sink is not None:
+                sink.close()
+
+        output_files[access_key] = write_output(output_dir, access_key, output)
+        logger.info(f'📁 Results for {access_key} written to {output_files[access_key]} '
+                    f'({len(output_files)}/{len(scannable)} credential sets done)')
+
+    pool = ThreadPool(concurrency)
+
+    try:
+        with TIMINGS.measure('scan'):
+            for _ in pool.imap_unordered(scan_one, scannable):
+                pass
+    except KeyboardInterrupt:
+        print('')
+        logger.info('Ctrl+C received, stopping the batch scan.')
+
+        pool.terminate()
+        pool.join()
+
+        return output_files
+    finally:
+        # Give socket.getaddrinfo back to the rest of the process
+        DNS_CACHE.uninstall()
+
+    pool.close()
+    pool.join()
+
+    report_summary()
+
+    return output_files
@@ -1,2623 +1,13 @@
-BRUTEFORCE_TESTS = {
-    "access-analyzer": [
-        "list_analyzers",
-        "list_policy_generations"
-    ],
-    "account": [
-        "get_contact_information",
-        "list_regions"
-    ],
-    "acm": [
-        "get_account_configuration",
-        "list_certificates"
-    ],
-    "airflow": [
-        "list_environments"
-    ],
-    "amplify": [
-        "list_apps"
-    ],
-    "amplifybackend": [
-        "list_s3_buckets"
-    ],
-    "aoss": [
-        "batch_get_collection",
-        "get_account_settings",
-        "get_policies_stats",
-        "list_collections",
-        "list_vpc_endpoints"
-    ],
-    "apigateway": [
-        "get_account",
-        "get_api_keys",
-        "get_client_certificates",
-        "get_domain_names",
-        "get_rest_apis",
-        "get_sdk_types",
-        "get_usage_plans",
-        "get_vpc_links"
-    ],
-    "app-integrations": [
-        "list_applications",
-        "list_data_integrations",
-        "list_event_integrations"
-    ],
-    "appconfig": [
-        "get_account_settings",
-        "list_applications",
-        "list_deployment_strategies",
-        "list_extension_associations",
-        "list_extensions"
-    ],
-    "appfabric": [
-        "list_app_bundles"
-    ],
-    "appflow": [
-        "describe_connector_profiles",
-        "describe_connectors",
-        "list_connector_entities",
-        "list_connectors",
-        "list_flows"
-    ],
-    "application-cost-profiler": [
-        "list_report_definitions"
-    ],
-    "application-signals": [
-        "list_service_level_objectives"
-    ],
-    "applicationinsights": [
-        "list_applications",
-        "list_configuration_history",
-        "list_problems"
-    ],
-    "appmesh": [
-        "list_meshes"
-    ],
-    "apprunner": [
-        "list_auto_scaling_configurations",
-        "list_connections",
-        "list_observability_configurations",
-        "list_services",
-        "list_vpc_connectors",
-        "list_vpc_ingress_connections"
-    ],
-    "appstream2": [
-        "describe_app_block_builder_app_block_associations",
-        "describe_app_block_builders",
-        "describe_app_blocks",
-        "describe_application_fleet_associations",
-        "describe_directory_configs",
-        "describe_fleets",
-        "describe_image_builders",
-        "describe_images",
-        "describe_usage_report_subscriptions",
-        "describe_user_stack_associations"
-    ],
-    "appsync": [
-        "list_domain_names",
-        "list_graphql_apis"
-    ],
-    "apptest": [
-        "list_test_cases",
-        "list_test_configurations",
-        "list_test_runs",
-        "list_test_suites"
-    ],
-    "aps": [
-        "get_default_scraper_configuration",
-        "list_scrapers",
-        "list_workspaces"
-    ],
-    "arc-zonal-shift": [
-        "get_autoshift_observer_notification_status",
-        "list_autoshifts",
-        "list_managed_resources",
-        "list_zonal_shifts"
-    ],
-    "artifact": [
-        "get_account_settings",
-        "list_reports"
-    ],
-    "athena": [
-        "list_application_dpu_sizes",
-        "list_capacity_reservations",
-        "list_data_catalogs",
-        "list_engine_versions",
-        "list_named_queries",
-        "list_query_executions",
-        "list_work_groups"
-    ],
-    "auditmanager": [
-        "get_account_status",
-        "get_delegations",
-        "get_insights",
-        "get_organization_admin_account",
-        "get_services_in_scope",
-        "list_assessment_reports",
-        "list_assessments",
-        "list_control_domain_insights",
-        "list_notifications"
-    ],
-    "autoscaling": [
-        "describe_account_limits",
-        "describe_adjustment_types",
-        "describe_auto_scaling_groups",
-        "describe_auto_scaling_instances",
-        "describe_auto_scaling_notification_types",
-        "describe_launch_configurations",
-        "describe_lifecycle_hook_types",
-        "describe_metric_collection_types",
-        "describe_notification_configurations",
-        "describe_policies",
-        "describe_scaling_activities",
-        "describe_scaling_process_types",
-        "describe_scheduled_actions",
-        "describe_tags",
-        "describe_termination_policy_types"
-    ],
-    "b2bi": [
-        "list_capabilities",
-        "list_partnerships",
-        "list_profiles",
-        "list_transformers"
-    ],
-    "backup": [
-        "describe_global_settings",
-        "describe_region_settings",
-        "get_supported_resource_types",
-        "list_backup_job_summaries",
-        "list_backup_jobs",
-        "list_backup_plan_templates",
-        "list_backup_plans",
-        "list_backup_vaults",
-        "list_copy_job_summaries",
-        "list_copy_jobs",
-        "list_frameworks",
-        "list_legal_holds",
-        "list_protected_resources",
-        "list_report_jobs",
-        "list_report_plans",
-        "list_restore_job_summaries",
-        "list_restore_jobs",
-        "list_restore_testing_plans"
-    ],
-    "backup-gateway": [
-        "list_gateways",
-        "list_hypervisors",
-        "list_virtual_machines"
-    ],
-    "batch": [
-        "describe_compute_environments",
-        "describe_job_definitions",
-        "describe_job_queues",
-        "list_jobs",
-        "list_scheduling_policies"
-    ],
-    "bcm-data-exports": [
-        "list_exports",
-        "list_tables"
-    ],
-    "bedrock": [
-        "get_model_invocation_logging_configuration",
-        "list_custom_models",
-        "list_evaluation_jobs",
-        "list_foundation_models",
-        "list_guardrails",
-        "list_imported_models",
-        "list_inference_profiles",
-        "list_model_copy_jobs",
-        "list_model_customization_jobs",
-        "list_model_import_jobs",
-        "list_model_invocation_jobs",
-        "list_provisioned_model_throughputs"
-    ],
-    "bedrock-agent": [
-        "list_agents",
-        "list_flows",
-        "list_knowledge_bases",
-        "list_prompts"
-    ],
-    "billingconductor": [
-        "list_account_associations",
-        "list_billing_group_cost_reports",
-        "list_billing_groups",
-        "list_custom_line_items",
-        "list_pricing_plans",
-        "list_pricing_rules"
-    ],
-    "cases": [
-        "list_domains"
-    ],
-    "cassandra": [
-        "list_keyspaces"
-    ],
-    "ce": [
-        "get_anomaly_monitors",
-        "get_anomaly_subscriptions",
-        "list_cost_allocation_tag_backfill_history",
-        "list_cost_allocation_tags",
-        "list_cost_category_definitions",
-        "list_savings_plans_purchase_recommendation_generation"
-    ],
-    "chatbot": [
-        "describe_chime_webhook_configurations",
-        "describe_slack_channel_configurations",
-        "describe_slack_user_identities",
-        "describe_slack_workspaces",
-        "get_account_preferences",
-        "list_microsoft_teams_channel_configurations",
-        "list_microsoft_teams_configured_teams",
-        "list_microsoft_teams_user_identities"
-    ],
-    "chime": [
-        "get_global_settings",
-        "get_messaging_session_endpoint",
-        "get_phone_number_settings",
-        "list_accounts",
-        "list_app_instances",
-        "list_channel_memberships_for_app_instance_user",
-        "list_channels_moderated_by_app_instance_user",
-        "list_media_capture_pipelines",
-        "list_meetings",
-        "list_phone_number_orders",
-        "list_phone_numbers",
-        "list_sip_media_applications",
-        "list_sip_rules",
-        "list_voice_connector_groups",
-        "list_voice_connectors"
-    ],
-    "cleanrooms": [
-        "list_collaborations",
-        "list_configured_tables",
-        "list_memberships"
-    ],
-    "cleanrooms-ml": [
-        "list_audience_export_jobs",
-        "list_audience_generation_jobs",
-        "list_audience_models",
-        "list_configured_audience_models",
-        "list_training_datasets"
-    ],
-    "cloud9": [
-        "describe_environment_memberships",
-        "list_environments"
-    ],
-    "cloudcontrolapi": [
-        "list_resource_requests"
-    ],
-    "clouddirectory": [
-        "list_development_schema_arns",
-        "list_directories",
-        "list_managed_schema_arns",
-        "list_published_schema_arns"
-    ],
-    "cloudformation": [
-        "describe_account_limits",
-        "describe_organizations_access",
-        "describe_publisher",
-        "describe_stack_events",
-        "describe_stack_resources",
-        "describe_type",
-        "get_template",
-        "get_template_summary",
-        "list_exports",
-        "list_generated_templates",
-        "list_resource_scans",
-        "list_stack_sets",
-        "list_stacks",
-        "list_type_registrations",
-        "list_type_versions",
-        "list_types"
-    ],
-    "cloudfront": [
-        "get_realtime_log_config",
-        "list_cache_policies",
-        "list_cloud_front_origin_access_identities",
-        "list_continuous_deployment_policies",
-        "list_distributions",
-        "list_distributions_by_realtime_log_config",
-        "list_field_level_encryption_configs",
-        "list_field_level_encryption_profiles",
-        "list_functions",
-        "list_key_groups",
-        "list_key_value_stores",
-        "list_origin_access_controls",
-        "list_origin_request_policies",
-        "list_realtime_log_configs",
-        "list_response_headers_policies",
-        "list_streaming_distributions"
-    ],
-    "cloudhsm": [
-        "describe_hsm",
-        "describe_luna_client",
-        "list_available_zones",
-        "list_hapgs",
-        "list_hsms",
-        "list_luna_clients"
-    ],
-    "cloudhsmv2": [
-        "describe_backups",
-        "describe_clusters",
-        "get_resource_policy"
-    ],
-    "cloudsearch": [
-        "describe_domains",
-        "list_domain_names"
-    ],
-    "cloudtrail": [
-        "describe_trails",
-        "get_insight_selectors",
-        "list_channels",
-        "list_event_data_stores",
-        "list_imports",
-        "list_trails"
-    ],
-    "codeartifact": [
-        "list_domains",
-        "list_repositories"
-    ],
-    "codebuild": [
-        "list_build_batches",
-        "list_build_batches_for_project",
-        "list_builds",
-        "list_curated_environment_images",
-        "list_fleets",
-        "list_projects",
-        "list_report_groups",
-        "list_reports",
-        "list_shared_projects",
-        "list_shared_report_groups",
-        "list_source_credentials"
-    ],
-    "codecatalyst": [
-        "get_user_details",
-        "list_access_tokens",
-        "list_spaces"
-    ],
-    "codecommit": [
-        "get_branch",
-        "list_approval_rule_templates",
-        "list_repositories"
-    ],
-    "codeconnections": [
-        "list_connections",
-        "list_hosts",
-        "list_repository_links"
-    ],
-    "codedeploy": [
-        "list_applications",
-        "list_deployment_configs",
-        "list_deployments",
-        "list_git_hub_account_token_names",
-        "list_on_premises_instances"
-    ],
-    "codeguru-profiler": [
-        "get_findings_report_account_summary",
-        "list_profiling_groups"
-    ],
-    "codeguru-reviewer": [
-        "list_repository_associations"
-    ],
-    "codeguru-security": [
-        "get_account_configuration",
-        "list_scans"
-    ],
-    "codepipeline": [
-        "list_action_types",
-        "list_pipelines",
-        "list_rule_types",
-        "list_webhooks"
-    ],
-    "codestar-connections": [
-        "list_connections",
-        "list_hosts",
-        "list_repository_links"
-    ],
-    "cognito-sync": [
-        "list_identity_pool_usage"
-    ],
-    "comprehend": [
-        "list_datasets",
-        "list_document_classification_jobs",
-        "list_document_classifier_summaries",
-        "list_document_classifiers",
-        "list_dominant_language_detection_jobs",
-        "list_endpoints",
-        "list_entities_detection_jobs",
-        "list_entity_recognizer_summaries",
-        "list_entity_recognizers",
-        "list_events_detection_jobs",
-        "list_flywheels",
-        "list_key_phrases_detection_jobs",
-        "list_pii_entities_detection_jobs",
-        "list_sentiment_detection_jobs",
-        "list_targeted_sentiment_detection_jobs",
-        "list_topics_detection_jobs"
-    ],
-    "comprehendmedical": [
-        "list_entities_detection_v2_jobs",
-        "list_icd10_cm_inference_jobs",
-        "list_phi_detection_jobs",
-        "list_rx_norm_inference_jobs",
-        "list_snomedct_inference_jobs"
-    ],
-    "compute-optimizer": [
-        "describe_recommendation_export_jobs",
-        "get_auto_scaling_group_recommendations",
-        "get_ebs_volume_recommendations",
-        "get_ec2_instance_recommendations",
-        "get_ecs_service_recommendations",
-        "get_enrollment_status",
-        "get_enrollment_statuses_for_organization",
-        "get_lambda_function_recommendations",
-        "get_license_recommendations",
-        "get_rds_database_recommendations",
-        "get_recommendation_summaries"
-    ],
-    "config": [
-        "describe_aggregation_authorizations",
-        "describe_compliance_by_config_rule",
-        "describe_compliance_by_resource",
-        "describe_config_rule_evaluation_status",
-        "describe_config_rules",
-        "describe_configuration_aggregators",
-        "describe_configuration_recorder_status",
-        "describe_configuration_recorders",
-        "describe_conformance_pack_status",
-        "describe_conformance_packs",
-        "describe_delivery_channel_status",
-        "describe_delivery_channels",
-        "describe_organization_config_rule_statuses",
-        "describe_organization_config_rules",
-        "describe_organization_conformance_pack_statuses",
-        "describe_organization_conformance_packs",
-        "describe_pending_aggregation_requests",
-        "describe_retention_configurations",
-        "get_compliance_details_by_resource",
-        "get_compliance_summary_by_config_rule",
-        "get_compliance_summary_by_resource_type",
-        "get_custom_rule_policy",
-        "get_discovered_resource_counts",
-        "list_resource_evaluations",
-        "list_stored_queries"
-    ],
-    "connect": [
-        "list_instances",
-        "list_phone_numbers_v2",
-        "list_traffic_distribution_groups"
-    ],
-    "controlcatalog": [
-        "list_common_controls",
-        "list_controls",
-        "list_domains",
-        "list_objectives"
-    ],
-    "controlplane.payment-cryptography": [
-        "list_aliases",
-        "list_keys"
-    ],
-    "controltower": [
-        "list_baselines",
-        "list_control_operations",
-        "list_enabled_baselines",
-        "list_enabled_controls",
-        "list_landing_zone_operations",
-        "list_landing_zones"
-    ],
-    "cost-optimization-hub": [
-        "get_preferences",
-        "list_enrollment_statuses",
-        "list_recommendations"
-    ],
-    "cur": [
-        "describe_report_definitions"
-    ],
-    "data-ats.iot": [
-        "list_retained_messages"
-    ],
-    "data.mediastore": [
-        "list_items"
-    ],
-    "databrew": [
-        "list_datasets",
-        "list_jobs",
-        "list_projects",
-        "list_recipes",
-        "list_rulesets",
-        "list_schedules"
-    ],
-    "dataexchange": [
-        "list_data_sets",
-        "list_event_actions",
-        "list_jobs"
-    ],
-    "datapipeline": [
-        "list_pipelines"
-    ],
-    "datasync": [
-        "list_agents",
-        "list_discovery_jobs",
-        "list_storage_systems",
-        "list_task_executions"
-    ],
-    "datazone": [
-        "list_domains"
-    ],
-    "dax": [
-        "describe_clusters",
-        "describe_default_parameters",
-        "describe_parameter_groups",
-        "describe_subnet_groups"
-    ],
-    "deadline": [
-        "list_available_metered_products",
-        "list_farms",
-        "list_license_endpoints",
-        "list_monitors"
-    ],
-    "detective": [
-        "list_graphs",
-        "list_invitations",
-        "list_organization_admin_accounts"
-    ],
-    "devicefarm": [
-        "get_account_settings",
-        "get_offering_status",
-        "get_test_grid_session",
-        "list_device_instances",
-        "list_devices",
-        "list_instance_profiles",
-        "list_offering_promotions",
-        "list_offering_transactions",
-        "list_offerings",
-        "list_projects",
-        "list_test_grid_projects",
-        "list_vpce_configurations"
-    ],
-    "devices.iot1click": [
-        "list_devices"
-    ],
-    "devops-guru": [
-        "describe_account_health",
-        "describe_event_sources_config",
-        "describe_feedback",
-        "describe_organization_health",
-        "describe_service_integration",
-        "get_cost_estimation",
-        "list_notification_channels"
-    ],
-    "directconnect": [
-        "describe_connections",
-        "describe_customer_metadata",
-        "describe_direct_connect_gateway_association_proposals",
-        "describe_direct_connect_gateway_associations",
-        "describe_direct_connect_gateway_attachments",
-        "describe_direct_connect_gateways",
-        "describe_interconnects",
-        "describe_lags",
-        "describe_locations",
-        "describe_virtual_gateways",
-        "describe_virtual_interfaces",
-        "list_virtual_interface_test_history"
-    ],
-    "discovery": [
-        "describe_agents",
-        "describe_continuous_exports",
-        "describe_export_configurations",
-        "describe_export_tasks",
-        "describe_import_tasks",
-        "get_discovery_summary"
-    ],
-    "dlm": [
-        "get_lifecycle_policies"
-    ],
-    "dms": [
-        "describe_account_attributes",
-        "describe_applicable_individual_assessments",
-        "describe_certificates",
-        "describe_connections",
-        "describe_data_providers",
-        "describe_endpoint_types",
-        "describe_endpoints",
-        "describe_engine_versions",
-        "describe_event_categories",
-        "describe_event_subscriptions",
-        "describe_fleet_advisor_collectors",
-        "describe_fleet_advisor_databases",
-        "describe_fleet_advisor_lsa_analysis",
-        "describe_fleet_advisor_schema_object_summary",
-        "describe_fleet_advisor_schemas",
-        "describe_instance_profiles",
-        "describe_migration_projects",
-        "describe_orderable_replication_instances",
-        "describe_pending_maintenance_actions",
-        "describe_recommendation_limitations",
-        "describe_recommendations",
-        "describe_replication_configs",
-        "describe_replication_instances",
-        "describe_replication_subnet_groups",
-        "describe_replication_task_assessment_results",
-        "describe_replication_task_assessment_runs",
-        "describe_replication_task_individual_assessments",
-        "describe_replication_tasks",
-        "describe_replications",
-        "list_tags_for_resource"
-    ],
-    "docdb-elastic": [
-        "list_cluster_snapshots",
-        "list_clusters"
-    ],
-    "drs": [
-        "describe_jobs",
-        "describe_launch_configuration_templates",
-        "describe_recovery_instances",
-        "describe_replication_configuration_templates",
-        "describe_source_networks",
-        "describe_source_servers",
-        "list_staging_accounts"
-    ],
-    "ds": [
-        "describe_directories",
-        "describe_event_topics",
-        "describe_snapshots",
-        "describe_trusts",
-        "get_directory_limits",
-        "list_log_subscriptions"
-    ],
-    "dynamodb": [
-        "describe_endpoints",
-        "describe_limits",
-        "list_backups",
-        "list_contributor_insights",
-        "list_exports",
-        "list_global_tables",
-        "list_imports",
-        "list_tables"
-    ],
-    "ec2": [
-        "describe_account_attributes",
-        "describe_address_transfers",
-        "describe_addresses",
-        "describe_addresses_attribute",
-        "describe_aggregate_id_format",
-        "describe_availability_zones",
-        "describe_aws_network_performance_metric_subscriptions",
-        "describe_bundle_tasks",
-        "describe_capacity_reservation_fleets",
-        "describe_capacity_reservations",
-        "describe_carrier_gateways",
-        "describe_classic_link_instances",
-        "describe_client_vpn_endpoints",
-        "describe_coip_pools",
-        "describe_conversion_tasks",
-        "describe_customer_gateways",
-        "describe_dhcp_options",
-        "describe_egress_only_internet_gateways",
-        "describe_elastic_gpus",
-        "describe_export_image_tasks",
-        "describe_export_tasks",
-        "describe_fast_launch_images",
-        "describe_fast_snapshot_restores",
-        "describe_fleets",
-        "describe_flow_logs",
-        "describe_fpga_images",
-        "describe_host_reservation_offerings",
-        "describe_host_reservations",
-        "describe_hosts",
-        "describe_iam_instance_profile_associations",
-        "describe_id_format",
-        "describe_images",
-        "describe_import_image_tasks",
-        "describe_import_snapshot_tasks",
-        "describe_instance_connect_endpoints",
-        "describe_instance_credit_specifications",
-        "describe_instance_event_notification_attributes",
-        "describe_instance_event_windows",
-        "describe_instance_status",
-        "describe_instance_topology",
-        "describe_instance_type_offerings",
-        "describe_instance_types",
-        "describe_instances",
-        "describe_internet_gateways",
-        "describe_ipam_byoasn",
-        "describe_ipam_external_resource_verification_tokens",
-        "describe_ipam_pools",
-        "describe_ipam_resource_discoveries",
-        "describe_ipam_resource_discovery_associations",
-        "describe_ipam_scopes",
-        "describe_ipams",
-        "describe_ipv6_pools",
-        "describe_key_pairs",
-        "describe_launch_template_versions",
-        "describe_launch_templates",
-        "describe_local_gateway_route_table_virtual_interface_group_associations",
-        "describe_local_gateway_route_table_vpc_associations",
-        "describe_local_gateway_route_tables",
-        "describe_local_gateway_virtual_interface_groups",
-        "describe_local_gateway_virtual_interfaces",
-        "describe_local_gateways",
-        "describe_locked_snapshots",
-        "describe_mac_hosts",
-        "describe_managed_prefix_lists",
-        "describe_moving_addresses",
-        "describe_nat_gateways",
-        "describe_network_acls",
-        "describe_network_insights_access_scope_analyses",
-        "describe_network_insights_access_scopes",
-        "describe_network_insights_analyses",
-        "describe_network_insights_paths",
-        "describe_network_interface_permissions",
-        "describe_network_interfaces",
-        "describe_placement_groups",
-        "describe_prefix_lists",
-        "describe_principal_id_format",
-        "describe_public_ipv4_pools",
-        "describe_regions",
-        "describe_replace_root_volume_tasks",
-        "describe_reserved_instances",
-        "describe_reserved_instances_listings",
-        "describe_reserved_instances_modifications",
-        "describe_reserved_instances_offerings",
-        "describe_route_tables",
-        "describe_scheduled_instances",
-        "describe_security_group_rules",
-        "describe_security_groups",
-        "describe_snapshot_tier_status",
-        "describe_snapshots",
-        "describe_spot_datafeed_subscription",
-        "describe_spot_fleet_requests",
-        "describe_spot_instance_requests",
-        "describe_spot_price_history",
-        "describe_store_image_tasks",
-        "describe_subnets",
-        "describe_tags",
-        "describe_traffic_mirror_filter_rules",
-        "describe_traffic_mirror_filters",
-        "describe_traffic_mirror_sessions",
-        "describe_traffic_mirror_targets",
-        "describe_transit_gateway_attachments",
-        "describe_transit_gateway_connect_peers",
-        "describe_transit_gateway_connects",
-        "describe_transit_gateway_multicast_domains",
-        "describe_transit_gateway_peering_attachments",
-        "describe_transit_gateway_policy_tables",
-        "describe_transit_gateway_route_table_announcements",
-        "describe_transit_gateway_route_tables",
-        "describe_transit_gateway_vpc_attachments",
-        "describe_transit_gateways",
-        "describe_trunk_interface_associations",
-        "describe_verified_access_endpoints",
-        "describe_verified_access_groups",
-        "describe_verified_access_instance_logging_configurations",
-        "describe_verified_access_instances",
-        "describe_verified_access_trust_providers",
-        "describe_volume_status",
-        "describe_volumes",
-        "describe_volumes_modifications",
-        "describe_vpc_classic_link",
-        "describe_vpc_classic_link_dns_support",
-        "describe_vpc_endpoint_connection_notifications",
-        "describe_vpc_endpoint_connections",
-        "describe_vpc_endpoint_service_configurations",
-        "describe_vpc_endpoint_services",
-        "describe_vpc_endpoints",
-        "describe_vpc_peering_connections",
-        "describe_vpcs",
-        "describe_vpn_connections",
-        "describe_vpn_gateways",
-        "get_aws_network_performance_data",
-        "get_ebs_default_kms_key_id",
-        "get_ebs_encryption_by_default",
-        "get_image_block_public_access_state",
-        "get_instance_metadata_defaults",
-        "get_serial_console_access_status",
-        "get_snapshot_block_public_access_state",
-        "get_vpn_connection_device_types",
-        "list_images_in_recycle_bin",
-        "list_snapshots_in_recycle_bin"
-    ],
-    "ecr": [
-        "describe_pull_through_cache_rules",
-        "describe_registry",
-        "describe_repositories",
-        "describe_repository_creation_templates",
-        "get_authorization_token",
-        "get_registry_policy",
-        "get_registry_scanning_configuration"
-    ],
-    "ecr-public": [
-        "describe_registries",
-        "describe_repositories",
-        "get_authorization_token",
-        "get_registry_catalog_data"
-    ],
-    "ecs": [
-        "describe_capacity_providers",
-        "describe_clusters",
-        "list_account_settings",
-        "list_clusters",
-        "list_container_instances",
-        "list_services",
-        "list_task_definition_families",
-        "list_task_definitions",
-        "list_tasks"
-    ],
-    "eks": [
-        "describe_addon_versions",
-        "list_access_policies",
-        "list_clusters",
-        "list_eks_anywhere_subscriptions"
-    ],
-    "elastic-inference": [
-        "describe_accelerator_types",
-        "describe_accelerators"
-    ],
-    "elasticache": [
-        "describe_cache_clusters",
-        "describe_cache_engine_versions",
-        "describe_cache_parameter_groups",
-        "describe_cache_security_groups",
-        "describe_cache_subnet_groups",
-        "describe_global_replication_groups",
-        "describe_replication_groups",
-        "describe_reserved_cache_nodes",
-        "describe_reserved_cache_nodes_offerings",
-        "describe_serverless_cache_snapshots",
-        "describe_serverless_caches",
-        "describe_service_updates",
-        "describe_snapshots",
-        "describe_update_actions",
-        "describe_user_groups",
-        "list_allowed_node_type_modifications"
-    ],
-    "elasticbeanstalk": [
-        "describe_account_attributes",
-        "describe_configuration_options",
-        "describe_environment_health",
-        "describe_environment_managed_action_history",
-        "describe_environment_managed_actions",
-        "describe_environment_resources",
-        "describe_instances_health",
-        "describe_platform_version",
-        "list_platform_branches"
-    ],
-    "elasticfilesystem": [
-        "describe_access_points",
-        "describe_account_preferences",
-        "describe_file_systems",
-        "describe_mount_targets",
-        "describe_replication_configurations"
-    ],
-    "elasticloadbalancing": [
-        "describe_account_limits",
-        "describe_listeners",
-        "describe_load_balancer_policies",
-        "describe_load_balancer_policy_types",
-        "describe_load_balancers",
-        "describe_rules",
-        "describe_ssl_policies",
-        "describe_target_groups",
-        "describe_trust_stores"
-    ],
-    "elasticmapreduce": [
-        "describe_job_flows",
-        "describe_release_label",
-        "get_block_public_access_configuration",
-        "list_clusters",
-        "list_notebook_executions",
-        "list_release_labels",
-        "list_security_configurations",
-        "list_studio_session_mappings",
-        "list_studios"
-    ],
-    "elastictranscoder": [
-        "list_pipelines",
-        "list_presets"
-    ],
-    "email": [
-        "describe_active_receipt_rule_set",
-        "get_account",
-        "get_account_sending_enabled",
-        "get_dedicated_ips",
-        "get_deliverability_dashboard_options",
-        "get_send_quota",
-        "get_send_statistics",
-        "list_configuration_sets",
-        "list_contact_lists",
-        "list_custom_verification_email_templates",
-        "list_dedicated_ip_pools",
-        "list_deliverability_test_reports",
-        "list_email_identities",
-        "list_email_templates",
-        "list_export_jobs",
-        "list_identities",
-        "list_import_jobs",
-        "list_receipt_filters",
-        "list_receipt_rule_sets",
-        "list_recommendations",
-        "list_suppressed_destinations",
-        "list_templates",
-        "list_verified_email_addresses"
-    ],
-    "emr-containers": [
-        "list_job_templates",
-        "list_security_configurations",
-        "list_virtual_clusters"
-    ],
-    "emr-serverless": [
-        "list_applications"
-    ],
-    "entityresolution": [
-        "list_id_mapping_workflows",
-        "list_id_namespaces",
-        "list_matching_workflows",
-        "list_provider_services",
-        "list_schema_mappings"
-    ],
-    "es": [
-        "describe_inbound_connections",
-        "describe_inbound_cross_cluster_search_connections",
-        "describe_outbound_connections",
-        "describe_outbound_cross_cluster_search_connections",
-        "describe_packages",
-        "describe_reserved_elasticsearch_instance_offerings",
-        "describe_reserved_elasticsearch_instances",
-        "describe_reserved_instance_offerings",
-        "describe_reserved_instances",
-        "get_compatible_elasticsearch_versions",
-        "get_compatible_versions",
-        "list_domain_names",
-        "list_elasticsearch_versions",
-        "list_versions",
-        "list_vpc_endpoints"
-    ],
-    "events": [
-        "describe_event_bus",
-        "list_api_destinations",
-        "list_archives",
-        "list_connections",
-        "list_endpoints",
-        "list_event_buses",
-        "list_replays",
-        "list_rules"
-    ],
-    "evidently": [
-        "list_projects",
-        "list_segments"
-    ],
-    "finspace": [
-        "list_environments",
-        "list_kx_environments"
-    ],
-    "finspace-api": [
-        "get_working_location",
-        "list_datasets"
-    ],
-    "firehose": [
-        "list_delivery_streams"
-    ],
-    "fis": [
-        "list_actions",
-        "list_experiment_templates",
-        "list_experiments",
-        "list_target_resource_types"
-    ],
-    "fleethub.iot": [
-        "list_applications"
-    ],
-    "fms": [
-        "get_admin_account",
-        "get_notification_channel",
-        "list_admin_accounts_for_organization",
-        "list_admins_managing_account",
-        "list_member_accounts",
-        "list_policies",
-        "list_resource_sets"
-    ],
-    "forecast": [
-        "list_dataset_groups",
-        "list_dataset_import_jobs",
-        "list_datasets",
-        "list_explainabilities",
-        "list_explainability_exports",
-        "list_forecast_export_jobs",
-        "list_forecasts",
-        "list_monitors",
-        "list_predictor_backtest_export_jobs",
-        "list_predictors",
-        "list_what_if_analyses",
-        "list_what_if_forecast_exports",
-        "list_what_if_forecasts"
-    ],
-    "frauddetector": [
-        "describe_model_versions",
-        "get_batch_import_jobs",
-        "get_batch_prediction_jobs",
-        "get_detectors",
-        "get_entity_types",
-        "get_event_types",
-        "get_external_models",
-        "get_kms_encryption_key",
-        "get_labels",
-        "get_lists_metadata",
-        "get_models",
-        "get_outcomes",
-        "get_variables"
-    ],
-    "freetier": [
-        "get_free_tier_usage"
-    ],
-    "fsx": [
-        "describe_backups",
-        "describe_data_repository_associations",
-        "describe_data_repository_tasks",
-        "describe_file_caches",
-        "describe_file_systems",
-        "describe_shared_vpc_configuration",
-        "describe_snapshots",
-        "describe_storage_virtual_machines",
-        "describe_volumes"
-    ],
-    "gamelift": [
-        "describe_ec2_instance_limits",
-        "describe_fleet_attributes",
-        "describe_fleet_capacity",
-        "describe_fleet_utilization",
-        "describe_game_session_details",
-        "describe_game_session_queues",
-        "describe_game_sessions",
-        "describe_matchmaking_configurations",
-        "describe_matchmaking_rule_sets",
-        "describe_player_sessions",
-        "describe_vpc_peering_authorizations",
-        "describe_vpc_peering_connections",
-        "list_aliases",
-        "list_builds",
-        "list_container_group_definitions",
-        "list_fleets",
-        "list_game_server_groups",
-        "list_locations",
-        "list_scripts"
-    ],
-    "geo": [
-        "list_geofence_collections",
-        "list_keys",
-        "list_maps",
-        "list_place_indexes",
-        "list_route_calculators",
-        "list_trackers"
-    ],
-    "globalaccelerator": [
-        "list_accelerators",
-        "list_byoip_cidrs",
-        "list_cross_account_attachments",
-        "list_cross_account_resource_accounts",
-        "list_custom_routing_accelerators"
-    ],
-    "glue": [
-        "get_catalog_import_status",
-        "get_classifiers",
-        "get_connections",
-        "get_crawler_metrics",
-        "get_crawlers",
-        "get_data_catalog_encryption_settings",
-        "get_databases",
-        "get_dataflow_graph",
-        "get_dev_endpoints",
-        "get_jobs",
-        "get_ml_transforms",
-        "get_resource_policies",
-        "get_resource_policy",
-        "get_schema_version",
-        "get_security_configurations",
-        "get_triggers",
-        "list_blueprints",
-        "list_column_statistics_task_runs",
-        "list_crawlers",
-        "list_custom_entity_types",
-        "list_data_quality_results",
-        "list_data_quality_rulesets",
-        "list_data_quality_statistic_annotations",
-        "list_data_quality_statistics",
-        "list_dev_endpoints",
-        "list_jobs",
-        "list_ml_transforms",
-        "list_registries",
-        "list_schemas",
-        "list_sessions",
-        "list_triggers",
-        "list_usage_profiles",
-        "list_workflows"
-    ],
-    "grafana": [
-        "list_versions",
-        "list_workspaces"
-    ],
-    "greengrass": [
-        "get_service_role_for_account",
-        "list_bulk_deployments",
-        "list_components",
-        "list_connector_definitions",
-        "list_core_definitions",
-        "list_core_devices",
-        "list_deployments",
-        "list_device_definitions",
-        "list_function_definitions",
-        "list_groups",
-        "list_logger_definitions",
-        "list_resource_definitions",
-        "list_subscription_definitions"
-    ],
-    "groundstation": [
-        "list_configs",
-        "list_dataflow_endpoint_groups",
-        "list_ground_stations",
-        "list_mission_profiles",
-        "list_satellites"
-    ],
-    "guardduty": [
-        "get_invitations_count",
-        "get_organization_statistics",
-        "list_detectors",
-        "list_invitations",
-        "list_malware_protection_plans",
-        "list_organization_admin_accounts"
-    ],
-    "health": [
-        "describe_entity_aggregates",
-        "describe_event_types",
-        "describe_events_for_organization",
-        "describe_health_service_status_for_organization"
-    ],
-    "healthlake": [
-        "list_fhir_datastores"
-    ],
-    "iam": [
-        "get_account_authorization_details",
-        "get_account_password_policy",
-        "get_account_summary",
-        "get_credential_report",
-        "get_user",
-        "list_access_keys",
-        "list_account_aliases",
-        "list_groups",
-        "list_instance_profiles",
-        "list_mfa_devices",
-        "list_open_id_connect_providers",
-        "list_policies",
-        "list_roles",
-        "list_saml_providers",
-        "list_server_certificates",
-        "list_service_specific_credentials",
-        "list_signing_certificates",
-        "list_ssh_public_keys",
-        "list_users",
-        "list_virtual_mfa_devices"
-    ],
-    "identity-chime": [
-        "list_app_instances"
-    ],
-    "imagebuilder": [
-        "list_components",
-        "list_container_recipes",
-        "list_distribution_configurations",
-        "list_image_pipelines",
-        "list_image_recipes",
-        "list_image_scan_finding_aggregations",
-        "list_image_scan_findings",
-        "list_images",
-        "list_infrastructure_configurations",
-        "list_lifecycle_policies",
-        "list_waiting_workflow_steps",
-        "list_workflows"
-    ],
-    "importexport": [
-        "list_jobs"
-    ],
-    "ingest.timestream": [
-        "describe_endpoints",
-        "list_batch_load_tasks",
-        "list_databases",
-        "list_tables"
-    ],
-    "inspector": [
-        "describe_cross_account_access_role",
-        "list_assessment_runs",
-        "list_assessment_targets",
-        "list_assessment_templates",
-        "list_event_subscriptions",
-        "list_findings",
-        "list_rules_packages"
-    ],
-    "inspector2": [
-        "batch_get_account_status",
-        "batch_get_member_ec2_deep_inspection_status",
-        "describe_organization_configuration",
-        "get_configuration",
-        "get_delegated_admin_account",
-        "get_ec2_deep_inspection_configuration",
-        "get_findings_report_status",
-        "list_account_permissions",
-        "list_cis_scan_configurations",
-        "list_coverage",
-        "list_coverage_statistics",
-        "list_delegated_admin_accounts",
-        "list_filters",
-        "list_members",
-        "list_usage_totals"
-    ],
-    "internetmonitor": [
-        "list_internet_events",
-        "list_monitors"
-    ],
-    "iot": [
-        "describe_account_audit_configuration",
-        "describe_default_authorizer",
-        "describe_endpoint",
-        "describe_event_configurations",
-        "get_behavior_model_training_summaries",
-        "get_effective_policies",
-        "get_indexing_configuration",
-        "get_logging_options",
-        "get_package_configuration",
-        "get_registration_code",
-        "get_v2_logging_options",
-        "list_active_violations",
-        "list_audit_findings",
-        "list_audit_suppressions",
-        "list_authorizers",
-        "list_billing_groups",
-        "list_ca_certificates",
-        "list_certificate_providers",
-        "list_certificates",
-        "list_custom_metrics",
-        "list_detect_mitigation_actions_executions",
-        "list_dimensions",
-        "list_domain_configurations",
-        "list_fleet_metrics",
-        "list_indices",
-        "list_job_templates",
-        "list_jobs",
-        "list_managed_job_templates",
-        "list_mitigation_actions",
-        "list_ota_updates",
-        "list_outgoing_certificates",
-        "list_packages",
-        "list_policies",
-        "list_provisioning_templates",
-        "list_role_aliases",
-        "list_scheduled_audits",
-        "list_security_profiles",
-        "list_streams",
-        "list_thing_groups",
-        "list_thing_registration_tasks",
-        "list_thing_types",
-        "list_things",
-        "list_topic_rule_destinations",
-        "list_topic_rules",
-        "list_v2_logging_levels"
-    ],
-    "iotanalytics": [
-        "describe_logging_options",
-        "list_channels",
-        "list_datasets",
-        "list_datastores",
-        "list_pipelines"
-    ],
-    "iotdeviceadvisor": [
-        "get_endpoint",
-        "list_suite_definitions",
-        "list_suite_runs"
-    ],
-    "iotevents": [
-        "describe_logging_options",
-        "list_alarm_models",
-        "list_detector_models",
-        "list_inputs"
-    ],
-    "iotfleetwise": [
-        "get_encryption_configuration",
-        "get_logging_options",
-        "get_register_account_status",
-        "list_campaigns",
-        "list_decoder_manifests",
-        "list_fleets",
-        "list_model_manifests",
-        "list_signal_catalogs",
-        "list_vehicles"
-    ],
-    "iotsitewise": [
-        "describe_default_encryption_configuration",
-        "describe_logging_options",
-        "describe_storage_configuration",
-        "describe_time_series",
-        "get_asset_property_value",
-        "get_asset_property_value_history",
-        "list_access_policies",
-        "list_asset_models",
-        "list_assets",
-        "list_bulk_import_jobs",
-        "list_gateways",
-        "list_portals",
-        "list_time_series"
-    ],
-    "iotthingsgraph": [
-        "describe_namespace",
-        "get_namespace_deletion_status"
-    ],
-    "iottwinmaker": [
-        "get_pricing_plan",
-        "list_workspaces"
-    ],
-    "iotwireless": [
-        "get_event_configuration_by_resource_types",
-        "get_log_levels_by_resource_types",
-        "get_metric_configuration",
-        "get_metrics",
-        "get_service_endpoint",
-        "list_destinations",
-        "list_device_profiles",
-        "list_fuota_tasks",
-        "list_multicast_groups",
-        "list_network_analyzer_configurations",
-        "list_partner_accounts",
-        "list_position_configurations",
-        "list_service_profiles",
-        "list_wireless_device_import_tasks",
-        "list_wireless_devices",
-        "list_wireless_gateway_task_definitions",
-        "list_wireless_gateways"
-    ],
-    "ivs": [
-        "list_channels",
-        "list_playback_key_pairs",
-        "list_playback_restriction_policies",
-        "list_recording_configurations",
-        "list_streams"
-    ],
-    "ivschat": [
-        "list_logging_configurations",
-        "list_rooms"
-    ],
-    "ivsrealtime": [
-        "list_compositions",
-        "list_encoder_configurations",
-        "list_stages",
-        "list_storage_configurations"
-    ],
-    "kafka": [
-        "get_compatible_kafka_versions",
-        "list_clusters",
-        "list_clusters_v2",
-        "list_configurations",
-        "list_kafka_versions",
-        "list_replicators",
-        "list_vpc_connections"
-    ],
-    "kafkaconnect": [
-        "list_connectors",
-        "list_custom_plugins",
-        "list_worker_configurations"
-    ],
-    "kendra": [
-        "list_indices"
-    ],
-    "kendra-ranking": [
-        "list_rescore_execution_plans"
-    ],
-    "kinesis": [
-        "describe_limits",
-        "describe_stream",
-        "describe_stream_consumer",
-        "describe_stream_summary",
-        "list_streams",
-        "list_tags_for_stream"
-    ],
-    "kinesisanalytics": [
-        "list_applications"
-    ],
-    "kinesisvideo": [
-        "describe_edge_configuration",
-        "describe_image_generation_configuration",
-        "describe_mapped_resource_configuration",
-        "describe_media_storage_configuration",
-        "describe_notification_configuration",
-        "describe_signaling_channel",
-        "describe_stream",
-        "get_dash_streaming_session_url",
-        "list_signaling_channels",
-        "list_streams",
-        "list_tags_for_stream"
-    ],
-    "kms": [
-        "describe_custom_key_stores",
-        "list_aliases",
-        "list_keys"
-    ],
-    "lakeformation": [
-        "describe_lake_formation_identity_center_configuration",
-        "get_data_lake_principal",
-        "get_data_lake_settings",
-        "list_data_cells_filter",
-        "list_lake_formation_opt_ins",
-        "list_lf_tags",
-        "list_permissions",
-        "list_resources",
-        "list_transactions"
-    ],
-    "lambda": [
-        "get_account_settings",
-        "list_code_signing_configs",
-        "list_event_source_mappings",
-        "list_functions",
-        "list_layers"
-    ],
-    "launchwizard": [
-        "list_deployments",
-        "list_workloads"
-    ],
-    "license-manager": [
-        "get_service_settings",
-        "list_distributed_grants",
-        "list_license_configurations",
-        "list_license_conversion_tasks",
-        "list_license_manager_report_generators",
-        "list_licenses",
-        "list_received_grants",
-        "list_received_licenses",
-        "list_received_licenses_for_organization",
-        "list_tokens"
-    ],
-    "license-manager-linux-subscriptions": [
-        "get_service_settings",
-        "list_linux_subscription_instances",
-        "list_linux_subscriptions",
-        "list_registered_subscription_providers"
-    ],
-    "license-manager-user-subscriptions": [
-        "list_identity_providers",
-        "list_instances"
-    ],
-    "lightsail": [
-        "get_active_names",
-        "get_alarms",
-        "get_blueprints",
-        "get_bucket_bundles",
-        "get_buckets",
-        "get_bundles",
-        "get_certificates",
-        "get_cloud_formation_stack_records",
-        "get_contact_methods",
-        "get_container_api_metadata",
-        "get_container_service_powers",
-        "get_container_services",
-        "get_disk_snapshots",
-        "get_disks",
-        "get_distribution_bundles",
-        "get_distribution_latest_cache_reset",
-        "get_distributions",
-        "get_domains",
-        "get_export_snapshot_records",
-        "get_instance_snapshots",
-        "get_instances",
-        "get_key_pairs",
-        "get_load_balancer_tls_policies",
-        "get_load_balancers",
-        "get_operations",
-        "get_regions",
-        "get_relational_database_blueprints",
-        "get_relational_database_bundles",
-        "get_relational_database_snapshots",
-        "get_relational_databases",
-        "get_static_ips"
-    ],
-    "logs": [
-        "describe_configuration_templates",
-        "describe_deliveries",
-        "describe_delivery_destinations",
-        "describe_delivery_sources",
-        "describe_destinations",
-        "describe_export_tasks",
-        "describe_log_groups",
-        "describe_log_streams",
-        "describe_metric_filters",
-        "describe_queries",
-        "describe_query_definitions",
-        "describe_resource_policies",
-        "get_log_group_fields",
-        "list_anomalies",
-        "list_log_anomaly_detectors"
-    ],
-    "lookoutequipment": [
-        "list_data_ingestion_jobs",
-        "list_datasets",
-        "list_inference_schedulers",
-        "list_label_groups",
-        "list_models",
-        "list_retraining_schedulers"
-    ],
-    "lookoutmetrics": [
-        "list_alerts",
-        "list_anomaly_detectors",
-        "list_metric_sets"
-    ],
-    "lookoutvision": [
-        "list_projects"
-    ],
-    "m2": [
-        "get_signed_bluinsights_url",
-        "list_applications",
-        "list_engine_versions",
-        "list_environments"
-    ],
-    "machinelearning": [
-        "describe_batch_predictions",
-        "describe_data_sources",
-        "describe_evaluations",
-        "describe_ml_models"
-    ],
-    "macie2": [
-        "batch_get_custom_data_identifiers",
-        "describe_buckets",
-        "describe_organization_configuration",
-        "get_administrator_account",
-        "get_automated_discovery_configuration",
-        "get_bucket_statistics",
-        "get_classification_export_configuration",
-        "get_findings_publication_configuration",
-        "get_invitations_count",
-        "get_macie_session",
-        "get_master_account",
-        "get_reveal_configuration",
-        "get_usage_statistics",
-        "get_usage_totals",
-        "list_allow_lists",
-        "list_automated_discovery_accounts",
-        "list_classification_jobs",
-        "list_classification_scopes",
-        "list_custom_data_identifiers",
-        "list_findings",
-        "list_findings_filters",
-        "list_invitations",
-        "list_managed_data_identifiers",
-        "list_members",
-        "list_organization_admin_accounts",
-        "list_sensitivity_inspection_templates"
-    ],
-    "mail-manager": [
-        "list_addon_instances",
-        "list_addon_subscriptions",
-        "list_archives",
-        "list_ingress_points",
-        "list_relays",
-        "list_rule_sets",
-        "list_traffic_policies"
-    ],
-    "managedblockchain": [
-        "list_accessors",
-        "list_invitations",
-        "list_networks"
-    ],
-    "media-pipelines-chime": [
-        "list_media_capture_pipelines",
-        "list_media_insights_pipeline_configurations",
-        "list_media_pipeline_kinesis_video_stream_pools",
-        "list_media_pipelines"
-    ],
-    "mediaconnect": [
-        "list_bridges",
-        "list_entitlements",
-        "list_flows",
-        "list_gateway_instances",
-        "list_gateways",
-        "list_offerings",
-        "list_reservations"
-    ],
-    "mediaconvert": [
-        "get_policy",
-        "list_job_templates",
-        "list_jobs",
-        "list_presets",
-        "list_queues"
-    ],
-    "medialive": [
-        "describe_account_configuration",
-        "list_channels",
-        "list_cloud_watch_alarm_template_groups",
-        "list_cloud_watch_alarm_templates",
-        "list_event_bridge_rule_template_groups",
-        "list_event_bridge_rule_templates",
-        "list_input_devices",
-        "list_input_security_groups",
-        "list_inputs",
-        "list_multiplexes",
-        "list_offerings",
-        "list_reservations",
-        "list_signal_maps"
-    ],
-    "mediapackage": [
-        "list_channels",
-        "list_harvest_jobs",
-        "list_origin_endpoints"
-    ],
-    "mediapackage-vod": [
-        "list_assets",
-        "list_packaging_configurations",
-        "list_packaging_groups"
-    ],
-    "mediapackagev2": [
-        "list_channel_groups"
-    ],
-    "mediastore": [
-        "describe_container",
-        "list_containers"
-    ],
-    "mediatailor": [
-        "list_channels",
-        "list_playback_configurations",
-        "list_source_locations"
-    ],
-    "medical-imaging": [
-        "list_datastores"
-    ],
-    "memory-db": [
-        "describe_ac_ls",
-        "describe_clusters",
-        "describe_engine_versions",
-        "describe_parameter_groups",
-        "describe_reserved_nodes",
-        "describe_reserved_nodes_offerings",
-        "describe_service_updates",
-        "describe_snapshots",
-        "describe_subnet_groups"
-    ],
-    "messaging-chime": [
-        "get_messaging_session_endpoint"
-    ],
-    "mgh": [
-        "list_application_states",
-        "list_migration_tasks",
-        "list_progress_update_streams"
-    ],
-    "mgn": [
-        "describe_jobs",
-        "describe_launch_configuration_templates",
-        "describe_replication_configuration_templates",
-        "describe_source_servers",
-        "describe_vcenter_clients",
-        "list_applications",
-        "list_connectors",
-        "list_exports",
-        "list_imports",
-        "list_managed_accounts",
-        "list_waves"
-    ],
-    "migrationhub-config": [
-        "describe_home_region_controls",
-        "get_home_region"
-    ],
-    "migrationhub-orchestrator": [
-        "list_plugins",
-        "list_templates",
-        "list_workflows"
-    ],
-    "migrationhub-strategy": [
-        "get_latest_assessment_id",
-        "get_portfolio_preferences",
-        "get_portfolio_summary",
-        "list_analyzable_servers",
-        "list_application_components",
-        "list_collectors",
-        "list_import_file_task",
-        "list_servers"
-    ],
-    "models.lex": [
-        "get_bots",
-        "get_builtin_intents",
-        "get_builtin_slot_types",
-        "get_intents",
-        "get_migrations",
-        "get_slot_types"
-    ],
-    "monitoring": [
-        "describe_alarm_history",
-        "describe_alarms",
-        "describe_anomaly_detectors",
-        "describe_insight_rules",
-        "list_dashboards",
-        "list_metric_streams"
-    ],
-    "mq": [
-        "describe_broker_engine_types",
-        "describe_broker_instance_options",
-        "list_brokers",
-        "list_configurations"
-    ],
-    "mturk-requester": [
-        "get_account_balance",
-        "list_bonus_payments",
-        "list_hi_ts",
-        "list_qualification_requests",
-        "list_reviewable_hi_ts",
-        "list_worker_blocks"
-    ],
-    "neptune-db": [
-        "get_engine_status",
-        "get_propertygraph_statistics",
-        "get_propertygraph_stream",
-        "get_propertygraph_summary",
-        "get_rdf_graph_summary",
-        "get_sparql_statistics",
-        "get_sparql_stream",
-        "list_gremlin_queries",
-        "list_loader_jobs",
-        "list_ml_data_processing_jobs",
-        "list_ml_endpoints",
-        "list_ml_model_training_jobs",
-        "list_ml_model_transform_jobs",
-        "list_open_cypher_queries"
-    ],
-    "network-firewall": [
-        "describe_firewall",
-        "describe_firewall_policy",
-        "describe_logging_configuration",
-        "describe_rule_group",
-        "describe_rule_group_metadata",
-        "describe_tls_inspection_configuration",
-        "list_firewall_policies",
-        "list_firewalls",
-        "list_rule_groups",
-        "list_tls_inspection_configurations"
-    ],
-    "networkmanager": [
-        "describe_global_networks",
-        "list_attachments",
-        "list_connect_peers",
-        "list_core_networks",
-        "list_organization_service_access_status",
-        "list_peerings"
-    ],
-    "networkmonitor": [
-        "list_monitors"
-    ],
-    "nimble": [
-        "list_eulas",
-        "list_studios"
-    ],
-    "oam": [
-        "list_links",
-        "list_sinks"
-    ],
-    "omics": [
-        "list_annotation_import_jobs",
-        "list_annotation_stores",
-        "list_reference_stores",
-        "list_run_groups",
-        "list_runs",
-        "list_sequence_stores",
-        "list_variant_import_jobs",
-        "list_variant_stores",
-        "list_workflows"
-    ],
-    "opsworks": [
-        "describe_agent_versions",
-        "describe_apps",
-        "describe_commands",
-        "describe_deployments",
-        "describe_ecs_clusters",
-        "describe_elastic_ips",
-        "describe_elastic_load_balancers",
-        "describe_instances",
-        "describe_layers",
-        "describe_my_user_profile",
-        "describe_operating_systems",
-        "describe_permissions",
-        "describe_raid_arrays",
-        "describe_user_profiles",
-        "describe_volumes"
-    ],
-    "opworks": [
-        "describe_account_attributes",
-        "describe_backups",
-        "describe_servers"
-    ],
-    "organizations": [
-        "describe_organization",
-        "describe_resource_policy",
-        "list_accounts",
-        "list_aws_service_access_for_organization",
-        "list_create_account_status",
-        "list_delegated_administrators",
-        "list_handshakes_for_account",
-        "list_handshakes_for_organization",
-        "list_roots"
-    ],
-    "osis": [
-        "list_pipeline_blueprints",
-        "list_pipelines"
-    ],
-    "outposts": [
-        "list_capacity_tasks",
-        "list_catalog_items",
-        "list_orders",
-        "list_outposts",
-        "list_sites"
-    ],
-    "panorama": [
-        "list_application_instances",
-        "list_devices",
-        "list_devices_jobs",
-        "list_node_from_template_jobs",
-        "list_nodes",
-        "list_package_import_jobs",
-        "list_packages"
-    ],
-    "pca-connector-ad": [
-        "list_connectors",
-        "list_directory_registrations"
-    ],
-    "pca-connector-scep": [
-        "list_connectors"
-    ],
-    "pcs": [
-        "list_clusters"
-    ],
-    "personalize": [
-        "list_batch_inference_jobs",
-        "list_batch_segment_jobs",
-        "list_campaigns",
-        "list_data_deletion_jobs",
-        "list_dataset_export_jobs",
-        "list_dataset_groups",
-        "list_dataset_import_jobs",
-        "list_datasets",
-        "list_event_trackers",
-        "list_filters",
-        "list_metric_attribution_metrics",
-        "list_metric_attributions",
-        "list_recipes",
-        "list_recommenders",
-        "list_schemas",
-        "list_solution_versions",
-        "list_solutions"
-    ],
-    "personalize-runtime": [
-        "get_action_recommendations",
-        "get_recommendations"
-    ],
-    "pinpoint": [
-        "get_apps",
-        "get_recommender_configurations",
-        "list_templates"
-    ],
-    "pipes": [
-        "list_pipes"
-    ],
-    "polly": [
-        "describe_voices",
-        "list_lexicons",
-        "list_speech_synthesis_tasks"
-    ],
-    "pricing": [
-        "describe_services"
-    ],
-    "private-networks": [
-        "list_networks"
-    ],
-    "profile": [
-        "list_domains",
-        "list_profile_object_type_templates"
-    ],
-    "projects.iot1click": [
-        "list_projects"
-    ],
-    "proton": [
-        "get_account_settings",
-        "get_resources_summary",
-        "list_components",
-        "list_deployments",
-        "list_environment_templates",
-        "list_repositories",
-        "list_service_instances",
-        "list_service_templates",
-        "list_services"
-    ],
-    "qbusiness": [
-        "list_applications"
-    ],
-    "qldb": [
-        "list_journal_s3_exports",
-        "list_ledgers"
-    ],
-    "query.timestream": [
-        "describe_account_settings",
-        "describe_endpoints",
-        "list_scheduled_queries"
-    ],
-    "ram": [
-        "get_resource_share_invitations",
-        "list_permission_associations",
-        "list_permissions",
-        "list_replace_permission_associations_work",
-        "list_resource_types"
-    ],
-    "rds": [
-        "describe_account_attributes",
-        "describe_blue_green_deployments",
-        "describe_certificates",
-        "describe_db_cluster_automated_backups",
-        "describe_db_cluster_endpoints",
-        "describe_db_cluster_parameter_groups",
-        "describe_db_cluster_snapshots",
-        "describe_db_clusters",
-        "describe_db_engine_versions",
-        "describe_db_instance_automated_backups",
-        "describe_db_instances",
-        "describe_db_parameter_groups",
-        "describe_db_proxies",
-        "describe_db_proxy_endpoints",
-        "describe_db_recommendations",
-        "describe_db_security_groups",
-        "describe_db_shard_groups",
-        "describe_db_snapshot_tenant_databases",
-        "describe_db_snapshots",
-        "describe_db_subnet_groups",
-        "describe_event_categories",
-        "describe_event_subscriptions",
-        "describe_export_tasks",
-        "describe_global_clusters",
-        "describe_integrations",
-        "describe_option_groups",
-        "describe_pending_maintenance_actions",
-        "describe_reserved_db_instances",
-        "describe_reserved_db_instances_offerings",
-        "describe_source_regions",
-        "describe_tenant_databases"
-    ],
-    "redshift": [
-        "describe_account_attributes",
-        "describe_authentication_profiles",
-        "describe_cluster_db_revisions",
-        "describe_cluster_parameter_groups",
-        "describe_cluster_security_groups",
-        "describe_cluster_subnet_groups",
-        "describe_cluster_tracks",
-        "describe_cluster_versions",
-        "describe_clusters",
-        "describe_custom_domain_associations",
-        "describe_data_shares",
-        "describe_data_shares_for_consumer",
-        "describe_data_shares_for_producer",
-        "describe_endpoint_access",
-        "describe_endpoint_authorization",
-        "describe_event_categories",
-        "describe_event_subscriptions",
-        "describe_hsm_client_certificates",
-        "describe_hsm_configurations",
-        "describe_inbound_integrations",
-        "describe_orderable_cluster_options",
-        "describe_redshift_idc_applications",
-        "describe_reserved_node_exchange_status",
-        "describe_reserved_node_offerings",
-        "describe_reserved_nodes",
-        "describe_snapshot_copy_grants",
-        "describe_snapshot_schedules",
-        "describe_storage",
-        "describe_table_restore_status",
-        "describe_tags",
-        "describe_usage_limits",
-        "get_cluster_credentials_with_iam",
-        "list_recommendations"
-    ],
-    "redshift-data": [
-        "list_statements"
-    ],
-    "redshift-serverless": [
-        "get_credentials",
-        "get_snapshot",
-        "list_custom_domain_associations",
-        "list_endpoint_access",
-        "list_namespaces",
-        "list_recovery_points",
-        "list_scheduled_actions",
-        "list_snapshot_copy_configurations",
-        "list_snapshots",
-        "list_table_restore_status",
-        "list_usage_limits",
-        "list_workgroups"
-    ],
-    "refactor-spaces": [
-        "list_environments"
-    ],
-    "rekognition": [
-        "describe_projects",
-        "list_collections",
-        "list_media_analysis_jobs",
-        "list_stream_processors"
-    ],
-    "repostspace": [
-        "list_spaces"
-    ],
-    "resiliencehub": [
-        "list_app_assessments",
-        "list_apps",
-        "list_recommendation_templates",
-        "list_resiliency_policies",
-        "list_resource_grouping_recommendations",
-        "list_suggested_resiliency_policies"
-    ],
-    "resource-explorer-2": [
-        "batch_get_view",
-        "get_account_level_service_configuration",
-        "get_default_view",
-        "get_index",
-        "list_indexes",
-        "list_supported_resource_types",
-        "list_views"
-    ],
-    "resource-groups": [
-        "get_account_settings",
-        "get_group",
-        "get_group_configuration",
-        "get_group_query"
-    ],
-    "robomaker": [
-        "get_world_template_body",
-        "list_deployment_jobs",
-        "list_fleets",
-        "list_robot_applications",
-        "list_robots",
-        "list_simulation_applications",
-        "list_simulation_job_batches",
-        "list_simulation_jobs",
-        "list_world_export_jobs",
-        "list_world_generation_jobs",
-        "list_world_templates",
-        "list_worlds"
-    ],
-    "rolesanywhere": [
-        "get_crl",
-        "get_profile",
-        "get_trust_anchor",
-        "list_crls",
-        "list_profiles",
-        "list_subjects",
-        "list_trust_anchors"
-    ],
-    "route53": [
-        "get_health_check_count",
-        "get_hosted_zone_count",
-        "get_traffic_policy_instance_count",
-        "list_cidr_collections",
-        "list_health_checks",
-        "list_hosted_zones",
-        "list_hosted_zones_by_name",
-        "list_query_logging_configs",
-        "list_reusable_delegation_sets",
-        "list_traffic_policies",
-        "list_traffic_policy_instances"
-    ],
-    "route53-recovery-cluster": [
-        "list_routing_controls"
-    ],
-    "route53-recovery-control-config": [
-        "list_clusters",
-        "list_control_panels"
-    ],
-    "route53-recovery-readiness": [
-        "list_cells",
-        "list_cross_account_authorizations",
-        "list_readiness_checks",
-        "list_recovery_groups",
-        "list_resource_sets",
-        "list_rules"
-    ],
-    "route53domains": [
-        "get_contact_reachability_status",
-        "list_operations",
-        "list_prices"
-    ],
-    "route53profiles": [
-        "list_profile_associations",
-        "list_profiles"
-    ],
-    "route53resolver": [
-        "list_firewall_configs",
-        "list_firewall_domain_lists",
-        "list_firewall_rule_group_associations",
-        "list_firewall_rule_groups",
-        "list_outpost_resolvers",
-        "list_resolver_configs",
-        "list_resolver_dnssec_configs",
-        "list_resolver_endpoints",
-        "list_resolver_query_log_config_associations",
-        "list_resolver_query_log_configs",
-        "list_resolver_rule_associations",
-        "list_resolver_rules"
-    ],
-    "rum": [
-        "list_app_monitors"
-    ],
-    "s3": [
-        "list_buckets",
-        "list_directory_buckets"
-    ],
-    "s3-outposts": [
-        "list_endpoints",
-        "list_outposts_with_s3"
-    ],
-    "sagemaker": [
-        "get_sagemaker_servicecatalog_portfolio_status",
-        "list_actions",
-        "list_algorithms",
-        "list_app_image_configs",
-        "list_apps",
-        "list_artifacts",
-        "list_associations",
-        "list_auto_ml_jobs",
-        "list_clusters",
-        "list_code_repositories",
-        "list_compilation_jobs",
-        "list_contexts",
-        "list_data_quality_job_definitions",
-        "list_device_fleets",
-        "list_devices",
-        "list_domains",
-        "list_edge_deployment_plans",
-        "list_edge_packaging_jobs",
-        "list_endpoint_configs",
-        "list_endpoints",
-        "list_experiments",
-        "list_feature_groups",
-        "list_flow_definitions",
-        "list_hubs",
-        "list_human_task_uis",
-        "list_hyper_parameter_tuning_jobs",
-        "list_images",
-        "list_inference_components",
-        "list_inference_experiments",
-        "list_inference_recommendations_jobs",
-        "list_labeling_jobs",
-        "list_lineage_groups",
-        "list_mlflow_tracking_servers",
-        "list_model_bias_job_definitions",
-        "list_model_cards",
-        "list_model_explainability_job_definitions",
-        "list_model_package_groups",
-        "list_model_packages",
-        "list_model_quality_job_definitions",
-        "list_models",
-        "list_monitoring_alert_history",
-        "list_monitoring_executions",
-        "list_monitoring_schedules",
-        "list_notebook_instance_lifecycle_configs",
-        "list_notebook_instances",
-        "list_optimization_jobs",
-        "list_pipeline_execution_steps",
-        "list_pipelines",
-        "list_processing_jobs",
-        "list_projects",
-        "list_resource_catalogs",
-        "list_spaces",
-        "list_studio_lifecycle_configs",
-        "list_subscribed_workteams",
-        "list_training_jobs",
-        "list_transform_jobs",
-        "list_trial_components",
-        "list_trials",
-        "list_user_profiles",
-        "list_workforces",
-        "list_workteams"
-    ],
-    "sagemaker-geospatial": [
-        "list_earth_observation_jobs",
-        "list_raster_data_collections",
-        "list_vector_enrichment_jobs"
-    ],
-    "savingsplans": [
-        "describe_savings_plans",
-        "describe_savings_plans_offering_rates",
-        "describe_savings_plans_offerings"
-    ],
-    "scheduler": [
-        "list_schedule_groups",
-        "list_schedules"
-    ],
-    "schemas": [
-        "get_resource_policy",
-        "list_discoverers",
-        "list_registries"
-    ],
-    "sdb": [
-        "list_domains"
-    ],
-    "secretsmanager": [
-        "batch_get_secret_value",
-        "get_random_password",
-        "list_secrets"
-    ],
-    "securityhub": [
-        "describe_action_targets",
-        "describe_hub",
-        "describe_organization_configuration",
-        "describe_products",
-        "describe_standards",
-        "get_administrator_account",
-        "get_enabled_standards",
-        "get_findings",
-        "get_insights",
-        "get_invitations_count",
-        "get_master_account",
-        "list_automation_rules",
-        "list_configuration_policies",
-        "list_configuration_policy_associations",
-        "list_enabled_products_for_import",
-        "list_finding_aggregators",
-        "list_invitations",
-        "list_members",
-        "list_organization_admin_accounts",
-        "list_security_control_definitions"
-    ],
-    "securitylake": [
-        "get_data_lake_exception_subscription",
-        "get_data_lake_organization_configuration",
-        "get_data_lake_sources",
-        "list_data_lake_exceptions",
-        "list_data_lakes",
-        "list_log_sources",
-        "list_subscribers"
-    ],
-    "serverlessrepo": [
-        "list_applications"
-    ],
-    "servicecatalog": [
-        "describe_product",
-        "describe_product_as_admin",
-        "describe_provisioned_product",
-        "describe_provisioning_artifact",
-        "describe_provisioning_parameters",
-        "get_aws_organizations_access_status",
-        "get_provisioned_product_outputs",
-        "list_accepted_portfolio_shares",
-        "list_portfolios",
-        "list_provisioned_product_plans",
-        "list_record_history",
-        "list_service_actions",
-        "list_tag_options"
-    ],
-    "servicecatalog-appregistry": [
-        "get_configuration",
-        "list_applications",
-        "list_attribute_groups"
-    ],
-    "servicequotas": [
-        "get_association_for_service_quota_template",
-        "list_requested_service_quota_change_history",
-        "list_service_quota_increase_requests_in_template",
-        "list_services"
-    ],
-    "shield": [
-        "describe_attack_statistics",
-        "describe_drt_access",
-        "describe_emergency_contact_settings",
-        "describe_protection",
-        "describe_subscription",
-        "get_subscription_state",
-        "list_attacks",
-        "list_protection_groups",
-        "list_protections"
-    ],
-    "signer": [
-        "list_signing_jobs",
-        "list_signing_platforms",
-        "list_signing_profiles"
-    ],
-    "simspaceweaver": [
-        "list_simulations"
-    ],
-    "sms": [
-        "get_app",
-        "get_app_launch_configuration",
-        "get_app_replication_configuration",
-        "get_connectors",
-        "get_replication_jobs",
-        "get_servers",
-        "list_apps"
-    ],
-    "sms-voice": [
-        "describe_account_attributes",
-        "describe_account_limits",
-        "describe_opt_out_lists",
-        "describe_spend_limits"
-    ],
-    "sms-voice.pinpoint": [
-        "list_configuration_sets"
-    ],
-    "snow-device-management": [
-        "list_devices",
-        "list_tasks"
-    ],
-    "snowball": [
-        "describe_addresses",
-        "get_snowball_usage",
-        "list_clusters",
-        "list_compatible_images",
-        "list_jobs",
-        "list_long_term_pricing",
-        "list_pickup_locations"
-    ],
-    "sns": [
-        "get_sms_attributes",
-        "get_sms_sandbox_account_status",
-        "list_origination_numbers",
-        "list_phone_numbers_opted_out",
-        "list_platform_applications",
-        "list_sms_sandbox_phone_numbers",
-        "list_subscriptions",
-        "list_topics"
-    ],
-    "sqs": [
-        "list_queues"
-    ],
-    "ssm": [
-        "describe_activations",
-        "describe_association",
-        "describe_available_patches",
-        "describe_inventory_deletions",
-        "describe_maintenance_window_schedule",
-        "describe_maintenance_windows",
-        "describe_patch_baselines",
-        "describe_patch_groups",
-        "get_default_patch_baseline",
-        "get_inventory_schema",
-        "list_command_invocations",
-        "list_commands",
-        "list_compliance_items",
-        "list_compliance_summaries",
-        "list_resource_compliance_summaries",
-        "list_resource_data_sync"
-    ],
-    "ssm-contacts": [
-        "list_contacts",
-        "list_engagements",
-        "list_rotations"
-    ],
-    "ssm-incidents": [
-        "list_incident_records",
-        "list_replication_sets",
-        "list_response_plans"
-    ],
-    "ssm-quicksetup": [
-        "get_service_settings",
-        "list_quick_setup_types"
-    ],
-    "ssm-sap": [
-        "get_application",
-        "get_database",
-        "list_applications",
-        "list_components",
-        "list_databases"
-    ],
-    "sso": [
-        "list_application_providers",
-        "list_instances"
-    ],
-    "states": [
-        "list_activities",
-        "list_executions",
-        "list_state_machines"
-    ],
-    "storagegateway": [
-        "describe_tape_archives",
-        "list_automatic_tape_creation_policies",
-        "list_file_shares",
-        "list_file_system_associations",
-        "list_gateways",
-        "list_tape_pools",
-        "list_tapes",
-        "list_volumes"
-    ],
-    "streams.dynamodb": [
-        "list_streams"
-    ],
-    "sts": [
-        "get_caller_identity",
-        "get_session_token"
-    ],
-    "support": [
-        "describe_cases",
-        "describe_services",
-        "describe_severity_levels"
-    ],
-    "supportapp": [
-        "get_account_alias",
-        "list_slack_channel_configurations",
-        "list_slack_workspace_configurations"
-    ],
-    "synthetics": [
-        "describe_canaries",
-        "describe_canaries_last_run",
-        "describe_runtime_versions",
-        "list_groups"
-    ],
-    "tagging": [
-        "describe_report_creation",
-        "get_compliance_summary",
-        "get_resources",
-        "get_tag_keys"
-    ],
-    "tax": [
-        "get_tax_registration",
-        "list_tax_registrations"
-    ],
-    "textract": [
-        "list_adapter_versions",
-        "list_adapters"
-    ],
-    "thinclient": [
-        "list_devices",
-        "list_environments",
-        "list_software_sets"
-    ],
-    "timestream-influxdb": [
-        "list_db_instances",
-        "list_db_parameter_groups"
-    ],
-    "tnb": [
-        "list_sol_function_instances",
-        "list_sol_function_packages",
-        "list_sol_network_instances",
-        "list_sol_network_operations",
-        "list_sol_network_packages"
-    ],
-    "transcribe": [
-        "list_call_analytics_categories",
-        "list_call_analytics_jobs",
-        "list_language_models",
-        "list_medical_scribe_jobs",
-        "list_medical_transcription_jobs",
-        "list_medical_vocabularies",
-        "list_transcription_jobs",
-        "list_vocabularies",
-        "list_vocabulary_filters"
-    ],
-    "transfer": [
-        "list_certificates",
-        "list_connectors",
-        "list_profiles",
-        "list_security_policies",
-        "list_servers",
-        "list_workflows"
-    ],
-    "translate": [
-        "list_languages",
-        "list_parallel_data",
-        "list_terminologies",
-        "list_text_translation_jobs"
-    ],
-    "trustedadvisor": [
-        "list_checks",
-        "list_organization_recommendations",
-        "list_recommendations"
-    ],
-    "tunneling.iot": [
-        "list_tunnels"
-    ],
-    "verifiedpermissions": [
-        "list_policy_stores"
-    ],
-    "voice-chime": [
-        "get_global_settings",
-        "get_phone_number_settings",
-        "list_available_voice_connector_regions",
-        "list_phone_number_orders",
-        "list_phone_numbers",
-        "list_sip_media_applications",
-        "list_sip_rules",
-        "list_voice_connector_groups",
-        "list_voice_connectors",
-        "list_voice_profile_domains"
-    ],
-    "voiceid": [
-        "list_domains"
-    ],
-    "vpc-lattice": [
-        "list_service_network_service_associations",
-        "list_service_network_vpc_associations",
-        "list_service_networks",
-        "list_services",
-        "list_target_groups"
-    ],
-    "waf": [
-        "get_change_token",
-        "list_activated_rules_in_rule_group",
-        "list_byte_match_sets",
-        "list_geo_match_sets",
-        "list_ip_sets",
-        "list_logging_configurations",
-        "list_rate_based_rules",
-        "list_regex_match_sets",
-        "list_regex_pattern_sets",
-        "list_rule_groups",
-        "list_rules",
-        "list_size_constraint_sets",
-        "list_sql_injection_match_sets",
-        "list_subscribed_rule_groups",
-        "list_xss_match_sets"
-    ],
-    "waf-regional": [
-        "get_change_token",
-        "list_activated_rules_in_rule_group",
-        "list_byte_match_sets",
-        "list_geo_match_sets",
-        "list_ip_sets",
-        "list_logging_configurations",
-        "list_rate_based_rules",
-        "list_regex_match_sets",
-        "list_regex_pattern_sets",
-        "list_rule_groups",
-        "list_rules",
-        "list_size_constraint_sets",
-        "list_sql_injection_match_sets",
-        "list_subscribed_rule_groups",
-        "list_xss_match_sets"
-    ],
-    "wafv2": [
-        "get_rule_group"
-    ],
-    "wellarchitected": [
-        "get_global_settings",
-        "get_profile_template",
-        "list_lenses",
-        "list_notifications",
-        "list_profile_notifications",
-        "list_profiles",
-        "list_review_templates",
-        "list_share_invitations",
-        "list_workloads"
-    ],
-    "wisdom": [
-        "list_assistants",
-        "list_knowledge_bases"
-    ],
-    "workdocs": [
-        "describe_activities",
-        "describe_users",
-        "get_resources"
-    ],
-    "worklink": [
-        "list_fleets"
-    ],
-    "workmail": [
-        "list_organizations"
-    ],
-    "workspaces": [
-        "describe_account",
-        "describe_account_modifications",
-        "describe_connection_aliases",
-        "describe_ip_groups",
-        "describe_workspace_bundles",
-        "describe_workspace_images",
-        "describe_workspaces",
-        "describe_workspaces_connection_status",
-        "get_account_link",
-        "list_account_links"
-    ],
-    "workspaces-web": [
-        "list_browser_settings",
-        "list_ip_access_settings",
-        "list_network_settings",
-        "list_portals",
-        "list_trust_stores",
-        "list_user_access_logging_settings",
-        "list_user_settings"
-    ],
-    "xray": [
-        "get_encryption_config",
-        "get_group",
-        "get_groups",
-        "get_sampling_rules",
-        "get_sampling_statistic_summaries",
-        "list_resource_policies"
-    ]
-}
+"""
+The operations tested by the bruteforce scan now live in catalog.jsonl, see
+enumerate_iam/catalog.py. BRUTEFORCE_TESTS is kept for code which imports it,
+it is built from the catalog when first accessed.
+"""
+from enumerate_iam.catalog import get_catalog
+
+
+def __getattr__(name):
+    if name == 'BRUTEFORCE_TESTS':
+        return get_catalog().to_dict()
+
+    raise AttributeError(name)
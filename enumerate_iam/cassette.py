@@ -0,0 +1,338 @@
+"""
+Record / replay of the HTTP traffic of a scan
+
+Scan performance can't be compared between builds against live AWS: the
+latency of the endpoints changes from one minute to the next, and it needs
+credentials and network access. A CassetteRecorder hooks the botocore events
+of the scanner's sessions and writes every response (one line per attempt,
+so throttled attempts are kept too) to a cassette file, without the request
+headers and with the access key, secret keys and session tokens in the
+response bodies replaced by REDACTED.
+
+A CassettePlayer serves the responses of a cassette from the before-send
+event instead of sending the requests: botocore still signs, parses and
+retries every call, only the network is replaced by a configurable latency.
+It can also answer a share of the requests with a throttling error, to
+benchmark the adaptive controller and the retry paths.
+
+    * responses are looked up by (service, operation, region), the responses
+      recorded for the same key are served in order and then again from the
+      first one
+    * requests which are not in the cassette fail like an unreachable
+      endpoint
+    * cassettes whose name ends with .gz are compressed
+"""
+import re
+import gzip
+import json
+import time
+import base64
+import random
+import logging
+import threading
+
+from botocore.exceptions import EndpointConnectionError
+
+REDACTED = 'REDACTED'
+
+# Headers which change on every call, or which the player sets itself
+DROPPED_HEADERS = {'connection',
+                   'content-length',
+                   'date',
+                   'keep-alive',
+                   'server',
+                   'via',
+                   'x-amz-cf-id',
+                   'x-amz-cf-pop',
+                   'x-amz-id-2',
+                   'x-amz-request-id',
+                   'x-amzn-requestid',
+                   'x-cache'}
+
+SECRET_PATTERNS = (
+    re.compile(r'("(?:SecretAccessKey|SecretKey|SessionToken)"\s*:\s*")[^"]*(")'),
+    re.compile(r'(<(?:SecretAccessKey|SecretKey|SessionToken)>)[^<]*(</)'),
+)
+
+# Credential=<access key>/<date>/<region>/<service>/aws4_request
+CREDENTIAL_SCOPE_RE = re.compile(r'Credential=([^/,\s]+)/[^/]+/([^/]+)/')
+
+# A throttling error in the format of each protocol, (status, headers, body)
+THROTTLING_RESPONSES = {
+    'json': (400,
+             {'content-type': 'application/x-amz-json-1.1'},
+             '{"__type":"ThrottlingException","message":"Rate exceeded"}'),
+    'rest-json': (429,
+                  {'content-type': 'application/json', 'x-amzn-errortype': 'ThrottlingException'},
+                  '{"message":"Rate exceeded"}'),
+    'query': (400,
+              {'content-type': 'text/xml'},
+              '<ErrorResponse><Error><Type>Sender</Type><Code>Throttling</Code>'
+              '<Message>Rate exceeded</Message></Error><RequestId>0</RequestId></ErrorResponse>'),
+    'ec2': (503,
+            {'content-type': 'text/xml;charset=UTF-8'},
+            '<Response><Errors><Error><Code>RequestLimitExceeded</Code><Message>Request limit exceeded.'
+            '</Message></Error></Errors><RequestID>0</RequestID></Response>'),
+    'rest-xml': (503,
+                 {'content-type': 'application/xml'},
+                 '<Error><Code>SlowDown</Code><Message>Please reduce your request rate.</Message></Error>'),
+}
+
+
+def open_cassette(filename, mode):
+    if filename.endswith('.gz'):
+        return gzip.open(filename, mode + 't', encoding='utf-8')
+
+    return open(filename, mode, encoding='utf-8')
+
+
+def get_credential_scope(request):
+    """
+    :return: The access key and the signing region of a signed request, None
+             and None when it isn't signed with SigV4
+    """
+    authorization = request.headers.get('Authorization', b'')
+
+    if isinstance(authorization, bytes):
+        authorization = authorization.decode('utf-8', 'replace')
+
+    match = CREDENTIAL_SCOPE_RE.search(authorization)
+    return match.groups() if match else (None, None)
+
+
+def get_event_key(event_name, region):
+    """
+    :return: The (service, operation, region) key of a before-send or a
+             response-received event, the service is botocore's service id
+    """
+    _, service_id, operation_name = event_name.split('.', 2)
+    return service_id, operation_name, region
+
+
+def get_protocol(model):
+    service_model = model.service_model
+    return getattr(service_model, 'resolved_protocol', None) or service_model.protocol
+
+
+def scrub(text, secrets):
+    for pattern in SECRET_PATTERNS:
+        text = pattern.sub(r'\1%s\2' % REDACTED, text)
+
+    for secret in secrets:
+        text = text.replace(secret, REDACTED)
+
+    return text
+
+
+class CassetteRecorder:
+    def __init__(self, filename):
+        self.filename = filename
+        self.file = open_cassette(filename, 'w')
+        self.lock = threading.Lock()
+        self.recorded = 0
+
+    def register(self, events, is_async=False):
+        events.register('before-send', self.before_send)
+        events.register('response-received', self.response_received)
+
+    def before_send(self, request, **kwargs):
+        # The response-received event has the request context but not the
+        # request. The signing region is the key rather than the client
+        # region, which is e.g. "aws-global" for IAM unless an endpoint URL
+        # is configured
+        if request.context is not None:
+            request.context['cassette_scope'] = get_credential_scope(request)
+
+    def response_received(self, event_name, response_dict, context, exception, **kwargs):
+        access_key, region = context.get('cassette_scope', (None, None))
+        service_id, operation_name, region = get_event_key(event_name, region or context.get('client_region'))
+        record = {'service': service_id, 'operation': operation_name, 'region': region}
+
+        if response_dict is None:
+            record['error'] = type(exception).__name__
+        else:
+            body = response_dict['body']
+
+            if not isinstance(body, bytes):
+                # Streaming response, reading it here would consume it
+                return
+
+            record['status'] = response_dict['status_code']
+            record['headers'] = {name.lower(): value for name, value in response_dict['headers'].items()
+                                 if name.lower() not in DROPPED_HEADERS}
+
+            try:
+                record['body'] = scrub(body.decode('utf-8'), [access_key] if access_key else [])
+            except UnicodeDecodeError:
+                record['body_base64'] = base64.b64encode(body).decode('ascii')
+
+        line = json.dumps(record, separators=(',', ':'))
+
+        with self.lock:
+            self.file.write(line + '\n')
+            self.recorded += 1
+
+    def close(self):
+        with self.lock:
+            if self.file.closed:
+                return
+
+            self.file.close()
+
+        logging.getLogger().info(f'📼 Recorded {self.recorded} responses to {self.filename}')
+
+
+class ReplayBody:
+    """
+    The raw response of a replayed call, as read by AWSResponse and
+    aiobotocore's AioAWSResponse
+    """
+    def __init__(self, body):
+        self.body = body
+
+    def stream(self, **kwargs):
+        yield self.body
+
+    async def read(self):
+        return self.body
+
+
+class CassettePlayer:
+    def __init__(self, filename, latency=0.0, jitter=0.0, throttle_rate=0.0, seed=0):
+        self.filename = filename
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+        self.responses = {}
+        self.positions = {}
+        self.served = 0
+        self.throttled = 0
+        self.missing = set()
+
+        self.load()
+
+    def load(self):
+        with open_cassette(self.filename, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+
+                key = record['service'], record['operation'], record['region']
+                self.responses.setdefault(key, []).append(record)
+
+        logging.getLogger().info(f'📼 Loaded {sum(len(records) for records in self.responses.values())} '
+                                 f'responses for {len(self.responses)} operations from {self.filename}')
+
+    def register(self, events, is_async=False):
+        events.register('before-call', self.before_call)
+        events.register('before-send', self.before_send_async if is_async else self.before_send)
+
+    def before_call(self, model, context, **kwargs):
+        # Throttling errors are built in the protocol of the service, which
+        # the before-send event doesn't have
+        context['cassette_protocol'] = get_protocol(model)
+
+    def _next(self, event_name, request):
+        """
+        :return: The delay and the (status, headers, body) of the response,
+                 raise EndpointConnectionError when there is none
+        """
+        context = request.context or {}
+        _, region = get_credential_scope(request)
+        key = get_event_key(event_name, region or context.get('client_region'))
+
+        with self.lock:
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+            throttle = self.throttle_rate and self.random.random() < self.throttle_rate
+            protocol = context.get('cassette_protocol')
+
+            if throttle and protocol in THROTTLING_RESPONSES:
+                self.throttled += 1
+                return delay, THROTTLING_RESPONSES[protocol]
+
+            records = self.responses.get(key)
+
+            if not records:
+                self.missing.add(key)
+                raise EndpointConnectionError(endpoint_url=request.url)
+
+            position = self.positions.get(key, 0)
+            self.positions[key] = position + 1
+            self.served += 1
+
+        record = records[position % len(records)]
+
+        if 'error' in record:
+            raise EndpointConnectionError(endpoint_url=request.url)
+
+        if 'body_base64' in record:
+            body = base64.b64decode(record['body_base64'])
+        else:
+            body = record['body']
+
+        return delay, (record['status'], record['headers'], body)
+
+    @staticmethod
+    def _get_headers(headers, body):
+        headers = dict(headers)
+        headers['content-length'] = str(len(body))
+        return headers
+
+    def before_send(self, request, event_name, **kwargs):
+        from botocore.awsrequest import AWSResponse
+
+        delay, (status, headers, body) = self._next(event_name, request)
+
+        if delay:
+            time.sleep(delay)
+
+        body = body.encode('utf-8') if isinstance(body, str) else body
+        return AWSResponse(request.url, status, self._get_headers(headers, body), ReplayBody(body))
+
+    async def before_send_async(self, request, event_name, **kwargs):
+        import asyncio
+        from aiobotocore.awsrequest import AioAWSResponse
+
+        delay, (status, headers, body) = self._next(event_name, request)
+
+        if delay:
+            await asyncio.sleep(delay)
+
+        body = body.encode('utf-8') if isinstance(body, str) else body
+        return AioAWSResponse(request.url, status, self._get_headers(headers, body), ReplayBody(body))
+
+    def close(self):
+        logger = logging.getLogger()
+        logger.info(f'📼 Replayed {self.served} responses, injected {self.throttled} throttling errors')
+
+        if self.missing:
+            logger.warning(f'⚠️  {len(self.missing)} operations were not in the cassette {self.filename}, '
+                           f'e.g. {", ".join(".".join(map(str, key)) for key in sorted(self.missing, key=str)[:3])}')
+
+
+CASSETTE = None
+
+
+def set_cassette(cassette):
+    """
+    Record or replay the traffic of the sessions created from now on, set it
+    before the first scan
+    """
+    global CASSETTE
+    CASSETTE = cassette
+
+
+def register_cassette(events, is_async=False):
+    """
+    Register the handlers of the cassette, if one is set, on the event
+    emitter of a new boto3 or aiobotocore session: boto3's Session.events,
+    or get_component('event_emitter') of an aiobotocore session
+    """
+    if CASSETTE is not None:
+        CASSETTE.register(events, is_async=is_async)
@@ -0,0 +1,315 @@
+"""
+Operation catalog: the services and operations tested by the bruteforce scan
+
+The catalog is stored in catalog.jsonl, an indexed JSON lines file:
+
+    * The first line is a header with the format version, the number of
+      services, candidate operations and callable operations, and an index
+      mapping each service name to the (offset, length) of its line,
+      relative to the end of the header.
+
+    * Every other line holds one service:
+
+        {"service": "ec2", "operations": ["describe_instances", ...],
+         "endpoint_prefix": "ec2", "metadata": {"describe_instances": {...}}}
+
+      Service names are boto3 client names. endpoint_prefix, the key of the
+      service in botocore's endpoint data, is only there when it differs
+      from the service name. metadata is optional and only lists the
+      operations which have any.
+
+The metadata of an operation holds the facts generate_bruteforce_tests.py
+resolved from its service model:
+
+    * required: the input members the caller has to provide, operations
+      which have any can't be called without parameters and are never sent
+    * paginated: the operation has a paginator
+    * dry_run: the operation accepts the DryRun parameter
+    * dry_run_params: placeholder values of the required parameters of a
+      read-only operation which accepts DryRun, it can be probed with them
+    * global: the operation is answered by a partition wide endpoint, the
+      same answer for every region
+
+get_operations(), and the Mapping interface, only return the callable
+operations, plus the ones with dry_run_params for a DryRun probe scan.
+get_candidates() returns all of them.
+
+The file is memory-mapped and only the header is parsed when it is opened,
+a service's line is parsed the first time that service is looked up. This
+replaces importing the bruteforce_tests.py dict literal, which was parsed,
+compiled and fully built on every start.
+
+main.py, version_checker.py and generate_bruteforce_tests.py all go through
+this module.
+"""
+import os
+import json
+import mmap
+import threading
+
+from collections.abc import Mapping
+
+CATALOG_FORMAT = 2
+
+# Format 1 catalogs have no required metadata, all their operations are
+# callable
+READABLE_FORMATS = (1, CATALOG_FORMAT)
+CATALOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'catalog.jsonl')
+
+_CATALOG = None
+_CATALOG_LOCK = threading.Lock()
+
+
+class CatalogError(Exception):
+    pass
+
+
+def parse_header(line):
+    """
+    :param line: The first line of a catalog file, bytes or str
+    :return: The header dict
+    """
+    try:
+        header = json.loads(line)
+    except ValueError as e:
+        raise CatalogError(f'Invalid catalog header: {e}')
+
+    if not isinstance(header, dict) or header.get('format') not in READABLE_FORMATS:
+        raise CatalogError(f'Unsupported catalog format: {header.get("format") if isinstance(header, dict) else None}')
+
+    return header
+
+
+def is_callable(metadata, dry_run=False):
+    """
+    :param metadata: The metadata dict of one operation
+    :param dry_run: True for a DryRun probe scan
+    :return: True if the operation can be called without parameters, or
+             probed with DryRun and its placeholder parameters
+    """
+    if not metadata.get('required', None):
+        return True
+
+    return dry_run and 'dry_run_params' in metadata
+
+
+class OperationCatalog(Mapping):
+    """
+    Read-only mapping of service name to its list of callable operation
+    names, backed by a memory-mapped catalog file
+    """
+    def __init__(self, filename=CATALOG_FILE):
+        self.filename = filename
+
+        with open(filename, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header_end = self.mmap.find(b'\n')
+        if header_end == -1:
+            raise CatalogError(f'{filename} has no header')
+
+        self.header = parse_header(self.mmap[:header_end])
+        self.body_start = header_end + 1
+        self.index = self.header['index']
+        self.services = {}
+
+    @property
+    def operation_count(self):
+        """
+        Number of callable operations, the ones the scan tests
+        """
+        return self.header['operations']
+
+    @property
+    def candidate_count(self):
+        return self.header.get('candidates', self.header['operations'])
+
+    def get_operation_count(self, dry_run=False):
+        """
+        :return: The number of operations a scan tests, operation_count or
+                 the number of operations a DryRun probe scan tests
+        """
+        if dry_run:
+            return self.header.get('dry_run_operations', self.header['operations'])
+
+        return self.header['operations']
+
+    @property
+    def digest(self):
+        """
+        SHA-256 of the catalog file, identifies the exact set of operations
+        """
+        import hashlib
+
+        return hashlib.sha256(self.mmap[:]).hexdigest()
+
+    def get_service(self, service_name):
+        """
+        :return: The parsed line of service_name, raises KeyError if the
+                 catalog does not have it
+        """
+        service = self.services.get(service_name, None)
+        if service is not None:
+            return service
+
+        offset, length = self.index[service_name]
+        start = self.body_start + offset
+
+        service = json.loads(self.mmap[start:start + length])
+
+        metadata = service.get('metadata', {})
+        service['callable'] = [operation_name for operation_name in service['operations']
+                               if is_callable(metadata.get(operation_name, {}))]
+        service['dry_run_callable'] = [operation_name for operation_name in service['operations']
+                                       if is_callable(metadata.get(operation_name, {}), dry_run=True)]
+
+        self.services[service_name] = service
+
+        return service
+
+    def get_operations(self, service_name, dry_run=False):
+        """
+        :return: The operations of service_name which can be called without
+                 parameters, and with dry_run the ones which can be probed
+                 with DryRun
+        """
+        return self.get_service(service_name)['dry_run_callable' if dry_run else 'callable']
+
+    def get_candidates(self, service_name):
+        """
+        :return: Every read-only operation of service_name, callable or not
+        """
+        return self.get_service(service_name)['operations']
+
+    def get_endpoint_prefix(self, service_name):
+        """
+        :return: The endpoint prefix of service_name, the service name itself
+                 for services the catalog does not know
+        """
+        if service_name not in self.index:
+            return service_name
+
+        return self.get_service(service_name).get('endpoint_prefix', service_name)
+
+    def get_metadata(self, service_name, operation_name):
+        """
+        :return: The metadata dict of one operation, empty if it has none
+        """
+        return self.get_service(service_name).get('metadata', {}).get(operation_name, {})
+
+    def __getitem__(self, service_name):
+        return self.get_operations(service_name)
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, service_name):
+        return service_name in self.index
+
+    def to_dict(self):
+        return {service_name: list(self.get_operations(service_name)) for service_name in self.index}
+
+    def to_metadata(self):
+        """
+        :return: The {service: {operation: dict}} metadata of every candidate
+                 operation, in the format write_catalog() takes
+        """
+        return {service_name: dict(self.get_service(service_name).get('metadata', {})) for service_name in self.index}
+
+    def close(self):
+        self.mmap.close()
+
+
+def get_catalog():
+    """
+    Return the OperationCatalog of the package's catalog.jsonl, opened on
+    first use and shared by the whole process
+    """
+    global _CATALOG
+
+    if _CATALOG is not None:
+        return _CATALOG
+
+    with _CATALOG_LOCK:
+        if _CATALOG is None:
+            _CATALOG = OperationCatalog(CATALOG_FILE)
+
+    return _CATALOG
+
+
+def serialize_catalog(services, metadata=None, endpoint_prefixes=None):
+    """
+    :param services: A dict with the list of operation names of each service
+    :param metadata: An optional {service: {operation: dict}} with the
+                     metadata of the operations
+    :param endpoint_prefixes: An optional {service: endpoint prefix}
+    :return: The catalog file content, as bytes
+    """
+    metadata = metadata or {}
+    endpoint_prefixes = endpoint_prefixes or {}
+
+    lines = []
+    index = {}
+    offset = 0
+
+    for service_name in sorted(services):
+        service = {'service': service_name,
+                   'operations': sorted(services[service_name])}
+
+        endpoint_prefix = endpoint_prefixes.get(service_name, service_name)
+        if endpoint_prefix != service_name:
+            service['endpoint_prefix'] = endpoint_prefix
+
+        service_metadata = {operation_name: operation_metadata
+                            for operation_name, operation_metadata in metadata.get(service_name, {}).items()
+                            if operation_metadata and operation_name in services[service_name]}
+
+        if service_metadata:
+            service['metadata'] = service_metadata
+
+        line = json.dumps(service, sort_keys=True).encode('utf-8')
+
+        index[service_name] = [offset, len(line)]
+        lines.append(line)
+        offset += len(line) + 1
+
+    def count_callable(dry_run):
+        return sum(1 for service_name, operations in services.items() for operation_name in operations
+                   if is_callable(metadata.get(service_name, {}).get(operation_name, {}), dry_run=dry_run))
+
+    header = {'format': CATALOG_FORMAT,
+              'services': len(services),
+              'candidates': sum(len(operations) for operations in services.values()),
+              'operations': count_callable(False),
+              'dry_run_operations': count_callable(True),
+              'index': index}
+
+    return b'\n'.join([json.dumps(header, sort_keys=True).encode('utf-8')] + lines) + b'\n'
+
+
+def write_catalog(services, filename=CATALOG_FILE, metadata=None, endpoint_prefixes=None):
+    content = serialize_catalog(services, metadata=metadata, endpoint_prefixes=endpoint_prefixes)
+
+    # Write next to the catalog and rename, a process reading (or mapping)
+    # the old file is not affected
+    temp_filename = filename + '.tmp'
+
+    with open(temp_filename, 'wb') as f:
+        f.write(content)
+
+    os.replace(temp_filename, filename)
+
+
+def parse_catalog_services(content):
+    """
+    :param content: The content of a catalog file, bytes or str
+    :return: The set of service names in its header
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+
+    header_end = content.find(b'\n')
+    return set(parse_header(content[:header_end] if header_end != -1 else content)['index'])
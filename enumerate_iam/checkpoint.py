@@ -0,0 +1,83 @@
+"""
+Checkpoint file for interrupted bruteforce scans
+
+Every tested (service, operation, region) is appended to the checkpoint file
+as one JSON line with its outcome, and the response for allowed operations.
+When the scan is resumed the file is loaded, finished operations are skipped
+and their results are added to the output, so handing the same checkpoint
+fresh credentials continues the scan where it stopped.
+"""
+import os
+import json
+import logging
+import threading
+
+from enumerate_iam.outcomes import ALLOWED, FINISHED_OUTCOMES
+from enumerate_iam.utils.json_utils import json_encoder
+
+
+class Checkpoint:
+    def __init__(self, filename, resume=False):
+        self.filename = filename
+        self.completed = {}
+        self.allowed = []
+        self.lock = threading.Lock()
+
+        if resume:
+            self.load()
+
+        self.file = open(filename, 'a' if resume else 'w', encoding='utf-8')
+
+    def load(self):
+        logger = logging.getLogger()
+
+        if not os.path.exists(self.filename):
+            logger.info('Checkpoint file %s does not exist, starting a new scan' % self.filename)
+            return
+
+        with open(self.filename, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # The last line might be incomplete if the process was killed
+                    continue
+
+                outcome = record.get('outcome')
+
+                if outcome in FINISHED_OUTCOMES:
+                    self.completed[self._get_key(record)] = outcome
+
+                if outcome == ALLOWED:
+                    self.allowed.append(record)
+
+        logger.info('Loaded %d finished operations from checkpoint %s' % (len(self.completed), self.filename))
+
+    @staticmethod
+    def _get_key(record):
+        return record['service'], record['operation'], record['region']
+
+    def is_finished(self, service_name, operation_name, region):
+        return (service_name, operation_name, region) in self.completed
+
+    def get_allowed(self, region=None):
+        """
+        :return: The records of the allowed operations loaded from the checkpoint
+        """
+        return [record for record in self.allowed if region in (None, record['region'])]
+
+    def record(self, record):
+        if record['outcome'] not in FINISHED_OUTCOMES:
+            return
+
+        line = json.dumps(record, default=json_encoder)
+
+        with self.lock:
+            self.completed[self._get_key(record)] = record['outcome']
+            self.file.write(line + '\n')
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
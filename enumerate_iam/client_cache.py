@@ -0,0 +1,118 @@
+"""
+Thread-safe, bounded LRU cache for boto3 clients
+
+Used by get_client() to share clients across the worker threads:
+
+    * Construction is single-flight: when several threads miss the same key at
+      the same time only one of them builds the client, the others wait for it.
+
+    * The cache holds at most max_size clients, the least recently used one is
+      evicted first. Long-running processes which scan many credential sets
+      don't keep every client (and its connection pool) alive forever.
+
+    * Keys are SHA-256 hashes, the secret key and session token are never
+      kept in plain text as dict keys.
+"""
+import hashlib
+import threading
+
+from collections import OrderedDict
+
+DEFAULT_MAX_SIZE = 1024
+
+
+def make_client_key(*parts):
+    key = '\x00'.join('' if part is None else str(part) for part in parts)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+class _PendingClient:
+    def __init__(self):
+        self.event = threading.Event()
+        self.client = None
+
+
+class ClientCache:
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.clients = OrderedDict()
+        self.pending = {}
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_create(self, key, factory):
+        """
+        Return the client for key, calling factory() to build it on a miss.
+
+        factory() may return None (e.g. the service is not available in the
+        region), in that case nothing is cached and all the callers which were
+        waiting for this key get None.
+        """
+        with self.lock:
+            client = self.clients.get(key, None)
+            if client is not None:
+                self.clients.move_to_end(key)
+                self.hits += 1
+                return client
+
+            pending = self.pending.get(key, None)
+            owner = pending is None
+
+            if owner:
+                pending = _PendingClient()
+                self.pending[key] = pending
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not owner:
+            pending.event.wait()
+            return pending.client
+
+        client = None
+
+        try:
+            client = factory()
+        finally:
+            with self.lock:
+                if client is not None:
+                    self.clients[key] = client
+                    self._evict()
+
+                pending.client = client
+                del self.pending[key]
+
+            pending.event.set()
+
+        return client
+
+    def resize(self, max_size):
+        with self.lock:
+            self.max_size = max_size
+            self._evict()
+
+    def _evict(self):
+        # Evicted clients are not closed: another thread might still be using
+        # them. Dropping the last reference releases the connection pool.
+        while len(self.clients) > self.max_size:
+            self.clients.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.clients.clear()
+
+    def stats(self):
+        with self.lock:
+            return {'size': len(self.clients),
+                    'max_size': self.max_size,
+                    'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions}
+
+    def __len__(self):
+        with self.lock:
+            return len(self.clients)
@@ -0,0 +1,179 @@
+"""
+Negative endpoint cache
+
+Many services have no endpoint in smaller regions. Without this cache every
+operation of such a service would open a socket and wait for the connect
+timeout and its retries, tying up a worker for tens of seconds each time.
+
+    * Before any request, botocore's endpoint data is checked: a service
+      which has no endpoint in the partition of the region is unavailable,
+      its operations are reported as endpoint-failed without a request.
+
+    * Services which are not in the endpoint data (or regions botocore does
+      not know about yet) are tested, and the first definitive endpoint
+      failure (EndpointConnectionError, ConnectTimeoutError) trips a per
+      (service, region) breaker which short-circuits the remaining
+      operations of that pair.
+"""
+import os
+import logging
+import threading
+
+import botocore.exceptions
+
+from enumerate_iam.catalog import get_catalog
+
+# Errors which show the endpoint itself does not exist or can't be reached,
+# a ReadTimeoutError means the endpoint exists but was slow
+ENDPOINT_ERRORS = (botocore.exceptions.EndpointConnectionError,
+                   botocore.exceptions.ConnectTimeoutError)
+
+_ENDPOINT_DATA = None
+_ENDPOINT_DATA_LOCK = threading.Lock()
+
+
+def load_endpoint_data(session):
+    """
+    :param session: The boto3 Session used by the scanner
+    :return: botocore's parsed endpoints.json, the Session's loader caches it
+    """
+    global _ENDPOINT_DATA
+
+    if _ENDPOINT_DATA is not None:
+        return _ENDPOINT_DATA
+
+    with _ENDPOINT_DATA_LOCK:
+        if _ENDPOINT_DATA is None:
+            try:
+                loader = session._session.get_component('data_loader')
+                _ENDPOINT_DATA = loader.load_data('endpoints')
+            except Exception as e:
+                logging.getLogger().debug(f'Could not load the endpoint data: {e}')
+                _ENDPOINT_DATA = {'partitions': []}
+
+    return _ENDPOINT_DATA
+
+
+def has_endpoint_override(session):
+    """
+    With AWS_ENDPOINT_URL[_<SERVICE>] or endpoint_url in the config file the
+    requests go to that endpoint, the endpoint data says nothing about it
+    """
+    try:
+        if session._session.get_config_variable('ignore_configured_endpoint_urls'):
+            return False
+
+        scoped_config = session._session.get_scoped_config()
+    except Exception:
+        scoped_config = {}
+
+    if 'endpoint_url' in scoped_config or 'services' in scoped_config:
+        return True
+
+    return any(name == 'AWS_ENDPOINT_URL' or name.startswith('AWS_ENDPOINT_URL_') for name in os.environ)
+
+
+def is_service_available(session, service_name, region):
+    """
+    :return: False if botocore's endpoint data shows service_name has no
+             endpoint for region, True if it has one or if the endpoint data
+             can't tell (unknown service or unknown region)
+    """
+    endpoint_prefix = get_catalog().get_endpoint_prefix(service_name)
+
+    for partition in load_endpoint_data(session)['partitions']:
+        if region not in partition.get('regions', {}):
+            continue
+
+        service_data = partition['services'].get(endpoint_prefix, None)
+        if service_data is None:
+            return True
+
+        if service_data.get('isRegionalized', True) is False or 'partitionEndpoint' in service_data:
+            return True
+
+        endpoints = service_data.get('endpoints', {})
+
+        # Services which only list a partition-wide endpoint (aws-global)
+        if not any(name in partition['regions'] for name in endpoints):
+            return True
+
+        return region in endpoints
+
+    return True
+
+
+class EndpointBreaker:
+    """
+    Remembers the (service, region) pairs without a usable endpoint, from the
+    endpoint data or from a definitive endpoint failure, and counts how many
+    operations were short-circuited because of them.
+    """
+    def __init__(self, session, use_endpoint_data=True):
+        self.session = session
+        self.use_endpoint_data = use_endpoint_data and not has_endpoint_override(session)
+
+        self.available = {}
+        self.tripped = set()
+        self.short_circuited = 0
+        self.lock = threading.Lock()
+
+    def is_available(self, service_name, region):
+        """
+        :return: False if service_name has no usable endpoint in region
+        """
+        key = (service_name, region)
+
+        with self.lock:
+            if key in self.tripped:
+                return False
+
+            available = self.available.get(key, None)
+
+        if available is None:
+            available = not self.use_endpoint_data or is_service_available(self.session, service_name, region)
+
+            with self.lock:
+                self.available[key] = available
+
+        return available
+
+    def is_open(self, service_name, region):
+        """
+        :return: True if operations of service_name in region must not be
+                 sent, they are counted as short-circuited
+        """
+        if self.is_available(service_name, region):
+            return False
+
+        with self.lock:
+            self.short_circuited += 1
+
+        return True
+
+    def trip(self, service_name, region, error):
+        key = (service_name, region)
+
+        with self.lock:
+            if key in self.tripped:
+                return
+
+            self.tripped.add(key)
+
+        logger = logging.getLogger()
+        logger.debug(f'No usable endpoint for {service_name} in {region} ({error}), '
+                     f'skipping its remaining operations')
+
+    def report(self):
+        logger = logging.getLogger()
+
+        with self.lock:
+            short_circuited = self.short_circuited
+            unavailable = set(self.tripped)
+            unavailable.update(key for key, available in self.available.items() if not available)
+
+        if not short_circuited:
+            return
+
+        logger.info(f'🔌 Skipped {short_circuited} operations of {len(unavailable)} services without an '
+                    f'endpoint in the scanned region(s)')
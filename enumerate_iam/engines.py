@@ -0,0 +1,11 @@
+"""
+Names of the bruteforce scan engines
+
+    * thread: MAX_THREADS worker threads, each one blocked on its API call
+    * async: aiobotocore, hundreds of requests in flight on one event loop
+      (async_engine.py, aiobotocore is an optional dependency)
+"""
+THREAD = 'thread'
+ASYNC = 'async'
+
+ENGINES = (THREAD, ASYNC)
@@ -1,11 +1,42 @@
-import re
+"""
+Regenerate the operation catalog from botocore's bundled service models
+
+    python -m enumerate_iam.generate_bruteforce_tests
+
+Every service model botocore has installed (the latest API version of each)
+is read, and its read-only operations are written to catalog.jsonl together
+with the facts the scanner filters on: the required parameters botocore
+does not fill in by itself, whether the operation is paginated, whether it
+accepts DryRun and whether it is answered by a global endpoint. Service and
+operation names are the boto3 client and method names.
+
+Read-only operations which accept DryRun but have required parameters also
+get placeholder values for those parameters (dry_run_params), the DryRun
+probe mode sends them to ask for the permission without touching any
+resource.
+
+Models are processed in a process pool, and the operations extracted from
+each model are cached by the SHA-256 of the model file: after a botocore
+upgrade only the services whose model changed are processed again.
+"""
 import os
+import sys
+import gzip
 import json
+import hashlib
+import argparse
 
-OUTPUT_FMT = 'BRUTEFORCE_TESTS = %s'
-OUTPUT_FILE = 'bruteforce_tests.py'
+from concurrent.futures import ProcessPoolExecutor
 
-API_DEFINITIONS = 'aws-sdk-js/apis/'
+import botocore.session
+
+from botocore import xform_name
+
+from enumerate_iam.catalog import CATALOG_FILE, is_callable, write_catalog
+from enumerate_iam.regions import GLOBAL_OPERATIONS, get_global_prefixes
+
+OUTPUT_FILE = CATALOG_FILE
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.catalog_cache.json')
 
 OPERATION_CONTAINS = {
     'list_',
@@ -18,6 +49,7 @@ BLACKLIST_OPERATIONS = {
     'get_bucket_notification',
     'get_bucket_notification_configuration',
     'list_web_ac_ls',
+    'list_web_acls',
     'get_hls_streaming_session_url',
     'describe_scaling_plans',
     'list_certificate_authorities',
@@ -38,18 +70,103 @@ BLACKLIST_OPERATIONS = {
     'list_platform_versions',
 }
 
+# Required members botocore fills in before the request is validated
+BOTOCORE_FILLED_MEMBERS = {
+    ('glacier', 'accountId'),
+}
+
+# Placeholder values of EC2 resource ID parameters, EC2 checks the format of
+# the IDs before answering a DryRun request
+EC2_ID_PREFIXES = {
+    'CapacityReservationId': 'cr',
+    'ClientVpnEndpointId': 'cvpn-endpoint',
+    'FleetId': 'fleet',
+    'FpgaImageId': 'afi',
+    'GroupId': 'sg',
+    'ImageId': 'ami',
+    'InstanceId': 'i',
+    'IpamId': 'ipam',
+    'IpamPoolId': 'ipam-pool',
+    'IpamScopeId': 'ipam-scope',
+    'NetworkInterfaceId': 'eni',
+    'PoolId': 'ipv6pool-ec2',
+    'PrefixListId': 'pl',
+    'SnapshotId': 'snap',
+    'SpotFleetRequestId': 'sfr',
+    'SubnetId': 'subnet',
+    'TransitGatewayAttachmentId': 'tgw-attach',
+    'TransitGatewayRouteTableId': 'tgw-rtb',
+    'VolumeId': 'vol',
+    'VpcId': 'vpc',
+    'VpnConnectionId': 'vpn',
+}
+
+PLACEHOLDER_STRING = 'enumerate-iam'
+PLACEHOLDER_TIMESTAMP = '2020-01-01T00:00:00Z'
+
+MODEL_FILENAMES = ('service-2.json.gz', 'service-2.json')
+PAGINATOR_FILENAMES = ('paginators-1.json.gz', 'paginators-1.json')
+
+# Bump when the cached results change format
+CACHE_FORMAT = 3
 
-def extract_service_name(filename, api_json):
-    try:
-        endpoint = api_json['metadata']['endpointPrefix']
-    except:
-        return None
 
-    endpoint = endpoint.replace('api.', '')
-    endpoint = endpoint.replace('opsworks-cm', 'opworks')
-    endpoint = endpoint.replace('acm-pca', 'acm')
+def get_rules_digest():
+    """
+    Cached results are only valid for the same extraction rules
+    """
+    rules = json.dumps([CACHE_FORMAT, sorted(OPERATION_CONTAINS), sorted(BLACKLIST_OPERATIONS),
+                        sorted(BOTOCORE_FILLED_MEMBERS), sorted(EC2_ID_PREFIXES.items())])
+    return hashlib.sha256(rules.encode('utf-8')).hexdigest()
 
-    return endpoint
+
+def find_file(loader, service_name, api_version, filenames):
+    # Same precedence as the loader, the first search path wins
+    for search_path in loader.search_paths:
+        for filename in filenames:
+            path = os.path.join(search_path, service_name, api_version, filename)
+
+            if os.path.isfile(path):
+                return path
+
+
+def find_model_files(loader):
+    """
+    :return: A dict with the (service-2 path, paginators-1 path or None) of
+             the latest API version of every service botocore can load
+    """
+    model_files = {}
+
+    for service_name in loader.list_available_services('service-2'):
+        api_version = loader.list_api_versions(service_name, 'service-2')[-1]
+
+        path = find_file(loader, service_name, api_version, MODEL_FILENAMES)
+        if path is None:
+            continue
+
+        model_files[service_name] = (path, find_file(loader, service_name, api_version, PAGINATOR_FILENAMES))
+
+    return model_files
+
+
+def hash_files(paths):
+    digest = hashlib.sha256()
+
+    for path in paths:
+        if path is None:
+            continue
+
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+
+    return digest.hexdigest()
+
+
+def load_model(path):
+    opener = gzip.open if path.endswith('.gz') else open
+
+    with opener(path, 'rb') as f:
+        return json.loads(f.read())
 
 
 def is_dangerous(operation_name):
@@ -60,13 +177,98 @@ def is_dangerous(operation_name):
     return True
 
 
-def extract_operations(api_json):
-    operations = []
+def is_read_only(operation_name):
+    """
+    Stricter than is_dangerous(), create_* or associate_* operations contain
+    "get_" (target_) but are not read-only
+    """
+    return operation_name.startswith(tuple(sorted(OPERATION_CONTAINS)))
+
+
+def get_placeholder(service_name, member_name, shape_name, shapes, depth=0):
+    """
+    :return: A value of shape_name which passes botocore's validation
+    """
+    shape = shapes.get(shape_name, {})
+    shape_type = shape.get('type', 'string')
+
+    if depth > 5:
+        return None
+
+    if shape_type == 'string':
+        if shape.get('enum'):
+            return shape['enum'][0]
+
+        if service_name == 'ec2' and member_name in EC2_ID_PREFIXES:
+            return '%s-%s' % (EC2_ID_PREFIXES[member_name], '0' * 17)
+
+        return PLACEHOLDER_STRING
+
+    if shape_type in ('integer', 'long'):
+        return max(int(shape.get('min', 1)), 1)
+
+    if shape_type in ('float', 'double'):
+        return float(max(shape.get('min', 1), 1))
+
+    if shape_type == 'boolean':
+        return False
+
+    if shape_type == 'timestamp':
+        return PLACEHOLDER_TIMESTAMP
+
+    if shape_type == 'list':
+        member = shape['member']
+        return [get_placeholder(service_name, member_name, member['shape'], shapes, depth + 1)]
+
+    if shape_type == 'structure':
+        return get_required_placeholders(service_name, shape, shapes, depth + 1)
+
+    if shape_type == 'map':
+        return {}
 
-    items = api_json['operations'].items()
+    return PLACEHOLDER_STRING
 
-    for operation_name, operation_data in items:
-        operation_name = to_underscore(operation_name)
+
+def get_required_placeholders(service_name, input_shape, shapes, depth=0):
+    members = input_shape.get('members', {})
+
+    return {member_name: get_placeholder(service_name, member_name, members[member_name]['shape'], shapes, depth)
+            for member_name in get_required_members(service_name, input_shape)}
+
+
+def get_required_members(service_name, input_shape):
+    """
+    :return: The sorted required members of input_shape which the caller has
+             to provide, idempotency tokens and the members botocore fills in
+             are not included
+    """
+    members = input_shape.get('members', {})
+    required = []
+
+    for member_name in input_shape.get('required', []):
+        if members.get(member_name, {}).get('idempotencyToken', False):
+            continue
+
+        if (service_name, member_name) in BOTOCORE_FILLED_MEMBERS:
+            continue
+
+        required.append(member_name)
+
+    return sorted(required)
+
+
+def extract_operations(service_name, api_json, paginators_json=None):
+    """
+    :return: A dict with the metadata of every read-only operation, keyed by
+             boto3 method name
+    """
+    operations = {}
+
+    shapes = api_json.get('shapes', {})
+    paginators = (paginators_json or {}).get('pagination', {})
+
+    for api_name, operation_data in api_json['operations'].items():
+        operation_name = xform_name(api_name)
 
         if is_dangerous(operation_name):
             continue
@@ -75,61 +277,150 @@ def extract_operations(api_json):
             continue
 
         inputs = operation_data.get('input', None)
+        input_shape = shapes.get(inputs['shape'], {}) if inputs is not None else {}
 
-        if inputs is None:
-            operations.append(operation_name)
-            continue
+        metadata = {}
 
-        inputs = str(inputs)
+        required = get_required_members(service_name, input_shape)
+        if required:
+            metadata['required'] = required
 
-        if "required" not in inputs:
-            operations.append(operation_name)
-            continue
+        if api_name in paginators:
+            metadata['paginated'] = True
+
+        if 'DryRun' in input_shape.get('members', {}):
+            metadata['dry_run'] = True
+
+            if required and is_read_only(operation_name):
+                metadata['dry_run_params'] = get_required_placeholders(service_name, input_shape, shapes)
+
+        operations[operation_name] = metadata
 
-    operations = list(set(operations))
-    operations.sort()
     return operations
 
 
-def to_underscore(name):
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+def process_model(args):
+    """
+    Process pool worker
+    """
+    service_name, path, paginators_path, digest = args
 
+    api_json = load_model(path)
+    paginators_json = load_model(paginators_path) if paginators_path else None
+    endpoint_prefix = api_json['metadata'].get('endpointPrefix', service_name)
 
-def main():
-    bruteforce_tests = dict()
+    return service_name, digest, {'digest': digest,
+                                  'endpoint_prefix': endpoint_prefix,
+                                  'operations': extract_operations(service_name, api_json, paginators_json)}
 
-    for filename in os.listdir(API_DEFINITIONS):
 
-        if not filename.endswith('.min.json'):
-            continue
+def load_cache(filename):
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-        api_json_data = open(os.path.join(API_DEFINITIONS, filename)).read()
+    if cache.get('rules') != get_rules_digest():
+        return {}
 
-        api_json = json.loads(api_json_data)
+    return cache.get('services', {})
 
-        service_name = extract_service_name(filename, api_json)
 
-        if service_name is None:
-            print('%s does not define a service name' % filename)
-            continue
+def save_cache(filename, services):
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump({'rules': get_rules_digest(), 'services': services}, f, sort_keys=True)
+
+
+def generate(output_file=OUTPUT_FILE, cache_file=CACHE_FILE, workers=None):
+    """
+    :return: A (services, metadata, reprocessed) tuple, services maps each
+             service name to its operations, metadata holds the facts of
+             each operation and reprocessed is the number of models which
+             were not in the cache
+    """
+    loader = botocore.session.get_session().get_component('data_loader')
+    model_files = find_model_files(loader)
+
+    cache = load_cache(cache_file) if cache_file else {}
+
+    digests = {}
+    for service_name, paths in model_files.items():
+        digests[service_name] = hash_files(paths)
+
+    cached = {service_name: cache[service_name] for service_name, digest in digests.items()
+              if cache.get(service_name, {}).get('digest') == digest}
+
+    changed = [(service_name,) + model_files[service_name] + (digest,) for service_name, digest in digests.items()
+               if service_name not in cached]
+
+    results = dict(cached)
+
+    if changed:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for service_name, digest, result in executor.map(process_model, changed, chunksize=8):
+                results[service_name] = result
+
+    if cache_file:
+        save_cache(cache_file, results)
+
+    # The endpoint data is not part of the cached results, a service can
+    # become regional without its model changing
+    global_prefixes = get_global_prefixes(loader.load_data('endpoints'))
 
-        operations = extract_operations(api_json)
+    services = {}
+    metadata = {}
+    endpoint_prefixes = {}
 
-        if not operations:
+    for service_name, result in results.items():
+        # Nothing to scan in services which only have operations with
+        # required parameters
+        if not any(is_callable(operation_metadata) for operation_metadata in result['operations'].values()):
             continue
 
-        if service_name in bruteforce_tests:
-            bruteforce_tests[service_name].extend(operations)
-        else:
-            bruteforce_tests[service_name] = operations
+        endpoint_prefix = result['endpoint_prefix']
+        is_global = endpoint_prefix in global_prefixes
+
+        service_metadata = {}
+
+        for operation_name, operation_metadata in result['operations'].items():
+            if is_global or (service_name, operation_name) in GLOBAL_OPERATIONS:
+                operation_metadata = dict(operation_metadata, **{'global': True})
+
+            service_metadata[operation_name] = operation_metadata
+
+        services[service_name] = list(service_metadata)
+        metadata[service_name] = service_metadata
+        endpoint_prefixes[service_name] = endpoint_prefix
+
+    write_catalog(services, output_file, metadata=metadata, endpoint_prefixes=endpoint_prefixes)
+
+    return services, metadata, len(changed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Regenerate the operation catalog from botocore\'s service models')
+    parser.add_argument('--output', default=OUTPUT_FILE, help='Catalog file to write (default: %(default)s)')
+    parser.add_argument('--cache', default=CACHE_FILE, help='Cache of the extracted operations (default: %(default)s)')
+    parser.add_argument('--no-cache', action='store_true', help='Process every model again')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes (default: CPU count)')
+
+    args = parser.parse_args()
 
-    output = OUTPUT_FMT % json.dumps(bruteforce_tests,
-                                     indent=4,
-                                     sort_keys=True)
+    services, metadata, reprocessed = generate(output_file=args.output,
+                                     cache_file=None if args.no_cache else args.cache,
+                                     workers=args.workers)
 
-    open(OUTPUT_FILE, 'w').write(output)
+    print('Wrote %d operations (%d callable without parameters) across %d services to %s '
+          '(%d models processed, botocore %s)' % (
+        sum(len(operations) for operations in services.values()),
+        sum(is_callable(operation_metadata) for service_metadata in metadata.values()
+            for operation_metadata in service_metadata.values()),
+        len(services),
+        args.output,
+        reprocessed,
+        botocore.__version__))
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
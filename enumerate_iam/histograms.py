@@ -0,0 +1,262 @@
+"""
+Latency histograms of the scan hot path, per service and region
+
+    * queue_wait: from the moment an operation is handed to the engine until
+      a worker (thread, or task of the async engine) picks it up
+    * rate_limit_wait: time spent in the adaptive controller and the rate
+      limiter before the request is sent
+    * client_construction: creating the boto3 client of a service and region
+    * request: one call to AWS, DNS, TLS and botocore retries included
+    * retries: the number of throttling retries of each operation
+
+Like ScanMetrics every thread records into its own shard (ThreadShards), the
+shards are merged when the histograms are exported. MetricsExporter writes them, with
+the operation counts of ScanMetrics, as a JSON report and as a Prometheus
+textfile (for node_exporter's textfile collector) while the scan runs and
+once more when it ends.
+"""
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+
+from enumerate_iam.metrics import ATTEMPTED, THROTTLE_RETRIES, ThreadShards
+from enumerate_iam.outcomes import OUTCOMES
+
+QUEUE_WAIT = 'queue_wait'
+RATE_LIMIT_WAIT = 'rate_limit_wait'
+CLIENT_CONSTRUCTION = 'client_construction'
+REQUEST = 'request'
+RETRIES = 'retries'
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RETRY_BUCKETS = (0, 1, 2, 3, 4, 5)
+
+HISTOGRAM_TYPES = {
+    QUEUE_WAIT: ('seconds', SECONDS_BUCKETS, 'Time operations waited for a worker'),
+    RATE_LIMIT_WAIT: ('seconds', SECONDS_BUCKETS, 'Time spent waiting on the rate limiter and the adaptive controller'),
+    CLIENT_CONSTRUCTION: ('seconds', SECONDS_BUCKETS, 'Time spent creating boto3 clients'),
+    REQUEST: ('seconds', SECONDS_BUCKETS, 'Duration of the requests sent to AWS'),
+    RETRIES: ('count', RETRY_BUCKETS, 'Throttling retries per operation'),
+}
+
+PROMETHEUS_PREFIX = 'enumerate_iam'
+DEFAULT_EXPORT_INTERVAL = 30
+
+
+def add_histograms(total, shard):
+    for key, data in shard.items():
+        # The owner thread replaces nothing, it only updates the lists in
+        # place, list() copies one while holding the GIL
+        counts = total.get(key, None)
+
+        if counts is None:
+            total[key] = list(data)
+        else:
+            total[key] = [a + b for a, b in zip(counts, data)]
+
+
+class Histograms:
+    def __init__(self):
+        self.shards = ThreadShards(add_histograms)
+
+    def observe(self, name, service_name, region, value):
+        """
+        Record value in the name histogram of service_name in region
+        """
+        buckets = HISTOGRAM_TYPES[name][1]
+        shard = self.shards.get()
+
+        key = (name, service_name, region)
+        data = shard.get(key, None)
+
+        if data is None:
+            # One count per bucket, the +Inf bucket, the sum
+            data = shard[key] = [0] * (len(buckets) + 1) + [0.0]
+
+        data[bisect.bisect_left(buckets, value)] += 1
+        data[-1] += value
+
+    def merge(self):
+        """
+        :return: A {(name, service, region): [bucket counts..., sum]} dict,
+                 the bucket counts are not cumulative
+        """
+        return self.shards.merge()
+
+    def reset(self):
+        self.shards.clear()
+
+
+def get_quantile(buckets, counts, quantile):
+    """
+    :return: The upper bound of the bucket holding the quantile, None for
+             the +Inf bucket
+    """
+    total = sum(counts)
+    if not total:
+        return
+
+    rank = quantile * total
+    cumulative = 0
+
+    for bound, count in zip(buckets, counts):
+        cumulative += count
+        if cumulative >= rank:
+            return bound
+
+
+def render_json(histograms, metrics):
+    """
+    :return: The JSON report dict, histograms with summary statistics for
+             each service and region and the operation counts
+    """
+    report = {'generated_at': time.time(),
+              'operations': {'total': metrics.total, 'counts': metrics.get_counts()},
+              'services': metrics.get_service_counts(),
+              'histograms': {}}
+
+    for (name, service_name, region), data in sorted(histograms.merge().items()):
+        unit, buckets, _ = HISTOGRAM_TYPES[name]
+        counts, total = data[:-1], data[-1]
+        count = sum(counts)
+
+        report['histograms'].setdefault(name, []).append({
+            'service': service_name,
+            'region': region,
+            'unit': unit,
+            'count': count,
+            'sum': total,
+            'mean': total / count if count else None,
+            'p50': get_quantile(buckets, counts, 0.5),
+            'p90': get_quantile(buckets, counts, 0.9),
+            'p99': get_quantile(buckets, counts, 0.99),
+            'buckets': dict(zip([str(bound) for bound in buckets] + ['+Inf'], counts)),
+        })
+
+    return report
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus(histograms, metrics):
+    """
+    :return: The histograms and the operation counts in the Prometheus text
+             exposition format
+    """
+    lines = []
+    merged = histograms.merge()
+
+    for name, (unit, buckets, description) in HISTOGRAM_TYPES.items():
+        if unit == 'seconds':
+            metric = '%s_%s_seconds' % (PROMETHEUS_PREFIX, name)
+        else:
+            metric = '%s_%s' % (PROMETHEUS_PREFIX, name)
+
+        lines.append('# HELP %s %s' % (metric, description))
+        lines.append('# TYPE %s histogram' % metric)
+
+        for (histogram_name, service_name, region), data in sorted(merged.items()):
+            if histogram_name != name:
+                continue
+
+            labels = 'service="%s",region="%s"' % (escape_label(service_name), escape_label(region))
+            cumulative = 0
+
+            for bound, count in zip([str(bound) for bound in buckets] + ['+Inf'], data[:-1]):
+                cumulative += count
+                lines.append('%s_bucket{%s,le="%s"} %d' % (metric, labels, bound, cumulative))
+
+            lines.append('%s_sum{%s} %r' % (metric, labels, float(data[-1])))
+            lines.append('%s_count{%s} %d' % (metric, labels, cumulative))
+
+    service_counts = sorted(metrics.get_service_counts().items())
+
+    metric = '%s_operations_total' % PROMETHEUS_PREFIX
+    lines.append('# HELP %s Tested operations by service and outcome' % metric)
+    lines.append('# TYPE %s counter' % metric)
+
+    for service_name, counts in service_counts:
+        for outcome in OUTCOMES:
+            if outcome in counts:
+                lines.append('%s{service="%s",outcome="%s"} %d' % (metric, escape_label(service_name),
+                                                                   outcome, counts[outcome]))
+
+    for name, description in ((ATTEMPTED, 'Operations sent to a worker'),
+                              (THROTTLE_RETRIES, 'Operations retried after a throttling error')):
+        metric = '%s_%s_total' % (PROMETHEUS_PREFIX, name.replace('-', '_'))
+        lines.append('# HELP %s %s' % (metric, description))
+        lines.append('# TYPE %s counter' % metric)
+
+        for service_name, counts in service_counts:
+            if name in counts:
+                lines.append('%s{service="%s"} %d' % (metric, escape_label(service_name), counts[name]))
+
+    metric = '%s_operations_expected' % PROMETHEUS_PREFIX
+    lines.append('# HELP %s Operations the scan is expected to test' % metric)
+    lines.append('# TYPE %s gauge' % metric)
+    lines.append('%s %d' % (metric, metrics.total))
+
+    return '\n'.join(lines) + '\n'
+
+
+def write_atomic(filename, content):
+    # The textfile collector must never read a partially written file
+    temp_filename = filename + '.tmp'
+
+    with open(temp_filename, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+    os.replace(temp_filename, filename)
+
+
+class MetricsExporter:
+    """
+    Write the JSON report and / or the Prometheus textfile every interval
+    seconds from a daemon thread, and once more on stop()
+    """
+    def __init__(self, histograms, metrics, json_file=None, prometheus_file=None,
+                 interval=DEFAULT_EXPORT_INTERVAL):
+        self.histograms = histograms
+        self.metrics = metrics
+        self.json_file = json_file
+        self.prometheus_file = prometheus_file
+        self.interval = interval
+
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def export(self):
+        try:
+            if self.json_file:
+                write_atomic(self.json_file, json.dumps(render_json(self.histograms, self.metrics), indent=2))
+
+            if self.prometheus_file:
+                write_atomic(self.prometheus_file, render_prometheus(self.histograms, self.metrics))
+        except OSError as e:
+            logging.getLogger().warning(f'⚠️  Could not export the scan metrics: {e}')
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            # Nothing to export before the first operation
+            if self.metrics.get(ATTEMPTED):
+                self.export()
+
+    def start(self):
+        if self.interval and self.interval > 0:
+            self.thread = threading.Thread(target=self.run, name='metrics-exporter', daemon=True)
+            self.thread.start()
+
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+        if self.thread is not None:
+            self.thread.join()
+
+        self.export()
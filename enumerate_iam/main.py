@@ -19,49 +19,67 @@ Improvements:
 import re
 import json
 import logging
-import boto3
-import botocore
+import botocore.exceptions
 import random
 import time
 import threading
-
-from botocore.client import Config
-from botocore.endpoint import MAX_POOL_CONNECTIONS
-from multiprocessing.dummy import Pool as ThreadPool
+import functools
 
 from enumerate_iam.utils.remove_metadata import remove_metadata
 from enumerate_iam.utils.json_utils import json_encoder
-from enumerate_iam.bruteforce_tests import BRUTEFORCE_TESTS
+from enumerate_iam.utils.timing import Timings
+from enumerate_iam.client_cache import ClientCache, make_client_key
+from enumerate_iam.rate_limiter import build_rate_limiter
+from enumerate_iam.outcomes import (ALLOWED,
+                                    ENDPOINT_FAILED,
+                                    EXPIRED,
+                                    INVALID,
+                                    OUTCOMES,
+                                    SKIPPED,
+                                    THROTTLED,
+                                    classify_error,
+                                    get_operation_errors,
+                                    is_dry_run_allowed,
+                                    make_record)
+from enumerate_iam.scheduler import DeadlineScheduler, get_deadline, prioritize
+from enumerate_iam.endpoints import ENDPOINT_ERRORS, EndpointBreaker
+from enumerate_iam.prefetch import DNSCache, prefetch_endpoints
+from enumerate_iam.regions import ALL_REGIONS, GLOBAL_REGION, is_global_operation, resolve_regions
+from enumerate_iam.adaptive import (AdaptiveController,
+                                    MAX_THROTTLE_RETRIES,
+                                    get_retry_delay,
+                                    is_throttling_error)
+from enumerate_iam.catalog import get_catalog
+from enumerate_iam.engines import ENGINES
+from enumerate_iam.result_detail import FULL, get_result, summarize_response
+from enumerate_iam.metrics import ATTEMPTED, THROTTLE_RETRIES, ScanMetrics
+from enumerate_iam.cassette import register_cassette
+from enumerate_iam.profiling import profile_phase
+from enumerate_iam.histograms import (CLIENT_CONSTRUCTION,
+                                      HISTOGRAM_TYPES,
+                                      QUEUE_WAIT,
+                                      RATE_LIMIT_WAIT,
+                                      REQUEST,
+                                      RETRIES,
+                                      Histograms,
+                                      get_quantile)
 
 MAX_THREADS = 25
-CLIENT_POOL = {}
+MAX_IN_FLIGHT = 250
+CLIENT_CACHE = ClientCache()
+SESSION = None
+SESSION_LOCK = threading.Lock()
 RATE_LIMITER = None
-OPERATION_COUNTER = {'count': 0, 'found': 0}
-
-
-class RateLimiter:
-    def __init__(self, rate):
-        # rate: tokens per second (requests/second)
-        self.rate = float(rate)
-        self.capacity = max(self.rate, 1.0)
-        self.tokens = self.capacity
-        self.last = time.monotonic()
-        self.lock = threading.Lock()
-
-    def acquire(self):
-        if self.rate <= 0:
-            return
-        while True:
-            with self.lock:
-                now = time.monotonic()
-                elapsed = now - self.last
-                self.last = now
-                self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
-                if self.tokens >= 1.0:
-                    self.tokens -= 1.0
-                    return
-                wait = (1.0 - self.tokens) / self.rate
-            time.sleep(wait)
+CONTROLLER = None
+ENDPOINT_BREAKER = None
+DRY_RUN = False
+RESULT_DETAIL = FULL
+ENDPOINT_URL = None
+DNS_CACHE = DNSCache()
+METRICS = ScanMetrics()
+HISTOGRAMS = Histograms()
+PROGRESS_INTERVAL = 100
+TIMINGS = Timings()
 
 
 def report_arn(candidate):
@@ -87,150 +105,645 @@ def report_arn(candidate):
     return None, None, None
 
 
-def enumerate_using_bruteforce(access_key, secret_key, session_token, region):
+def enumerate_using_bruteforce(access_key, secret_key, session_token, region, engine='thread', sink=None,
+                               checkpoint=None, regions=None, identity_cache=None, scheduler=None):
     """
     Attempt to brute-force common describe calls.
+
+    Results are collected as each operation completes, and written to sink
+    (a ResultSink) when one is provided, so partial scans are not lost.
+    Every outcome is recorded in checkpoint, operations which a previous
+    run already finished are skipped. identity_cache (an IdentityCache)
+    works the same way across runs: its fresh outcomes are reused instead
+    of testing the operations again. With a scheduler (a DeadlineScheduler)
+    the operations are sorted by expected value, and the ones which can't be
+    sent before its deadline are skipped.
+
+    When regions is a list the same sweep covers all of them, sharing the
+    clients and rate limits, and the output is keyed by region. Operations
+    of global services are only tested once and reported under "global".
+
+    With the full result detail and a sink the responses are only written to
+    the sink, the output keeps their summary.
     """
     output = dict()
 
     logger = logging.getLogger()
     logger.info('Attempting common-service describe / list brute force.')
-    logger.info('Testing 1,999 operations across 311 AWS services...')
+
+    catalog = get_catalog()
+    scan_regions = regions or [region]
+
+    args_generator = generate_args(access_key, secret_key, session_token, scan_regions,
+                                   checkpoint=checkpoint,
+                                   identity_cache=identity_cache,
+                                   scheduler=scheduler)
+
+    if scheduler is not None:
+        # Sort by expected value, the whole list is needed to know how much
+        # work is left before the deadline
+        args_generator = list(args_generator)
+        total = len(args_generator)
+    else:
+        # Every region, global operations once and without the operations
+        # the checkpoint and the result cache already finished
+        total = sum(1 for _ in generate_args(access_key, secret_key, session_token, scan_regions,
+                                             checkpoint=checkpoint,
+                                             identity_cache=identity_cache))
+
+    if regions is None:
+        logger.info(f'Testing {total:,} operations across {len(catalog)} AWS services...')
+    else:
+        logger.info(f'Testing {total:,} operations across {len(catalog)} AWS services '
+                    f'in {len(regions)} regions...')
+
+    if DRY_RUN:
+        logger.info('DryRun probe mode: operations which accept DryRun are called with DryRun=True')
+
+    if scheduler is not None:
+        scheduler.set_total(total)
+        scheduler.report_estimate()
+
+    # The metrics of this credential set, METRICS covers every credential set
+    # of a batch scan
+    scan_metrics = ScanMetrics()
+    scan_metrics.add_total(total)
+    METRICS.add_total(total)
+
+    progress = {'tested': 0}
+
+    def on_result(record):
+        scan_metrics.record(record)
+        METRICS.record(record)
+
+        if record['outcome'] != SKIPPED:
+            # count_operation() counted it in METRICS when it was sent
+            scan_metrics.increment(ATTEMPTED, record['service'])
+
+            progress['tested'] += 1
+            report_progress(progress['tested'], total, scan_metrics, scheduler)
+
+            if scheduler is not None:
+                scheduler.record_completed()
+
+        if checkpoint is not None:
+            checkpoint.record(record)
+
+        if identity_cache is not None:
+            identity_cache.record(record)
+
+        if record['outcome'] != ALLOWED:
+            return
+
+        add_result(record)
+
+        if sink is not None:
+            sink.write(record)
+
+    def add_result(record):
+        result = record['result']
+
+        if sink is not None and RESULT_DETAIL == FULL:
+            result = record.get('summary', None) or summarize_response(result)
+
+        if regions is None:
+            output[record['key']] = result
+            return
+
+        if is_global_operation(record['service'], record['operation']):
+            output_region = GLOBAL_REGION
+        else:
+            output_region = record['region']
+
+        output.setdefault(output_region, dict())[record['key']] = result
+
+    if checkpoint is not None:
+        resumed = [record for record in checkpoint.get_allowed()
+                   if record['region'] in (regions or [region])]
+
+        for record in resumed:
+            add_result(record)
+
+            if sink is not None:
+                sink.write(record)
+
+        logger.info(f'Resuming from checkpoint: {len(resumed)} allowed permissions already found')
+
+    if identity_cache is not None and len(identity_cache):
+        cached = [record for record in identity_cache.get_allowed()
+                  if record['region'] in scan_regions]
+
+        for record in cached:
+            add_result(record)
+
+            if sink is not None:
+                sink.write(record)
+
+        logger.info(f'♻️  Reused {len(identity_cache)} cached outcomes of {identity_cache.arn}, '
+                    f'{len(cached)} allowed permissions')
+
+    try:
+        if engine == 'async':
+            enumerate_using_async_engine(args_generator, on_result, scheduler)
+        else:
+            enumerate_using_thread_pool(args_generator, on_result, scheduler)
+    finally:
+        if identity_cache is not None:
+            identity_cache.flush()
+
+    counts = scan_metrics.get_counts()
+    tested = sum(counts.get(outcome, 0) for outcome in OUTCOMES if outcome != SKIPPED)
+
+    logger.info(f'✅ Completed: tested {tested}/{total:,} operations for {access_key}, '
+                f'found {counts.get(ALLOWED, 0)} allowed permissions')
+
+    if counts.get(THROTTLED, 0):
+        logger.warning(f'⚠️  {counts[THROTTLED]} operations were still throttled after '
+                       f'{MAX_THROTTLE_RETRIES} retries, their permissions are unknown')
+
+    if scheduler is not None:
+        scheduler.report_skipped()
+
+    return output
+
+
+def report_summary():
+    """
+    Log what the whole scan (every credential set of a batch) skipped and
+    how long it took
+    """
+    if ENDPOINT_BREAKER is not None:
+        ENDPOINT_BREAKER.report()
+
+    METRICS.report(OUTCOMES)
+    report_timings()
+
+
+def report_timings():
+    """
+    Log how long the scan took, and how long creating one client took.
+
+    The workers create their clients at the same time, the sum of their
+    construction times says nothing about the scan time. The median and the
+    99th percentile of the client_construction histogram are logged
+    instead. The scan time covers every credential set of a batch scan.
+    """
+    logger = logging.getLogger()
+
+    scan_time, _ = TIMINGS.get('scan')
+    prefetch_time, _ = TIMINGS.get('prefetch')
+
+    if not scan_time:
+        return
+
+    if prefetch_time:
+        logger.info('⏱  Pre-flight endpoint resolution took %.2fs before the scan', prefetch_time)
+
+    logger.info('⏱  Scan took %.2fs', scan_time)
+
+    buckets = HISTOGRAM_TYPES[CLIENT_CONSTRUCTION][1]
+    counts = [0] * (len(buckets) + 1)
+
+    for (name, _, _), data in HISTOGRAMS.merge().items():
+        if name == CLIENT_CONSTRUCTION:
+            counts = [a + b for a, b in zip(counts, data[:-1])]
+
+    if sum(counts):
+        logger.info('⏱  Created %d clients, p50 %s and p99 %s per client',
+                    sum(counts),
+                    format_bucket_bound(get_quantile(buckets, counts, 0.5), buckets),
+                    format_bucket_bound(get_quantile(buckets, counts, 0.99), buckets))
+
+    # The async engine keeps its clients in its own pool
+    stats = CLIENT_CACHE.stats()
+    if not stats['hits'] and not stats['misses']:
+        return
+
+    logger.info('Client cache: %d/%d clients, %d hits, %d misses, %d evictions',
+                stats['size'],
+                stats['max_size'],
+                stats['hits'],
+                stats['misses'],
+                stats['evictions'])
+
+
+def format_bucket_bound(bound, buckets):
+    """
+    :return: A get_quantile() result as text, None is the +Inf bucket
+    """
+    if bound is None:
+        return '>%gs' % buckets[-1]
+
+    return '≤%gs' % bound
+
+
+def enumerate_using_thread_pool(args_generator, on_result, scheduler=None):
+    """
+    Run check_one_permission() for every operation using MAX_THREADS threads,
+    calling on_result() with each result in completion order. The operations
+    are skipped once the deadline of scheduler is near.
+    """
+    logger = logging.getLogger()
+
+    from multiprocessing.dummy import Pool as ThreadPool
 
     pool = ThreadPool(MAX_THREADS)
-    args_generator = generate_args(access_key, secret_key, session_token, region)
+
+    # imap_unordered() queues the arguments as soon as they are generated,
+    # the timestamp measures how long each one waits for a thread
+    queued_args = ((time.perf_counter(), arg_tuple) for arg_tuple in args_generator)
 
     try:
-        results = pool.map(check_one_permission, args_generator)
+        for thread_result in pool.imap_unordered(functools.partial(check_queued_permission, scheduler=scheduler),
+                                                    queued_args):
+            on_result(thread_result)
     except KeyboardInterrupt:
         print('')
 
-        results = []
-
         logger.info('Ctrl+C received, stopping all threads.')
         logger.info('Hit Ctrl+C again to force exit.')
 
         try:
-            pool.close()
+            pool.terminate()
             pool.join()
         except KeyboardInterrupt:
             print('')
-            return output
 
-    for thread_result in results:
-        if thread_result is None:
-            continue
-
-        key, action_result = thread_result
-        output[key] = action_result
+        return
 
     pool.close()
     pool.join()
-    
-    logger.info(f'✅ Completed: tested {OPERATION_COUNTER["count"]}/1,999 operations, found {OPERATION_COUNTER["found"]} allowed permissions')
 
-    return output
 
+def enumerate_using_async_engine(args_generator, on_result, scheduler=None):
+    """
+    Run the same operations as enumerate_using_thread_pool() on the asyncio
+    engine, keeping up to MAX_IN_FLIGHT requests in flight.
+    """
+    logger = logging.getLogger()
+
+    try:
+        from enumerate_iam.async_engine import run_bruteforce
+    except ImportError as e:
+        logger.error(f'❌ The async engine requires aiobotocore ({e}), run: pip install aiobotocore')
+        logger.info('Falling back to the thread engine.')
+        return enumerate_using_thread_pool(args_generator, on_result, scheduler)
+
+    run_bruteforce(args_generator, on_result, RATE_LIMITER, CONTROLLER,
+                   max_in_flight=MAX_IN_FLIGHT,
+                   scheduler=scheduler)
+
+
+def generate_args(access_key, secret_key, session_token, regions, checkpoint=None, identity_cache=None,
+                  scheduler=None):
+    """
+    Yield one argument tuple per operation and region. Operations of global
+    services are only yielded once, for the first region.
+    """
+    for service_name, action in generate_operations(scheduler):
+        if len(regions) > 1 and is_global_operation(service_name, action):
+            action_regions = regions[:1]
+        else:
+            action_regions = regions
+
+        for region in action_regions:
+            if checkpoint is not None and checkpoint.is_finished(service_name, action, region):
+                continue
+
+            if identity_cache is not None and identity_cache.is_finished(service_name, action, region):
+                continue
 
-def generate_args(access_key, secret_key, session_token, region):
+            yield access_key, secret_key, session_token, region, service_name, action
+
+
+def generate_operations(scheduler=None):
+    """
+    Yield (service_name, operation_name) tuples in random order, or by
+    expected value when there is a scheduler with a deadline to meet.
+    """
+    catalog = get_catalog()
+
+    if scheduler is not None:
+        yield from prioritize(catalog, dry_run=DRY_RUN)
+        return
 
-    service_names = list(BRUTEFORCE_TESTS.keys())
+    service_names = list(catalog.keys())
 
     random.shuffle(service_names)
 
     for service_name in service_names:
-        actions = list(BRUTEFORCE_TESTS[service_name])
+        actions = list(catalog.get_operations(service_name, dry_run=DRY_RUN))
         random.shuffle(actions)
 
         for action in actions:
-            yield access_key, secret_key, session_token, region, service_name, action
+            yield service_name, action
+
+
+def get_session():
+    """
+    Return the boto3 Session shared by every client created by the scanner.
+
+    The scanner owns this Session instead of using boto3's default one, so
+    it can register the cassette handlers on it without touching other
+    users of boto3 in the process. Credentials are passed per client, so
+    the same Session is shared by all credential sets.
+    """
+    global SESSION
+
+    if SESSION is not None:
+        return SESSION
+
+    with SESSION_LOCK:
+        if SESSION is None:
+            import boto3
+
+            SESSION = boto3.session.Session()
+            register_cassette(SESSION.events)
+
+    return SESSION
 
 
 def get_client(access_key, secret_key, session_token, service_name, region):
-    key = '%s-%s-%s-%s-%s' % (access_key, secret_key, session_token, service_name, region)
+    key = make_client_key(access_key, secret_key, session_token, service_name, region)
+
+    return CLIENT_CACHE.get_or_create(key, lambda: create_client(access_key,
+                                                                 secret_key,
+                                                                 session_token,
+                                                                 service_name,
+                                                                 region))
 
-    client = CLIENT_POOL.get(key, None)
-    if client is not None:
-        return client
 
+def create_client(access_key, secret_key, session_token, service_name, region):
     logger = logging.getLogger()
     logger.debug('Getting client for %s in region %s' % (service_name, region))
 
+    from botocore.client import Config
+    from botocore.endpoint import MAX_POOL_CONNECTIONS
+
+    # botocore does not retry, check_one_permission() retries the throttled
+    # calls itself (up to MAX_THROTTLE_RETRIES times, the worker thread
+    # sleeps during the backoff) so they are counted and slow down the
+    # adaptive controller
     config = Config(connect_timeout=5,
                     read_timeout=5,
-                    retries={'max_attempts': 3, 'mode': 'standard'},
-                    max_pool_connections=MAX_POOL_CONNECTIONS * 2)
+                    retries={'total_max_attempts': 1, 'mode': 'standard'},
+                    max_pool_connections=MAX_POOL_CONNECTIONS * 2,
+                    inject_host_prefix=ENDPOINT_URL is None)
+
+    start = time.perf_counter()
 
     try:
-        client = boto3.client(
+        return get_session().client(
             service_name,
             aws_access_key_id=access_key,
             aws_secret_access_key=secret_key,
             aws_session_token=session_token,
             region_name=region,
+            endpoint_url=ENDPOINT_URL,
             verify=False,
             config=config,
         )
     except:
         # The service might not be available in this region
         return
+    finally:
+        HISTOGRAMS.observe(CLIENT_CONSTRUCTION, service_name, region, time.perf_counter() - start)
 
-    CLIENT_POOL[key] = client
 
-    return client
+def count_operation(service_name):
+    METRICS.increment(ATTEMPTED, service_name)
 
 
-def check_one_permission(arg_tuple):
-    global OPERATION_COUNTER
-    access_key, secret_key, session_token, region, service_name, operation_name = arg_tuple
+def report_progress(tested, total, scan_metrics, scheduler=None):
+    if tested % PROGRESS_INTERVAL != 0:
+        return
+
     logger = logging.getLogger()
-    
-    # Progress tracking
-    OPERATION_COUNTER['count'] += 1
-    if OPERATION_COUNTER['count'] % 100 == 0:
-        logger.info(f'Progress: tested {OPERATION_COUNTER["count"]}/1,999 operations, found {OPERATION_COUNTER["found"]} allowed')
+    logger.info(f'Progress: tested {tested}/{total:,} operations, found {scan_metrics.get(ALLOWED)} allowed')
 
-    service_client = get_client(access_key, secret_key, session_token, service_name, region)
-    if service_client is None:
+    if scheduler is not None and tested % (PROGRESS_INTERVAL * 5) == 0:
+        scheduler.report_estimate()
+
+
+def check_deadline(service_name, operation_name, region, scheduler):
+    """
+    :return: A skipped record if the deadline of scheduler does not leave
+             time to send this operation, None otherwise
+    """
+    if scheduler is None or not scheduler.is_expired():
         return
 
+    scheduler.record_skipped(service_name, operation_name)
+    return make_record(service_name, operation_name, region, SKIPPED)
+
+
+def check_endpoint(service_name, operation_name, region):
+    """
+    :return: An endpoint-failed record if the service has no usable endpoint
+             in this region, None otherwise
+    """
+    if ENDPOINT_BREAKER is None or not ENDPOINT_BREAKER.is_open(service_name, region):
+        return
+
+    return make_record(service_name, operation_name, region, ENDPOINT_FAILED)
+
+
+def get_endpoint_url():
+    """
+    :return: The URL every client sends its requests to, None for the AWS
+             endpoints. Clients for an endpoint URL must not inject the host
+             prefix of operations (e.g. omics, iotsitewise) into its host
+    """
+    return ENDPOINT_URL
+
+
+def get_operation_params(service_name, operation_name):
+    """
+    :return: The keyword arguments to call the operation with, DryRun=True and
+             the placeholder parameters from the catalog in DryRun probe mode
+    """
+    if not DRY_RUN:
+        return {}
+
+    metadata = get_catalog().get_metadata(service_name, operation_name)
+    if not metadata.get('dry_run', False):
+        return {}
+
+    params = dict(metadata.get('dry_run_params', {}))
+    params['DryRun'] = True
+    return params
+
+
+def get_action_function(service_client, service_name, operation_name):
     try:
-        action_function = getattr(service_client, operation_name)
+        return getattr(service_client, operation_name)
     except AttributeError:
         # The service might not have this action (this is most likely
-        # an error with generate_bruteforce_tests.py)
+        # an error in the catalog generated by generate_bruteforce_tests.py)
+        logger = logging.getLogger()
         logger.debug('Remove %s.%s action' % (service_name, operation_name))
         return
 
-    logger.debug('Testing %s.%s() in region %s' % (service_name, operation_name, region))
 
-    if RATE_LIMITER:
-        RATE_LIMITER.acquire()
+def handle_operation_error(error, service_name, operation_name, region):
+    """
+    The operation is not allowed (or can't be called), log why if it is
+    interesting and return the outcome record.
+    """
+    logger = logging.getLogger()
 
-    try:
-        action_response = action_function()
-    except (botocore.exceptions.ClientError,
-            botocore.exceptions.EndpointConnectionError,
-            botocore.exceptions.ConnectTimeoutError,
-            botocore.exceptions.ReadTimeoutError):
-        return
-    except botocore.exceptions.ParamValidationError:
+    outcome = classify_error(error)
+
+    if isinstance(error, botocore.exceptions.ParamValidationError):
         logger.debug('Remove %s.%s action' % (service_name, operation_name))
-        return
-    except botocore.exceptions.NoAuthTokenError:
+    elif isinstance(error, botocore.exceptions.NoAuthTokenError):
         # NoAuthTokenError can be service-specific (e.g., CodeCatalyst requires registration)
         # Not necessarily a credential expiration, so just skip this operation
         logger.debug(f'NoAuthTokenError for {service_name}.{operation_name} (service-specific issue)')
-        return
+    elif outcome == EXPIRED and METRICS.set_flag(EXPIRED):
+        logger.error(f'❌ The credentials were rejected ({error}), use --checkpoint and --resume '
+                     f'with fresh credentials to continue the scan')
+
+    if isinstance(error, ENDPOINT_ERRORS) and ENDPOINT_BREAKER is not None:
+        ENDPOINT_BREAKER.trip(service_name, region, error)
+
+    return make_record(service_name, operation_name, region, outcome)
+
+
+def report_throttle(service_name, operation_name, region, attempt):
+    """
+    Throttled calls are retried instead of being reported as denied.
+
+    :return: True if the operation should be tested again
+    """
+    logger = logging.getLogger()
+
+    if CONTROLLER:
+        CONTROLLER.on_throttle(service_name, operation_name)
+
+    if attempt < MAX_THROTTLE_RETRIES:
+        METRICS.increment(THROTTLE_RETRIES, service_name)
+        logger.debug('Throttled %s.%s(), re-queued (attempt %d)' % (service_name, operation_name, attempt + 1))
+        return True
+
+    HISTOGRAMS.observe(RETRIES, service_name, region, attempt)
+    logger.debug('Throttled %s.%s(), giving up' % (service_name, operation_name))
+    return False
+
+
+def report_response(service_name, region, attempt):
+    """
+    The service answered without throttling, let the controller ramp up and
+    record how many throttling retries the operation needed.
+    """
+    HISTOGRAMS.observe(RETRIES, service_name, region, attempt)
+
+    if CONTROLLER:
+        CONTROLLER.on_success()
+
+
+def report_permission(service_name, operation_name, region, action_response):
+    logger = logging.getLogger()
 
-    OPERATION_COUNTER['found'] += 1
     msg = '\033[92m-- %s.%s() worked!\033[0m'
     args = (service_name, operation_name)
     logger.info(msg % args)
 
-    key = '%s.%s' % (service_name, operation_name)
+    # Kept in the output when the full response is streamed to the sink. The
+    # size of the response is only in its ResponseMetadata, which the full
+    # result removes
+    summary = summarize_response(action_response) if RESULT_DETAIL == FULL else None
+
+    record = make_record(service_name, operation_name, region, ALLOWED, get_result(action_response, RESULT_DETAIL))
+
+    if summary is not None:
+        record['summary'] = summary
+
+    return record
+
+
+# The result of an operation allowed by its DryRun answer, there is no payload
+DRY_RUN_RESULT = {'DryRun': True}
 
-    return key, remove_metadata(action_response)
+
+def check_queued_permission(queued, scheduler=None):
+    queued_at, arg_tuple = queued
+
+    HISTOGRAMS.observe(QUEUE_WAIT, arg_tuple[4], arg_tuple[3], time.perf_counter() - queued_at)
+    return check_one_permission(arg_tuple, scheduler)
+
+
+def check_one_permission(arg_tuple, scheduler=None):
+    access_key, secret_key, session_token, region, service_name, operation_name = arg_tuple
+    logger = logging.getLogger()
+
+    skipped = check_deadline(service_name, operation_name, region, scheduler)
+    if skipped is not None:
+        return skipped
+
+    # Progress tracking
+    count_operation(service_name)
+
+    unavailable = check_endpoint(service_name, operation_name, region)
+    if unavailable is not None:
+        return unavailable
+
+    service_client = get_client(access_key, secret_key, session_token, service_name, region)
+    if service_client is None:
+        return make_record(service_name, operation_name, region, INVALID)
+
+    action_function = get_action_function(service_client, service_name, operation_name)
+    if action_function is None:
+        return make_record(service_name, operation_name, region, INVALID)
+
+    params = get_operation_params(service_name, operation_name)
+
+    logger.debug('Testing %s.%s() in region %s' % (service_name, operation_name, region))
+
+    for attempt in range(MAX_THROTTLE_RETRIES + 1):
+        if attempt:
+            time.sleep(get_retry_delay(attempt - 1))
+
+        try:
+            action_response = call_operation(action_function, service_name, region, params)
+        except get_operation_errors() as error:
+            if params and is_dry_run_allowed(error):
+                report_response(service_name, region, attempt)
+                return report_permission(service_name, operation_name, region, dict(DRY_RUN_RESULT))
+
+            if is_throttling_error(error):
+                if report_throttle(service_name, operation_name, region, attempt):
+                    continue
+
+                return make_record(service_name, operation_name, region, THROTTLED)
+
+            report_response(service_name, region, attempt)
+            return handle_operation_error(error, service_name, operation_name, region)
+
+        report_response(service_name, region, attempt)
+        return report_permission(service_name, operation_name, region, action_response)
+
+
+def call_operation(action_function, service_name, region, params=None):
+    start = time.perf_counter()
+
+    if CONTROLLER:
+        CONTROLLER.enter()
+
+    try:
+        if RATE_LIMITER:
+            RATE_LIMITER.acquire(service_name, region)
+
+        request_start = time.perf_counter()
+        HISTOGRAMS.observe(RATE_LIMIT_WAIT, service_name, region, request_start - start)
+
+        try:
+            return action_function(**(params or {}))
+        finally:
+            HISTOGRAMS.observe(REQUEST, service_name, region, time.perf_counter() - request_start)
+    finally:
+        if CONTROLLER:
+            CONTROLLER.exit()
 
 
 def configure_logging():
@@ -254,7 +767,11 @@ def configure_logging():
     urllib3.disable_warnings(botocore.vendored.requests.packages.urllib3.exceptions.InsecureRequestWarning)
 
 
-def enumerate_iam(access_key, secret_key, session_token, region, rate_limit=None):
+def enumerate_iam(access_key, secret_key, session_token, region, rate_limit=None, engine='thread',
+                  client_cache_size=None, service_rate_limits=None, adaptive=False, sink=None,
+                  checkpoint=None, expiration=None, time_budget=None, regions=None, prefetch=False,
+                  warm_connections=False, dry_run=False, result_detail=FULL, endpoint_url=None,
+                  result_cache=None):
     """IAM Account Enumerator.
 
     This code provides a mechanism to attempt to validate the permissions assigned
@@ -272,27 +789,207 @@ def enumerate_iam(access_key, secret_key, session_token, region, rate_limit=None
     
     logger.debug(f"Using credentials - AccessKey: {access_key[:20]}..., SecretKey: {'*' * 20}, SessionToken: {'Yes' if session_token else 'No'}")
 
-    # Initialize global rate limiter if requested
+    with profile_phase('setup'):
+        configure_scan(rate_limit=rate_limit,
+                       engine=engine,
+                       client_cache_size=client_cache_size,
+                       service_rate_limits=service_rate_limits,
+                       adaptive=adaptive,
+                       dry_run=dry_run,
+                       result_detail=result_detail,
+                       endpoint_url=endpoint_url)
+
+    try:
+        if prefetch or warm_connections:
+            # Clients are only warmed for the thread engine, the async engine
+            # has its own aiohttp connection pools
+            credentials = (access_key, secret_key, session_token) if warm_connections and engine == 'thread' else None
+
+            with profile_phase('setup'):
+                prefetch_scan_endpoints(region, regions, credentials=credentials)
+
+        with TIMINGS.measure('scan'):
+            output.update(scan_identity(access_key, secret_key, session_token, region,
+                                        engine=engine,
+                                        sink=sink,
+                                        checkpoint=checkpoint,
+                                        regions=regions,
+                                        result_cache=result_cache,
+                                        expiration=expiration,
+                                        time_budget=time_budget))
+    finally:
+        DNS_CACHE.uninstall()
+
+    report_summary()
+
+    return output
+
+
+def prefetch_scan_endpoints(region, regions=None, credentials=None):
+    """
+    Resolve the endpoint hostnames of every service the scan will call, and
+    warm one connection per client when credentials (a tuple with the access
+    key, secret key and session token) are given
+    """
+    scan_regions = resolve_regions(get_session(), regions) if regions is not None else [region]
+
+    if credentials is None:
+        get_client_for = None
+    else:
+        def get_client_for(service_name, client_region):
+            return get_client(*credentials, service_name, client_region)
+
+    with TIMINGS.measure('prefetch'):
+        prefetch_endpoints(get_session(),
+                           list(get_catalog()),
+                           scan_regions,
+                           ENDPOINT_BREAKER,
+                           DNS_CACHE,
+                           get_client=get_client_for,
+                           endpoint_url=ENDPOINT_URL)
+
+
+def configure_scan(rate_limit=None, engine='thread', client_cache_size=None, service_rate_limits=None,
+                   adaptive=False, identities=1, dry_run=False, result_detail=FULL, endpoint_url=None):
+    """
+    Set up the state shared by every scan in this process: the timings, the
+    client cache, the rate limiter, the adaptive controller, the DryRun probe
+    mode, how much of each response is kept and the
+    endpoint URL override.
+    identities is the number of credential sets scanned at the same time.
+    """
+    TIMINGS.reset()
+    METRICS.reset()
+    HISTOGRAMS.reset()
+
+    if client_cache_size is not None:
+        CLIENT_CACHE.resize(client_cache_size)
+
+    # Initialize the global / per-service rate limiter if requested, the
+    # service_rate_limits keys are "service", "service@region" or "*"
     global RATE_LIMITER
-    RATE_LIMITER = RateLimiter(rate_limit) if rate_limit and float(rate_limit) > 0 else None
+    RATE_LIMITER = build_rate_limiter(rate_limit, service_rate_limits)
+
+    # AIMD control of the requests in flight and request rate, driven by
+    # throttling responses
+    global CONTROLLER
+    CONTROLLER = None
+
+    if adaptive:
+        max_concurrency = MAX_IN_FLIGHT if engine == 'async' else MAX_THREADS
+        CONTROLLER = AdaptiveController(max_concurrency * identities, rate=rate_limit or None)
+
+    # Ask for the permission with DryRun=True wherever the operation accepts
+    # it: no payload, and operations with required parameters are probed
+    # with placeholder values
+    global DRY_RUN
+    DRY_RUN = dry_run
+
+    # One of RESULT_DETAILS, applied as soon as the response is received
+    global RESULT_DETAIL
+    RESULT_DETAIL = result_detail
+
+    # Send every request to this URL instead of the AWS endpoints, e.g. a
+    # local stand-in for benchmarks or LocalStack. The cached clients were
+    # created for the previous endpoint
+    global ENDPOINT_URL
+    if endpoint_url != ENDPOINT_URL:
+        CLIENT_CACHE.clear()
+    ENDPOINT_URL = endpoint_url
+
+    # Short-circuit the operations of services without an endpoint in the
+    # region, endpoint availability doesn't depend on the credentials. The
+    # AWS endpoint data says nothing about an endpoint URL override
+    global ENDPOINT_BREAKER
+    ENDPOINT_BREAKER = EndpointBreaker(get_session(), use_endpoint_data=not endpoint_url)
+
+
+def scan_identity(access_key, secret_key, session_token, region, engine='thread', sink=None,
+                  checkpoint=None, regions=None, result_cache=None, expiration=None, time_budget=None):
+    """
+    Run the IAM and the bruteforce enumeration for one credential set, using
+    the state set up by configure_scan(). The outcomes cached in result_cache
+    (a ResultCache) for the same principal are reused.
+
+    The bruteforce stops before the credentials expire (expiration, a
+    time.time() timestamp) or time_budget seconds after it starts, whichever
+    comes first.
+    """
+    output = dict()
 
-    output['iam'] = enumerate_using_iam(access_key, secret_key, session_token, region)
-    output['bruteforce'] = enumerate_using_bruteforce(access_key, secret_key, session_token, region)
+    # Sweep several regions (or "all", the regions enabled in the account)
+    # in one scan, global services once
+    if regions is not None:
+        ec2_client = None
+        if ALL_REGIONS in regions:
+            ec2_client = get_client(access_key, secret_key, session_token, 'ec2', region)
+
+        regions = resolve_regions(get_session(), regions, ec2_client=ec2_client)
+
+    identity_cache = None
+
+    if result_cache is not None:
+        with profile_phase('setup'):
+            identity = get_caller_identity(access_key, secret_key, session_token, region)
+
+        if identity is not None:
+            identity_cache = result_cache.open(identity,
+                                               get_catalog().digest,
+                                               endpoint_url=ENDPOINT_URL,
+                                               dry_run=DRY_RUN,
+                                               result_detail=RESULT_DETAIL)
+
+    with profile_phase('iam'):
+        output['iam'] = enumerate_using_iam(access_key, secret_key, session_token, region)
+
+    # Each credential set has its own deadline, the budget starts with its
+    # bruteforce phase
+    deadline = get_deadline(expiration, time_budget)
+    scheduler = DeadlineScheduler(deadline) if deadline else None
+
+    with profile_phase('bruteforce'):
+        output['bruteforce'] = enumerate_using_bruteforce(access_key, secret_key, session_token, region,
+                                                          engine=engine,
+                                                          sink=sink,
+                                                          checkpoint=checkpoint,
+                                                          regions=regions,
+                                                          identity_cache=identity_cache,
+                                                          scheduler=scheduler)
 
     return output
 
 
+def get_caller_identity(access_key, secret_key, session_token, region):
+    """
+    :return: The response of sts get_caller_identity, which is never denied,
+             None if the call failed
+    """
+    logger = logging.getLogger()
+    client = get_client(access_key, secret_key, session_token, 'sts', region)
+
+    if client is None:
+        logger.warning('⚠️  Could not create the STS client, scanning without the result cache')
+        return
+
+    try:
+        return client.get_caller_identity()
+    except get_operation_errors() as error:
+        logger.warning(f'⚠️  Could not identify the principal ({error}), scanning without the result cache')
+
+
 def enumerate_using_iam(access_key, secret_key, session_token, region):
     output = dict()
     logger = logging.getLogger()
 
     # Connect to the IAM API and start testing.
     logger.info('Starting permission enumeration for access-key-id "%s"', access_key)
-    iam_client = boto3.client(
+    iam_client = get_session().client(
         'iam',
         aws_access_key_id=access_key,
         aws_secret_access_key=secret_key,
-        aws_session_token=session_token
+        aws_session_token=session_token,
+        region_name=region,
+        endpoint_url=ENDPOINT_URL
     )
 
     # Try for the kitchen sink.
@@ -0,0 +1,200 @@
+"""
+Scan metrics: operation counts by outcome, in total and per service
+
+The counters are incremented from every worker thread. A shared dict updated
+with += loses increments under contention, and a lock around every increment
+makes all the workers wait on each other, so every thread gets its own shard
+of counters which only that thread writes to. Reads merge the shards, they
+are exact once the workers are done and a close approximation while they
+are running. When a thread ends its shard is folded into the retired total,
+so the thread pools of a batch scan don't leave one shard per thread behind.
+"""
+import logging
+import weakref
+import threading
+
+from enumerate_iam.outcomes import SKIPPED
+
+ATTEMPTED = 'attempted'
+THROTTLE_RETRIES = 'throttle-retries'
+
+
+def add_counts(total, shard):
+    for key, value in shard.items():
+        total[key] = total.get(key, 0) + value
+
+
+class _ShardOwner:
+    """
+    Kept in the thread local storage of a thread, it is collected when the
+    thread ends
+    """
+
+
+class ThreadShards:
+    """
+    One dict per thread which only that thread writes to, merged with
+    combine(total, shard), a function adding the values of shard to total
+    """
+    def __init__(self, combine):
+        self.combine = combine
+        self.local = threading.local()
+        # Reentrant, a shard can be retired by a garbage collection which
+        # runs while the lock is held
+        self.lock = threading.RLock()
+        self.shards = []
+        self.retired = {}
+
+    def get(self):
+        """
+        :return: The shard of the calling thread
+        """
+        shard = getattr(self.local, 'shard', None)
+
+        if shard is None:
+            shard = self.local.shard = {}
+            self.local.owner = _ShardOwner()
+
+            with self.lock:
+                self.shards.append(shard)
+
+            weakref.finalize(self.local.owner, self._retire, shard)
+
+        return shard
+
+    def _retire(self, shard):
+        with self.lock:
+            self.shards = [other for other in self.shards if other is not shard]
+            self.combine(self.retired, shard)
+
+    def merge(self):
+        """
+        :return: A new dict with the values of every shard, retired included
+        """
+        merged = {}
+
+        with self.lock:
+            self.combine(merged, self.retired)
+
+            for shard in self.shards:
+                # dict.copy() doesn't release the GIL, the owner thread can't
+                # change the shard while it is being copied
+                self.combine(merged, shard.copy())
+
+        return merged
+
+    def clear(self):
+        with self.lock:
+            for shard in self.shards:
+                shard.clear()
+
+            self.retired.clear()
+
+
+class ScanMetrics:
+    def __init__(self):
+        self.shards = ThreadShards(add_counts)
+        self.lock = threading.Lock()
+        self.total = 0
+        self.flags = set()
+
+    def increment(self, name, service_name=None, amount=1):
+        shard = self.shards.get()
+        shard[name] = shard.get(name, 0) + amount
+
+        if service_name is not None:
+            key = (service_name, name)
+            shard[key] = shard.get(key, 0) + amount
+
+    def record(self, record):
+        """
+        Count the outcome of one operation, a record from make_record()
+        """
+        self.increment(record['outcome'], record['service'])
+
+    def add_total(self, total):
+        """
+        Add total operations to the number the scan is expected to test
+        """
+        with self.lock:
+            self.total += total
+
+    def set_flag(self, name):
+        """
+        :return: True for the first caller only, to log something once
+        """
+        with self.lock:
+            if name in self.flags:
+                return False
+
+            self.flags.add(name)
+            return True
+
+    def _merge(self):
+        return self.shards.merge()
+
+    def get(self, name):
+        return self._merge().get(name, 0)
+
+    def get_counts(self):
+        """
+        :return: A dict with the total of every counter
+        """
+        return {key: value for key, value in self._merge().items() if isinstance(key, str)}
+
+    def get_service_counts(self):
+        """
+        :return: A {service: {counter: value}} dict
+        """
+        service_counts = {}
+
+        for key, value in self._merge().items():
+            if isinstance(key, tuple):
+                service_name, name = key
+                service_counts.setdefault(service_name, {})[name] = value
+
+        return service_counts
+
+    def reset(self):
+        """
+        Only call between scans, while no worker is incrementing
+        """
+        self.shards.clear()
+
+        with self.lock:
+            self.total = 0
+            self.flags.clear()
+
+    def report(self, outcomes):
+        """
+        Log the number of operations with each of outcomes, and the services
+        with the most throttled operations
+        """
+        logger = logging.getLogger()
+
+        counts = self.get_counts()
+
+        # Skipped operations were never sent, they are not part of the tested
+        # operations
+        tested_outcomes = [outcome for outcome in outcomes if outcome != SKIPPED]
+        tested = sum(counts.get(outcome, 0) for outcome in tested_outcomes)
+        skipped = counts.get(SKIPPED, 0)
+
+        if not tested and not skipped:
+            return
+
+        details = ', '.join(f'{counts.get(outcome, 0)} {outcome}'
+                            for outcome in tested_outcomes if counts.get(outcome, 0))
+        logger.info(f'📊 {tested}/{self.total} operations tested' + (f': {details}' if details else ''))
+
+        if skipped:
+            logger.info(f'📊 {skipped}/{self.total} operations skipped, they were not tested before the deadline')
+
+        throttled = sorted(((values.get(THROTTLE_RETRIES, 0), service_name)
+                            for service_name, values in self.get_service_counts().items()
+                            if values.get(THROTTLE_RETRIES, 0)),
+                           reverse=True)
+
+        if throttled:
+            logger.info('📊 Most throttled services: %s' % ', '.join(f'{service_name} ({retries} retries)'
+                                                                    for retries, service_name in throttled[:5]))
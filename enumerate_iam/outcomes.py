@@ -0,0 +1,119 @@
+"""
+Possible outcomes of testing one operation in the bruteforce scan
+
+The outcome names are imported by the command line parsing, the histograms
+and the checkpoints, before (or without) a scan. botocore is only imported by
+the functions which look at an error, when a scan already loaded it.
+"""
+ALLOWED = 'allowed'
+DENIED = 'denied'
+THROTTLED = 'throttled'
+ENDPOINT_FAILED = 'endpoint-failed'
+INVALID = 'invalid'
+EXPIRED = 'expired'
+SKIPPED = 'skipped'
+
+OUTCOMES = (ALLOWED, DENIED, THROTTLED, ENDPOINT_FAILED, INVALID, EXPIRED, SKIPPED)
+
+# Outcomes which answer the question "is this operation allowed?", they don't
+# need to be tested again when a scan is resumed. Throttled operations,
+# endpoint failures (which can be a transient network error or a timeout),
+# operations which failed because the credentials expired and operations
+# skipped because of the deadline are not finished. Services without an
+# endpoint in the region are skipped again without a request.
+FINISHED_OUTCOMES = {ALLOWED, DENIED, INVALID}
+
+# Answer of an operation called with DryRun=True when the permission is
+# granted, UnauthorizedOperation (denied) is handled like any other error
+DRY_RUN_ALLOWED_CODE = 'DryRunOperation'
+
+CREDENTIAL_ERROR_CODES = {
+    'ExpiredToken',
+    'ExpiredTokenException',
+    'RequestExpired',
+    'InvalidClientTokenId',
+    'UnrecognizedClientException',
+    'InvalidToken',
+    'AuthFailure',
+}
+
+_OPERATION_ERRORS = None
+
+
+def get_operation_errors():
+    """
+    :return: The exceptions raised by an API call which are turned into an
+             outcome, every other exception is a bug
+    """
+    global _OPERATION_ERRORS
+
+    if _OPERATION_ERRORS is None:
+        import botocore.exceptions
+        from botocore.parsers import ResponseParserError
+
+        _OPERATION_ERRORS = (botocore.exceptions.ClientError,
+                             botocore.exceptions.EndpointConnectionError,
+                             botocore.exceptions.ConnectTimeoutError,
+                             botocore.exceptions.ReadTimeoutError,
+                             botocore.exceptions.ParamValidationError,
+                             botocore.exceptions.NoAuthTokenError,
+                             ResponseParserError)
+
+    return _OPERATION_ERRORS
+
+
+def is_credential_error(error):
+    import botocore.exceptions
+
+    if not isinstance(error, botocore.exceptions.ClientError):
+        return False
+
+    response = getattr(error, 'response', None) or {}
+    return response.get('Error', {}).get('Code', None) in CREDENTIAL_ERROR_CODES
+
+
+def is_dry_run_allowed(error):
+    import botocore.exceptions
+
+    if not isinstance(error, botocore.exceptions.ClientError):
+        return False
+
+    response = getattr(error, 'response', None) or {}
+    return response.get('Error', {}).get('Code', None) == DRY_RUN_ALLOWED_CODE
+
+
+def classify_error(error):
+    """
+    :return: The outcome for an operation which raised error (one of the
+             get_operation_errors()), after throttling was handled
+    """
+    import botocore.exceptions
+    from botocore.parsers import ResponseParserError
+
+    if isinstance(error, (botocore.exceptions.ParamValidationError,
+                          botocore.exceptions.NoAuthTokenError,
+                          ResponseParserError)):
+        return INVALID
+
+    if isinstance(error, (botocore.exceptions.EndpointConnectionError,
+                          botocore.exceptions.ConnectTimeoutError,
+                          botocore.exceptions.ReadTimeoutError)):
+        return ENDPOINT_FAILED
+
+    if is_credential_error(error):
+        return EXPIRED
+
+    return DENIED
+
+
+def make_record(service_name, operation_name, region, outcome, result=None):
+    record = {'key': '%s.%s' % (service_name, operation_name),
+              'service': service_name,
+              'operation': operation_name,
+              'region': region,
+              'outcome': outcome}
+
+    if outcome == ALLOWED:
+        record['result'] = result
+
+    return record
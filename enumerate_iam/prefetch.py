@@ -0,0 +1,267 @@
+"""
+Pre-flight endpoint resolution
+
+Without this stage the first call to each service resolves its hostname, and
+opens a TLS connection, inside a worker thread while the scan is running.
+prefetch_endpoints() moves that work before the scan:
+
+    * The hostname of every (service, region) pair the scan will call is
+      computed offline from botocore's endpoint data.
+
+    * All the hostnames are resolved concurrently and the answers are kept in
+      a DNSCache, which serves them to the HTTP stacks (urllib3 and aiohttp
+      both go through socket.getaddrinfo) for the rest of the scan.
+
+    * Hostnames which don't resolve trip the EndpointBreaker, so their
+      operations are never dispatched.
+
+    * Optionally one TLS connection per client is opened and returned to the
+      client's botocore connection pool (thread engine only).
+"""
+import os
+import socket
+import logging
+import threading
+
+from urllib.parse import urlparse
+
+from enumerate_iam.catalog import get_catalog
+from enumerate_iam.endpoints import has_endpoint_override
+from enumerate_iam.regions import get_global_services
+
+PREFETCH_THREADS = 64
+
+
+class DNSCache:
+    """
+    getaddrinfo() answers for the prefetched (host, port) pairs. While
+    installed, socket.getaddrinfo() returns the cached answer for these
+    pairs and calls the original function for everything else.
+    """
+    def __init__(self):
+        self.answers = {}
+        self.failures = {}
+        self.lock = threading.Lock()
+        self.original_getaddrinfo = None
+
+    def resolve(self, host, port):
+        """
+        :return: None if host resolved, the socket.gaierror otherwise
+        """
+        with self.lock:
+            if (host, port) in self.answers:
+                return
+            if (host, port) in self.failures:
+                return self.failures[(host, port)]
+
+        getaddrinfo = self.original_getaddrinfo or socket.getaddrinfo
+
+        try:
+            answer = getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        except socket.gaierror as error:
+            with self.lock:
+                self.failures[(host, port)] = error
+            return error
+
+        with self.lock:
+            self.answers[(host, port)] = answer
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        with self.lock:
+            answer = self.answers.get((host, port), None)
+
+        if answer is not None:
+            matching = [entry for entry in answer
+                        if family in (0, entry[0]) and type in (0, entry[1])]
+
+            if matching:
+                return matching
+
+        return self.original_getaddrinfo(host, port, family, type, proto, flags)
+
+    def install(self):
+        if self.original_getaddrinfo is not None:
+            return
+
+        self.original_getaddrinfo = socket.getaddrinfo
+        socket.getaddrinfo = self.getaddrinfo
+
+    def uninstall(self):
+        if self.original_getaddrinfo is None:
+            return
+
+        socket.getaddrinfo = self.original_getaddrinfo
+        self.original_getaddrinfo = None
+
+
+def get_endpoint_address(session, service_name, region):
+    """
+    :return: The (hostname, port) the client for service_name in region
+             sends its requests to, None if botocore doesn't know the service
+    """
+    endpoint_prefix = get_catalog().get_endpoint_prefix(service_name)
+
+    resolver = session._session._get_internal_component('endpoint_resolver')
+    endpoint = resolver.construct_endpoint(endpoint_prefix, region)
+
+    if not endpoint or 'hostname' not in endpoint:
+        return
+
+    return endpoint['hostname'], 443
+
+
+def get_override_address(endpoint_url=None):
+    """
+    :return: The (hostname, port) of endpoint_url (the scanner's endpoint URL
+             override) or else of AWS_ENDPOINT_URL, None when the endpoint
+             override comes from somewhere else (per service variables or
+             the config file)
+    """
+    endpoint_url = endpoint_url or os.environ.get('AWS_ENDPOINT_URL', None)
+    if not endpoint_url:
+        return
+
+    url = urlparse(endpoint_url)
+    return url.hostname, url.port or (443 if url.scheme == 'https' else 80)
+
+
+def warm_connection(client):
+    """
+    Open one connection to the client's endpoint, TLS handshake included,
+    and put it in the client's connection pool for the first request to use.
+
+    botocore has no public API for this, it goes through the internals of
+    its URLLib3Session (_proxy_config, _get_connection_manager() and
+    _setup_ssl_cert()) and of urllib3's HTTPConnectionPool (_get_conn() and
+    _put_conn()), tests/test_prefetch.py covers them. Raises AttributeError
+    when a botocore or urllib3 upgrade removed one of them.
+    """
+    endpoint_url = client.meta.endpoint_url
+    http_session = client._endpoint.http_session
+
+    proxy_url = http_session._proxy_config.proxy_url_for(endpoint_url)
+    manager = http_session._get_connection_manager(endpoint_url, proxy_url)
+    pool = manager.connection_from_url(endpoint_url)
+    http_session._setup_ssl_cert(pool, endpoint_url, http_session._verify)
+
+    conn = pool._get_conn()
+    conn.connect()
+    pool._put_conn(conn)
+
+
+def prefetch_endpoints(session, service_names, regions, breaker, dns_cache, get_client=None, endpoint_url=None):
+    """
+    Resolve the hostname of every service in every region before the scan and
+    skip the (service, region) pairs whose hostname does not resolve.
+
+    :param get_client: A function taking (service_name, region) and returning
+                       the scanner's client, to warm one connection per
+                       client. None to only resolve the hostnames.
+    :param endpoint_url: The URL every client sends its requests to, only its
+                         hostname is resolved. None for the AWS endpoints.
+    """
+    logger = logging.getLogger()
+
+    from urllib.request import getproxies
+    from multiprocessing.dummy import Pool as ThreadPool
+
+    if getproxies():
+        logger.info('A proxy is configured, the proxy resolves the endpoint hostnames, skipping the prefetch')
+        return
+
+    global_services = get_global_services(session)
+    override = bool(endpoint_url) or has_endpoint_override(session)
+
+    if override and get_override_address(endpoint_url) is None:
+        logger.info('The endpoint URLs are configured per service, skipping the prefetch')
+        return
+
+    pairs = []
+
+    for service_name in service_names:
+        is_global = get_catalog().get_endpoint_prefix(service_name) in global_services
+        service_regions = regions[:1] if is_global else regions
+
+        for region in service_regions:
+            if not breaker.is_available(service_name, region):
+                continue
+
+            pairs.append((service_name, region))
+
+    def get_address(pair):
+        if override:
+            return pair, get_override_address(endpoint_url)
+
+        return pair, get_endpoint_address(session, *pair)
+
+    pool = ThreadPool(PREFETCH_THREADS)
+
+    try:
+        addresses = {}
+
+        for pair, address in pool.imap_unordered(get_address, pairs):
+            if address is not None:
+                addresses.setdefault(address, []).append(pair)
+
+        def resolve(address):
+            return address, dns_cache.resolve(*address)
+
+        failed = {}
+
+        for address, error in pool.imap_unordered(resolve, list(addresses)):
+            if error is not None:
+                failed[address] = error
+
+        # Most likely there is no DNS at all, don't skip the whole scan
+        if failed and len(failed) == len(addresses):
+            logger.warning(f'⚠️  None of the {len(addresses)} endpoint hostnames resolved, not skipping any service')
+            return
+
+        dns_cache.install()
+
+        for address, error in failed.items():
+            for service_name, region in addresses[address]:
+                breaker.trip(service_name, region, error)
+
+        logger.info(f'🌐 Resolved {len(addresses) - len(failed)}/{len(addresses)} endpoint hostnames, '
+                    f'{sum(len(addresses[address]) for address in failed)} services skipped')
+
+        if get_client is None:
+            return
+
+        warm_pairs = [pair for address, address_pairs in addresses.items() if address not in failed
+                      for pair in address_pairs]
+
+        unsupported = []
+
+        def warm(pair):
+            if unsupported:
+                return False
+
+            client = get_client(*pair)
+            if client is None:
+                return False
+
+            try:
+                warm_connection(client)
+            except AttributeError as e:
+                # The internals warm_connection() relies on changed, every
+                # other client would fail the same way
+                unsupported.append(e)
+                return False
+            except Exception as e:
+                logger.debug(f'Could not warm a connection for {pair[0]} in {pair[1]}: {e}')
+                return False
+
+            return True
+
+        warmed = sum(pool.imap_unordered(warm, warm_pairs))
+
+        if unsupported:
+            logger.warning(f'⚠️  Connection warming is not supported by the installed botocore / urllib3 '
+                           f'({unsupported[0]}), the connections are opened by the first requests')
+
+        logger.info(f'🔥 Warmed {warmed}/{len(warm_pairs)} endpoint connections')
+    finally:
+        pool.close()
+        pool.join()
@@ -0,0 +1,228 @@
+"""
+Profiling of selected scan phases
+
+Wrapping enumerate-iam.py in an external profiler also profiles the git pull,
+the imports and the argument parsing. A Profiler only runs while one of the
+selected phases is active:
+
+    * setup: the scan configuration, the botocore session and the endpoint
+      prefetch / connection warming
+    * iam: the IAM enumeration (get_account_authorization_details, ...)
+    * bruteforce: the bruteforce sweep
+
+Two modes:
+
+    * cprofile: deterministic, every thread which runs a phase (and every
+      thread started during a phase, e.g. the thread engine's workers) gets
+      its own cProfile.Profile, merged into one <output>.pstats file
+    * sampling: a background thread samples the stacks of every thread every
+      SAMPLING_INTERVAL seconds, much lower overhead. The samples are written
+      in the collapsed stack format to <output>.collapsed, for flamegraph.pl
+      or speedscope
+"""
+import os
+import sys
+import logging
+import threading
+
+from contextlib import contextmanager
+
+CPROFILE = 'cprofile'
+SAMPLING = 'sampling'
+PROFILE_MODES = (CPROFILE, SAMPLING)
+
+PHASES = ('setup', 'iam', 'bruteforce')
+
+SAMPLING_INTERVAL = 0.005
+DEFAULT_OUTPUT = 'enumerate-iam-profile'
+
+
+def parse_phases(value):
+    """
+    Parse the comma separated --profile-phases command line value
+    """
+    phases = [phase.strip() for phase in value.split(',') if phase.strip()]
+
+    for phase in phases:
+        if phase not in PHASES:
+            raise ValueError(f'unknown phase {phase}, expected one of {", ".join(PHASES)}')
+
+    return phases
+
+
+def get_frame_name(frame):
+    code = frame.f_code
+    return '%s:%s:%d' % (os.path.basename(code.co_filename), code.co_name, code.co_firstlineno)
+
+
+class Profiler:
+    def __init__(self, mode, phases=PHASES, output=DEFAULT_OUTPUT, interval=SAMPLING_INTERVAL):
+        self.mode = mode
+        self.phases = [phase for phase in PHASES if phase in phases]
+        self.output = output
+        self.interval = interval
+
+        self.lock = threading.Lock()
+        self.active = 0
+        self.local = threading.local()
+
+        # cprofile: every Profile created, the stats are merged on write()
+        self.profiles = []
+
+        # sampling: collapsed stack -> number of samples
+        self.samples = {}
+        self.sampler = None
+        self.stopped = threading.Event()
+
+    @contextmanager
+    def phase(self, name):
+        if name not in self.phases:
+            yield
+            return
+
+        with self.lock:
+            self.active += 1
+            if self.active == 1:
+                self._start()
+
+        started_here = self.mode == CPROFILE and self._enable_thread_profile()
+
+        try:
+            yield
+        finally:
+            if started_here:
+                self.local.profile.disable()
+                self.local.profile = None
+
+            with self.lock:
+                self.active -= 1
+                if self.active == 0:
+                    self._stop()
+
+    def _enable_thread_profile(self):
+        """
+        :return: True if a Profile was enabled for the current thread
+        """
+        if getattr(self.local, 'profile', None) is not None:
+            return False
+
+        import cProfile
+
+        profile = cProfile.Profile()
+
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Python 3.12+ only allows one active profiler at a time
+            logging.getLogger().debug(f'Could not profile {threading.current_thread().name}: {e}')
+            return False
+
+        self.local.profile = profile
+
+        with self.lock:
+            self.profiles.append(profile)
+
+        return True
+
+    def _profile_new_thread(self, frame, event, arg):
+        # Installed with threading.setprofile(), runs once in each thread
+        # started during a phase and replaces itself with a cProfile.Profile
+        sys.setprofile(None)
+        self._enable_thread_profile()
+
+    def _start(self):
+        if self.mode == CPROFILE:
+            threading.setprofile(self._profile_new_thread)
+            return
+
+        self.stopped.clear()
+        self.sampler = threading.Thread(target=self._sample, name='profiler-sampler', daemon=True)
+        self.sampler.start()
+
+    def _stop(self):
+        if self.mode == CPROFILE:
+            threading.setprofile(None)
+            return
+
+        self.stopped.set()
+
+        # _stop() runs with the lock held, the sampler doesn't need it
+        self.sampler.join()
+        self.sampler = None
+
+    def _sample(self):
+        own_thread = threading.get_ident()
+
+        while not self.stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    stack.append(get_frame_name(frame))
+                    frame = frame.f_back
+
+                stack.append(names.get(thread_id, 'thread-%d' % thread_id))
+                key = ';'.join(reversed(stack))
+
+                self.samples[key] = self.samples.get(key, 0) + 1
+
+    def write(self):
+        """
+        Write the profile, :return: the name of the file written, None when
+        nothing was profiled
+        """
+        logger = logging.getLogger()
+
+        if self.mode == CPROFILE:
+            with self.lock:
+                profiles = list(self.profiles)
+
+            if not profiles:
+                return
+
+            import pstats
+
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+
+            filename = self.output + '.pstats'
+            stats.dump_stats(filename)
+        else:
+            if not self.samples:
+                return
+
+            filename = self.output + '.collapsed'
+
+            with open(filename, 'w', encoding='utf-8') as f:
+                for stack, count in sorted(self.samples.items()):
+                    f.write('%s %d\n' % (stack, count))
+
+        logger.info(f'📈 Profile of the {", ".join(self.phases)} phase(s) written to {filename}')
+        return filename
+
+
+PROFILER = None
+
+
+def set_profiler(profiler):
+    global PROFILER
+    PROFILER = profiler
+
+
+@contextmanager
+def profile_phase(name):
+    """
+    Profile the code in the with block as the name phase, when a Profiler is
+    set and name is one of its phases
+    """
+    if PROFILER is None:
+        yield
+        return
+
+    with PROFILER.phase(name):
+        yield
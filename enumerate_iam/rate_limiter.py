@@ -0,0 +1,176 @@
+"""
+Token bucket rate limiters used to pace the bruteforce requests
+
+RateLimiter is a single token bucket. HierarchicalRateLimiter combines an
+optional global bucket with per-service and per-(service, region) buckets, so
+a burst against one throttling-prone service (ec2, s3, organizations) only
+consumes that service's budget and the worker threads don't all compete for
+the same lock.
+
+Per-service limits are written as SERVICE=RATE, SERVICE@REGION=RATE or
+*=RATE, the last one gives every service its own bucket at that rate:
+
+    ec2=20
+    ec2@us-east-1=10
+    *=50
+"""
+import time
+import threading
+
+DEFAULT_SERVICE = '*'
+
+
+class RateLimiter:
+    def __init__(self, rate):
+        # rate: tokens per second (requests/second)
+        self.rate = float(rate)
+        self.capacity = max(self.rate, 1.0)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def try_acquire(self):
+        """
+        Take one token if available, otherwise return the seconds to wait
+        before trying again. Never blocks on anything but the lock.
+        """
+        with self.lock:
+            now = time.monotonic()
+            elapsed = now - self.last
+            self.last = now
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return 0.0
+            return (1.0 - self.tokens) / self.rate
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """
+        Same as acquire() but yields to the event loop instead of sleeping
+        the thread, for the asyncio engine.
+        """
+        import asyncio
+
+        if self.rate <= 0:
+            return
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+class HierarchicalRateLimiter:
+    """
+    A request for (service_name, region) takes one token from every bucket
+    which applies to it: the (service, region) bucket, the service bucket and
+    the global bucket, in that order.
+    """
+    def __init__(self, rate=None, service_rates=None):
+        self.global_limiter = RateLimiter(rate) if rate and float(rate) > 0 else None
+
+        self.default_service_rate = None
+        self.service_rates = {}
+        self.region_rates = {}
+
+        for key, service_rate in (service_rates or {}).items():
+            service_rate = float(service_rate)
+
+            if service_rate <= 0:
+                continue
+
+            if key == DEFAULT_SERVICE:
+                self.default_service_rate = service_rate
+            elif '@' in key:
+                service_name, region = key.split('@', 1)
+                self.region_rates[(service_name, region)] = service_rate
+            else:
+                self.service_rates[key] = service_rate
+
+        self.buckets = {}
+        self.limiters = {}
+        self.lock = threading.Lock()
+
+    def is_enabled(self):
+        return bool(self.global_limiter or
+                    self.default_service_rate or
+                    self.service_rates or
+                    self.region_rates)
+
+    def get_limiters(self, service_name, region):
+        """
+        :return: The list of RateLimiter instances a request for service_name
+                 in region has to acquire, built once per (service, region).
+        """
+        key = (service_name, region)
+
+        limiters = self.limiters.get(key, None)
+        if limiters is not None:
+            return limiters
+
+        with self.lock:
+            limiters = []
+
+            region_rate = self.region_rates.get(key, None)
+            if region_rate:
+                limiters.append(self._get_bucket(key, region_rate))
+
+            service_rate = self.service_rates.get(service_name, self.default_service_rate)
+            if service_rate:
+                limiters.append(self._get_bucket(service_name, service_rate))
+
+            if self.global_limiter is not None:
+                limiters.append(self.global_limiter)
+
+            self.limiters[key] = limiters
+
+        return limiters
+
+    def _get_bucket(self, key, rate):
+        bucket = self.buckets.get(key, None)
+
+        if bucket is None:
+            bucket = RateLimiter(rate)
+            self.buckets[key] = bucket
+
+        return bucket
+
+    def acquire(self, service_name, region):
+        for limiter in self.get_limiters(service_name, region):
+            limiter.acquire()
+
+    async def acquire_async(self, service_name, region):
+        for limiter in self.get_limiters(service_name, region):
+            await limiter.acquire_async()
+
+
+def parse_service_rate_limit(spec):
+    """
+    Parse one SERVICE=RATE, SERVICE@REGION=RATE or *=RATE command line value.
+
+    :return: A (key, rate) tuple, as used in the service_rates dict
+    """
+    key, sep, rate = spec.partition('=')
+    key = key.strip()
+
+    if not sep or not key:
+        raise ValueError('Expected SERVICE=RATE, SERVICE@REGION=RATE or *=RATE, got "%s"' % spec)
+
+    return key, float(rate)
+
+
+def build_rate_limiter(rate_limit=None, service_rate_limits=None):
+    """
+    :return: A HierarchicalRateLimiter, or None when no limit is configured
+    """
+    rate_limiter = HierarchicalRateLimiter(rate_limit, service_rate_limits)
+    return rate_limiter if rate_limiter.is_enabled() else None
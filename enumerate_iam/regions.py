@@ -0,0 +1,126 @@
+"""
+Multi-region sweep helpers
+
+Global services (iam, organizations, route53, cloudfront, ...) answer the same
+way in every region, so when several regions are scanned their operations are
+only tested once and reported under the GLOBAL_REGION key. Everything else is
+tested, and reported, once per region.
+"""
+import logging
+
+from enumerate_iam.catalog import get_catalog
+
+GLOBAL_REGION = 'global'
+ALL_REGIONS = 'all'
+
+# Account-level operations of regional services
+GLOBAL_OPERATIONS = {
+    ('s3', 'list_buckets'),
+    ('sts', 'get_caller_identity'),
+    ('sts', 'get_session_token'),
+}
+
+_GLOBAL_SERVICES = None
+
+
+def get_global_prefixes(endpoint_data):
+    """
+    :param endpoint_data: botocore's parsed endpoints.json
+    :return: The set of endpoint prefixes which have a single, partition wide
+             endpoint (isRegionalized is false).
+    """
+    global_prefixes = set()
+
+    for partition in endpoint_data['partitions']:
+        if partition['partition'] != 'aws':
+            continue
+
+        for endpoint_prefix, service_data in partition['services'].items():
+            if service_data.get('isRegionalized', True) is False:
+                global_prefixes.add(endpoint_prefix)
+
+    return global_prefixes
+
+
+def get_global_services(session):
+    """
+    :param session: The boto3 Session used by the scanner
+    :return: get_global_prefixes() of the session's endpoint data
+    """
+    global _GLOBAL_SERVICES
+
+    if _GLOBAL_SERVICES is None:
+        # endpoints.py imports botocore, parse_regions() is used by the
+        # command line before the scan starts
+        from enumerate_iam.endpoints import load_endpoint_data
+
+        _GLOBAL_SERVICES = get_global_prefixes(load_endpoint_data(session))
+
+    return _GLOBAL_SERVICES
+
+
+def is_global_operation(service_name, operation_name):
+    """
+    generate_bruteforce_tests.py flags the operations of global services, and
+    GLOBAL_OPERATIONS, in the catalog
+    """
+    return get_catalog().get_metadata(service_name, operation_name).get('global', False)
+
+
+def get_enabled_regions(ec2_client):
+    """
+    :param ec2_client: An ec2 client with the scanned credentials
+    :return: The regions enabled in the account of the credentials, None if
+             ec2 describe_regions is not allowed
+    """
+    logger = logging.getLogger()
+
+    try:
+        # Without AllRegions the opt-in regions which are not enabled are
+        # left out
+        response = ec2_client.describe_regions()
+    except Exception as e:
+        logger.debug(f'Could not list the enabled regions: {e}')
+        return
+
+    return [region['RegionName'] for region in response.get('Regions', [])] or None
+
+
+def resolve_regions(session, regions, ec2_client=None):
+    """
+    :param regions: A list of region names, or a list containing ALL_REGIONS
+    :param ec2_client: An ec2 client with the scanned credentials, to resolve
+                       ALL_REGIONS to the regions enabled in their account.
+                       None to resolve it to every region botocore knows.
+    :return: The list of regions to scan, without duplicates
+    """
+    logger = logging.getLogger()
+    resolved = []
+
+    for region in regions:
+        if region == ALL_REGIONS:
+            candidates = get_enabled_regions(ec2_client) if ec2_client is not None else None
+
+            if candidates is None:
+                candidates = session.get_available_regions('ec2')
+
+                # Regions which are not enabled reject every request as if
+                # the credentials were invalid
+                if ec2_client is not None:
+                    logger.warning('⚠️  Could not list the enabled regions with ec2 describe_regions, '
+                                   'scanning every region, including the opt-in ones')
+        else:
+            candidates = [region]
+
+        for candidate in candidates:
+            if candidate not in resolved:
+                resolved.append(candidate)
+
+    return resolved
+
+
+def parse_regions(value):
+    """
+    Parse the comma separated --regions command line value
+    """
+    return [region.strip() for region in value.split(',') if region.strip()]
@@ -0,0 +1,285 @@
+"""
+Cross-run cache of the bruteforce outcomes
+
+Scanning the same principal again shortly after a scan (e.g. after rotating
+its keys) tests every operation again. The outcomes of a scan are kept in a
+SQLite database under the user cache directory, keyed by:
+
+    * the account and the ARN returned by sts get_caller_identity, so new
+      keys of the same user share the entries and a different role session
+      (its ARN includes the session name) doesn't
+    * the digest of the operation catalog, entries of another catalog
+      version are never reused
+    * the endpoint URL override, a local stand-in doesn't answer like AWS
+    * the DryRun probe mode, a probed operation is called with placeholder
+      parameters and its result is not the response
+
+Only the outcomes which don't depend on the network are kept (allowed,
+denied and invalid). Entries older than the TTL are stale: their operations
+are tested again, and the new outcome replaces the entry. --cache-mode:
+
+    * off: no cache
+    * read: reuse the fresh entries, don't store anything
+    * write: reuse the fresh entries and store the outcome of every tested
+      operation
+    * refresh: test every operation and store the outcomes
+"""
+import os
+import sys
+import json
+import time
+import logging
+import threading
+
+from enumerate_iam.outcomes import ALLOWED, DENIED, INVALID
+from enumerate_iam.result_detail import FULL, PERMISSION, RESULT_DETAILS, summarize_response
+from enumerate_iam.utils.json_utils import json_encoder
+
+OFF = 'off'
+READ = 'read'
+WRITE = 'write'
+REFRESH = 'refresh'
+CACHE_MODES = (OFF, READ, WRITE, REFRESH)
+
+CACHED_OUTCOMES = {ALLOWED, DENIED, INVALID}
+
+CACHE_FILENAME = 'results.sqlite3'
+DEFAULT_TTL = 60 * 60
+
+# Entries older than this are deleted when the cache is opened, whatever the
+# TTL of the scan
+PURGE_AGE = 7 * 24 * 60 * 60
+
+# Tested outcomes are written in batches of this size
+FLUSH_SIZE = 500
+
+SCHEMA_VERSION = 3
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS outcomes (
+    account TEXT NOT NULL,
+    arn TEXT NOT NULL,
+    catalog TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    dry_run INTEGER NOT NULL,
+    service TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    region TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    detail TEXT NOT NULL,
+    result TEXT,
+    summary TEXT,
+    tested_at REAL NOT NULL,
+    PRIMARY KEY (account, arn, catalog, endpoint, dry_run, service, operation, region)
+)
+'''
+
+
+def get_default_cache_file():
+    if sys.platform == 'win32':
+        cache_dir = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~\\AppData\\Local')
+    elif sys.platform == 'darwin':
+        cache_dir = os.path.expanduser('~/Library/Caches')
+    else:
+        cache_dir = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+
+    return os.path.join(cache_dir, 'enumerate-iam', CACHE_FILENAME)
+
+
+def get_cached_result(result, detail, result_detail, summary=None):
+    """
+    :param summary: The summary of the response stored with a full result,
+                    the full result has no ResponseMetadata left to tell its
+                    size
+    :return: The result of a cached allowed operation at result_detail, from
+             a result stored at detail
+    """
+    if result_detail == PERMISSION:
+        return True
+
+    if result_detail == detail:
+        return result
+
+    # Only a full result can be summarized
+    return summary if summary is not None else summarize_response(result)
+
+
+class ResultCache:
+    def __init__(self, filename=None, mode=WRITE, ttl=DEFAULT_TTL):
+        # Imported here, the command line imports this module for its
+        # options before the scan starts
+        import sqlite3
+
+        self.filename = filename or get_default_cache_file()
+        self.mode = mode
+        self.ttl = ttl
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(self.filename)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        # The responses of allowed operations can be sensitive
+        if not os.path.exists(self.filename):
+            os.close(os.open(self.filename, os.O_CREAT | os.O_WRONLY, 0o600))
+
+        self.connection = sqlite3.connect(self.filename, timeout=30, check_same_thread=False)
+
+        with self.lock, self.connection:
+            # Other launches can use the cache at the same time
+            self.connection.execute('PRAGMA journal_mode=WAL')
+
+            if self.connection.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                self.connection.execute('DROP TABLE IF EXISTS outcomes')
+                self.connection.execute('PRAGMA user_version = %d' % SCHEMA_VERSION)
+
+            self.connection.execute(SCHEMA)
+            self.connection.execute('DELETE FROM outcomes WHERE tested_at < ?',
+                                    (time.time() - max(ttl, PURGE_AGE),))
+
+    @property
+    def reads(self):
+        return self.mode in (READ, WRITE)
+
+    @property
+    def writes(self):
+        return self.mode in (WRITE, REFRESH)
+
+    def open(self, identity, catalog_digest, endpoint_url=None, dry_run=False, result_detail=FULL):
+        """
+        :param identity: The response of sts get_caller_identity
+        :return: The IdentityCache of the principal
+        """
+        scope = (identity['Account'], identity['Arn'], catalog_digest, endpoint_url or '', int(dry_run))
+        return IdentityCache(self, scope, result_detail)
+
+    def load(self, scope, result_detail):
+        """
+        :return: The fresh entries of scope, as (service, operation, region)
+                 -> (outcome, result, summary), without the allowed operations
+                 whose result is less detailed than result_detail. summary is
+                 only set for full results
+        """
+        with self.lock:
+            rows = self.connection.execute('SELECT service, operation, region, outcome, detail, result, summary '
+                                           'FROM outcomes WHERE account = ? AND arn = ? AND catalog = ? '
+                                           'AND endpoint = ? AND dry_run = ? AND tested_at >= ?',
+                                           scope + (time.time() - self.ttl,)).fetchall()
+
+        entries = {}
+        rank = RESULT_DETAILS.index(result_detail)
+
+        for service_name, operation_name, region, outcome, detail, result, summary in rows:
+            if outcome == ALLOWED:
+                if detail not in RESULT_DETAILS or RESULT_DETAILS.index(detail) < rank:
+                    continue
+
+                summary = json.loads(summary) if summary is not None else None
+                result = get_cached_result(json.loads(result), detail, result_detail, summary)
+
+                if result_detail != FULL:
+                    summary = None
+
+            entries[(service_name, operation_name, region)] = outcome, result, summary
+
+        return entries
+
+    def store(self, rows):
+        try:
+            with self.lock, self.connection:
+                self.connection.executemany('INSERT OR REPLACE INTO outcomes '
+                                            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                            rows)
+        except Exception as e:
+            # e.g. the database stayed locked by another launch, the scan
+            # goes on without caching these outcomes
+            logging.getLogger().warning(f'⚠️  Could not write {len(rows)} outcomes to the result cache: {e}')
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+class IdentityCache:
+    """
+    The cached outcomes of one principal, used like a Checkpoint by the
+    bruteforce scan: the operations it finished are skipped, and the
+    outcome of every tested operation is recorded
+    """
+    def __init__(self, cache, scope, result_detail=FULL):
+        self.cache = cache
+        self.scope = scope
+        self.result_detail = result_detail
+        self.entries = cache.load(scope, result_detail) if cache.reads else {}
+        self.pending = []
+        self.lock = threading.Lock()
+
+    @property
+    def arn(self):
+        return self.scope[1]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def is_finished(self, service_name, operation_name, region):
+        return (service_name, operation_name, region) in self.entries
+
+    def get_allowed(self):
+        """
+        :return: The records of the cached allowed operations
+        """
+        records = []
+
+        for (service_name, operation_name, region), (outcome, result, summary) in self.entries.items():
+            if outcome != ALLOWED:
+                continue
+
+            record = {'key': '%s.%s' % (service_name, operation_name),
+                      'service': service_name,
+                      'operation': operation_name,
+                      'region': region,
+                      'outcome': outcome,
+                      'result': result}
+
+            if summary is not None:
+                record['summary'] = summary
+
+            records.append(record)
+
+        return records
+
+    def record(self, record):
+        if not self.cache.writes or record['outcome'] not in CACHED_OUTCOMES:
+            return
+
+        result = summary = None
+
+        if record['outcome'] == ALLOWED:
+            result = json.dumps(record['result'], default=json_encoder)
+
+            if 'summary' in record:
+                summary = json.dumps(record['summary'], default=json_encoder)
+
+        row = self.scope + (record['service'],
+                            record['operation'],
+                            record['region'],
+                            record['outcome'],
+                            self.result_detail,
+                            result,
+                            summary,
+                            time.time())
+
+        with self.lock:
+            self.pending.append(row)
+            if len(self.pending) < FLUSH_SIZE:
+                return
+
+            rows, self.pending = self.pending, []
+
+        self.cache.store(rows)
+
+    def flush(self):
+        with self.lock:
+            rows, self.pending = self.pending, []
+
+        if rows:
+            self.cache.store(rows)
@@ -0,0 +1,72 @@
+"""
+How much of the response of an allowed operation is kept
+
+Some allowed calls (ec2.describe_images, ssm.describe_parameters, s3 list
+calls, ...) return megabytes each, and keeping every response until the scan
+ends is what makes scans with admin-level credentials run out of memory.
+
+    * permission: only the fact that the operation is allowed
+    * summary: the size of the response and, for each top-level key, the
+      number of items (lists and dicts) or the length (strings)
+    * full: the whole response. When the results are streamed to a file the
+      response is only written there, the output keeps the summary.
+"""
+from enumerate_iam.utils.remove_metadata import remove_metadata
+
+PERMISSION = 'permission'
+SUMMARY = 'summary'
+FULL = 'full'
+
+RESULT_DETAILS = (PERMISSION, SUMMARY, FULL)
+
+
+def get_response_size(response):
+    """
+    :return: The Content-Length of the HTTP response, None if it is unknown
+    """
+    headers = response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+
+    try:
+        return int(headers['content-length'])
+    except (KeyError, TypeError, ValueError):
+        return
+
+
+def summarize_response(response):
+    """
+    :param response: The response of an allowed operation, with or without
+                     its ResponseMetadata
+    :return: A small dict describing the response
+    """
+    if not isinstance(response, dict):
+        return {}
+
+    summary = {}
+
+    size = get_response_size(response)
+    if size is not None:
+        summary['size'] = size
+
+    keys = {}
+
+    for key, value in response.items():
+        if key == 'ResponseMetadata':
+            continue
+
+        keys[key] = len(value) if isinstance(value, (list, dict, str, bytes)) else None
+
+    summary['keys'] = keys
+    return summary
+
+
+def get_result(response, result_detail=FULL):
+    """
+    :return: What is kept of the response of an allowed operation
+    """
+    if result_detail == PERMISSION:
+        return True
+
+    if result_detail == SUMMARY:
+        return summarize_response(response)
+
+    return remove_metadata(response)
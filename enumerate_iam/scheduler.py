@@ -0,0 +1,200 @@
+"""
+Deadline-aware scheduling of the bruteforce operations
+
+Temporary credentials often expire before all the operations are tested.
+When a deadline is known (the Expiration of the credentials or a time budget)
+the operations are sorted by expected value instead of being shuffled:
+
+    * High-signal services, where an allowed permission usually matters the
+      most during an assessment, are tested first.
+
+    * Cheap calls to global services are tested early, they answer quickly
+      and don't depend on the region.
+
+    * Legacy and niche services, where permissions are rarely granted, are
+      tested last.
+
+Services with the same priority are interleaved, so the scan does not send a
+burst of calls to a single service. Operations which could not be sent before
+the deadline are reported as skipped.
+"""
+import time
+import random
+import logging
+import threading
+
+# Safety margin between the last dispatched operation and the expiration of
+# the credentials. A time budget is the user's own limit, it has no margin
+EXPIRATION_MARGIN = 30
+
+HIGH_VALUE_SERVICES = {
+    'iam', 'sts', 's3', 'ec2', 'lambda', 'secretsmanager', 'kms', 'ssm',
+    'organizations', 'sso-admin', 'dynamodb', 'rds', 'ecr', 'ecs', 'eks',
+    'cloudformation', 'cloudtrail', 'logs', 'sns', 'sqs', 'apigateway',
+    'codecommit', 'codebuild', 'codepipeline', 'glue', 'athena', 'redshift',
+    'elasticbeanstalk', 'stepfunctions', 'backup', 'guardduty', 'securityhub',
+    'accessanalyzer', 'config', 'route53', 'cloudfront', 'account',
+}
+
+GLOBAL_SERVICES = {
+    'iam', 'sts', 'organizations', 'route53', 'route53domains', 'cloudfront',
+    'account', 'waf', 'shield', 'globalaccelerator', 'networkmanager',
+    'budgets', 'ce', 'cur', 'health', 'pricing', 'support', 'trustedadvisor',
+}
+
+RARELY_ALLOWED_SERVICES = {
+    'importexport', 'sdb', 'workdocs', 'datapipeline', 'cloudsearch',
+    'machinelearning', 'mturk', 'iotthingsgraph', 'codestar-connections',
+    'lookoutequipment', 'groundstation', 'finspace', 'finspace-data',
+}
+
+OPERATION_PREFIX_RANK = ('list_', 'describe_', 'get_')
+
+
+def get_service_priority(service_name):
+    """
+    :return: A number, lower values are tested first
+    """
+    high_value = service_name in HIGH_VALUE_SERVICES
+    is_global = service_name in GLOBAL_SERVICES
+
+    if high_value and is_global:
+        return 0
+    if high_value:
+        return 1
+    if is_global:
+        return 2
+    if service_name in RARELY_ALLOWED_SERVICES:
+        return 4
+    return 3
+
+
+def get_operation_rank(operation_name):
+    for rank, prefix in enumerate(OPERATION_PREFIX_RANK):
+        if operation_name.startswith(prefix):
+            return rank
+
+    return len(OPERATION_PREFIX_RANK)
+
+
+def prioritize(catalog, dry_run=False):
+    """
+    :return: A list of (service_name, operation_name) tuples sorted by
+             expected value, interleaving services with the same priority.
+    """
+    keyed = []
+
+    for service_name in catalog:
+        operations = catalog.get_operations(service_name, dry_run=dry_run)
+        service_priority = get_service_priority(service_name)
+        tie_breaker = random.random()
+
+        ranked = sorted(operations, key=get_operation_rank)
+
+        for index, operation_name in enumerate(ranked):
+            keyed.append(((service_priority, index, tie_breaker), service_name, operation_name))
+
+    keyed.sort(key=lambda item: item[0])
+
+    return [(service_name, operation_name) for _, service_name, operation_name in keyed]
+
+
+def get_deadline(expiration=None, time_budget=None, now=None):
+    """
+    :param expiration: When the credentials expire, a time.time() timestamp
+    :param time_budget: Seconds the scan may take from now
+    :return: The earliest of the two as a time.time() timestamp, None when
+             neither is set
+    """
+    now = time.time() if now is None else now
+    deadlines = []
+
+    if expiration is not None:
+        deadlines.append(expiration - EXPIRATION_MARGIN)
+    if time_budget:
+        deadlines.append(now + time_budget)
+
+    return min(deadlines) if deadlines else None
+
+
+class DeadlineScheduler:
+    """
+    Tracks the time left before the deadline (a time.time() timestamp) and
+    the observed throughput, to decide whether an operation can still be
+    dispatched and to estimate if the remaining work fits.
+    """
+    def __init__(self, deadline):
+        self.deadline = deadline
+
+        self.total = 0
+        self.completed = 0
+        self.skipped = {}
+        self.start = time.monotonic()
+        self.lock = threading.Lock()
+
+    def set_total(self, total):
+        self.total = total
+
+    def get_time_left(self):
+        return self.deadline - time.time()
+
+    def is_expired(self):
+        return self.get_time_left() <= 0
+
+    def record_completed(self):
+        with self.lock:
+            self.completed += 1
+
+    def record_skipped(self, service_name, operation_name):
+        with self.lock:
+            self.skipped.setdefault(service_name, []).append(operation_name)
+
+    def get_skipped_count(self):
+        with self.lock:
+            return sum(len(operations) for operations in self.skipped.values())
+
+    def estimate(self):
+        """
+        :return: A (remaining operations, seconds needed, seconds left) tuple,
+                 seconds needed is None until the throughput is known
+        """
+        with self.lock:
+            completed = self.completed
+
+        remaining = max(self.total - completed, 0)
+        elapsed = time.monotonic() - self.start
+
+        if not completed or not elapsed:
+            return remaining, None, self.get_time_left()
+
+        rate = completed / elapsed
+        return remaining, remaining / rate, self.get_time_left()
+
+    def report_estimate(self):
+        logger = logging.getLogger()
+
+        remaining, needed, time_left = self.estimate()
+
+        if needed is None:
+            logger.info(f'⏰ {remaining} operations to test, {int(time_left)}s left before the deadline')
+        elif needed > time_left:
+            logger.warning(f'⏰ {remaining} operations left need ~{int(needed)}s but only {int(max(time_left, 0))}s '
+                           f'are left, the lowest priority operations will be skipped')
+        else:
+            logger.info(f'⏰ {remaining} operations left need ~{int(needed)}s, {int(time_left)}s left')
+
+    def report_skipped(self):
+        logger = logging.getLogger()
+
+        with self.lock:
+            skipped = dict(self.skipped)
+
+        if not skipped:
+            return
+
+        count = sum(len(operations) for operations in skipped.values())
+        services = sorted(skipped, key=lambda service_name: -len(skipped[service_name]))
+
+        logger.warning(f'⏰ Deadline reached: skipped {count} operations across {len(skipped)} services')
+        logger.warning(f'   Skipped services: {", ".join(services[:20])}'
+                       f'{" ..." if len(services) > 20 else ""}')
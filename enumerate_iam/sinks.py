@@ -0,0 +1,46 @@
+"""
+Result sinks for the bruteforce scan
+
+Results are handed to the sink as soon as each operation completes, instead
+of when the whole scan finishes. A sink only needs to implement write() and,
+if it holds resources, close().
+"""
+import json
+import threading
+
+from enumerate_iam.utils.json_utils import json_encoder
+
+
+class ResultSink:
+    def write(self, record):
+        """
+        :param record: A dict with the key, service, operation, region and
+                       result of one allowed operation
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class JSONLSink(ResultSink):
+    """
+    Write one JSON object per line and flush after every record, so a scan
+    which is interrupted (or still running) leaves a readable file behind.
+    """
+    def __init__(self, filename, append=False):
+        self.filename = filename
+        self.file = open(filename, 'a' if append else 'w', encoding='utf-8')
+        self.lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record, default=json_encoder)
+
+        with self.lock:
+            self.file.write(line + '\n')
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
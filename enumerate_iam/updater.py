@@ -0,0 +1,150 @@
+"""
+Background update check
+
+enumerate-iam.py used to run `git pull origin master` before every scan, so
+every launch paid a network round trip and offline runners waited for the
+whole timeout. The pull now runs at most once per interval, in a daemon
+thread which never delays the scan, and its result is kept in a state file
+next to the code:
+
+    {"checked_at": ..., "finished_at": ..., "result": "updated",
+     "output": "<git pull output>", "reported": false}
+
+The pulled code is loaded from the next launch on, which reports the result
+of the pull once.
+"""
+import os
+import json
+import time
+import threading
+
+STATE_FILENAME = '.update-check.json'
+
+DEFAULT_UPDATE_INTERVAL = 24 * 60 * 60
+GIT_PULL_TIMEOUT = 60
+
+# A launch which exits before its pull finishes leaves the state at RUNNING,
+# after this many seconds the check is due again
+RUNNING_TIMEOUT = GIT_PULL_TIMEOUT * 2
+
+RUNNING = 'running'
+UP_TO_DATE = 'up-to-date'
+UPDATED = 'updated'
+FAILED = 'failed'
+
+
+def get_state_file(repo_dir):
+    return os.path.join(repo_dir, STATE_FILENAME)
+
+
+def load_state(filename):
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    return state if isinstance(state, dict) else {}
+
+
+def save_state(filename, state):
+    temp_filename = filename + '.tmp'
+
+    try:
+        with open(temp_filename, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+
+        os.replace(temp_filename, filename)
+    except OSError:
+        # Read-only checkout, the check runs again on the next launch
+        pass
+
+
+def is_due(state, interval, now=None):
+    now = time.time() if now is None else now
+    checked_at = state.get('checked_at')
+
+    if state.get('result') == RUNNING:
+        interval = min(interval, RUNNING_TIMEOUT)
+
+    # A checked_at in the future means the clock was changed
+    return not isinstance(checked_at, (int, float)) or not 0 <= now - checked_at < interval
+
+
+def git_pull(repo_dir, timeout=GIT_PULL_TIMEOUT):
+    """
+    :return: The result (UP_TO_DATE, UPDATED or FAILED) and the output of
+             git pull
+    """
+    # Imported by the update check thread, not by every launch
+    import subprocess
+
+    try:
+        process = subprocess.run(['git', 'pull', 'origin', 'master'],
+                                 cwd=repo_dir,
+                                 capture_output=True,
+                                 text=True,
+                                 timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return FAILED, f'git pull timed out after {timeout}s'
+    except OSError as e:
+        return FAILED, f'{type(e).__name__}: {e}'
+
+    if process.returncode != 0:
+        return FAILED, process.stderr.strip()
+
+    output = process.stdout.strip()
+
+    if 'Already up to date' in output or 'Already up-to-date' in output:
+        return UP_TO_DATE, output
+
+    return UPDATED, output
+
+
+def pop_update_notice(repo_dir):
+    """
+    :return: The state of the last finished check if it updated the code or
+             failed and wasn't reported yet, None otherwise. It is reported
+             only once.
+    """
+    filename = get_state_file(repo_dir)
+    state = load_state(filename)
+
+    if state.get('result') not in (UPDATED, FAILED) or state.get('reported', True):
+        return
+
+    save_state(filename, dict(state, reported=True))
+    return state
+
+
+def start_update_check(repo_dir, interval=DEFAULT_UPDATE_INTERVAL):
+    """
+    Run git pull in a daemon thread if the last check is older than interval
+    seconds
+
+    :return: The thread, None when no check is due
+    """
+    filename = get_state_file(repo_dir)
+
+    if not is_due(load_state(filename), interval):
+        return
+
+    checked_at = time.time()
+
+    # Written before the pull starts, so the launches which start while it
+    # runs don't start another one
+    save_state(filename, {'checked_at': checked_at, 'result': RUNNING})
+
+    def run():
+        result, output = git_pull(repo_dir)
+
+        save_state(filename, {'checked_at': checked_at,
+                              'finished_at': time.time(),
+                              'result': result,
+                              'output': output,
+                              'reported': result == UP_TO_DATE})
+
+    thread = threading.Thread(target=run, name='update-check', daemon=True)
+    thread.start()
+
+    return thread
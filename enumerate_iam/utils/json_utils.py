@@ -17,11 +17,8 @@ def json_encoder(o):
     if type(o) is datetime.date or type(o) is datetime.datetime:
         return o.isoformat()
 
-    if isinstance(o, unicode):
-        return o.encode('utf-8', errors='ignore')
-
-    if isinstance(o, str):
-        return o.encode('utf-8', errors='ignore')
+    if isinstance(o, bytes):
+        return o.decode('utf-8', errors='ignore')
 
 
 def smart_str(s, encoding=DEFAULT_ENCODING, errors='ignore'):
@@ -0,0 +1,41 @@
+import time
+import threading
+
+from contextlib import contextmanager
+
+
+class Timings:
+    """
+    Thread-safe accumulator of named wall-clock durations, used to compare
+    how long the scan spends on setup work (e.g. client construction) with
+    the scan itself.
+    """
+    def __init__(self):
+        self.totals = {}
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        with self.lock:
+            self.totals[name] = self.totals.get(name, 0.0) + seconds
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def get(self, name):
+        """
+        :return: A tuple with the total seconds and number of measurements
+        """
+        with self.lock:
+            return self.totals.get(name, 0.0), self.counts.get(name, 0)
+
+    def reset(self):
+        with self.lock:
+            self.totals.clear()
+            self.counts.clear()
@@ -1,6 +1,6 @@
 """
 Service database checker for enumerate-iam
-Checks GitHub for updates to bruteforce_tests.py and auto-downloads if needed
+Checks GitHub for updates to the operation catalog (catalog.jsonl) and auto-downloads if needed
 """
 import logging
 import requests
@@ -9,11 +9,12 @@ import tempfile
 import shutil
 
 from enumerate_iam.__version__ import __repo_url__
+from enumerate_iam.catalog import CATALOG_FILE, CatalogError, get_catalog, parse_catalog_services
 
 
 def check_and_update_services(timeout=5):
     """
-    Check GitHub for updates to bruteforce_tests.py and download if more services available
+    Check GitHub for updates to catalog.jsonl and download if more services available
     
     Args:
         timeout: HTTP request timeout in seconds
@@ -36,16 +37,15 @@ def check_and_update_services(timeout=5):
     }
     
     try:
-        # Get current service count
-        from enumerate_iam.bruteforce_tests import BRUTEFORCE_TESTS
-        current_services = set(BRUTEFORCE_TESTS.keys())
+        # Get current service count, only the catalog header is read
+        current_services = set(get_catalog().keys())
         result['current_services'] = len(current_services)
         
         # Extract repo path
         repo_path = __repo_url__.replace('https://github.com/', '').strip('/')
         
-        # GitHub raw content URL for bruteforce_tests.py
-        raw_url = f"https://raw.githubusercontent.com/{repo_path}/master/enumerate_iam/bruteforce_tests.py"
+        # GitHub raw content URL for catalog.jsonl
+        raw_url = f"https://raw.githubusercontent.com/{repo_path}/master/enumerate_iam/catalog.jsonl"
         
         logger.debug(f"Checking for service updates at {raw_url}")
         
@@ -53,7 +53,7 @@ def check_and_update_services(timeout=5):
         response = requests.get(raw_url, timeout=timeout)
         response.raise_for_status()
         
-        github_content = response.text
+        github_content = response.content
         
         # Parse the GitHub version to count services
         github_services = parse_services_from_content(github_content)
@@ -109,7 +109,7 @@ def check_and_update_services(timeout=5):
 
 def check_services_status(timeout=5):
     """
-    Check GitHub for updates to bruteforce_tests.py (check-only; no download)
+    Check GitHub for updates to catalog.jsonl (check-only; no download)
 
     Args:
         timeout: HTTP request timeout in seconds
@@ -132,16 +132,15 @@ def check_services_status(timeout=5):
     }
 
     try:
-        from enumerate_iam.bruteforce_tests import BRUTEFORCE_TESTS
-        local_services = set(BRUTEFORCE_TESTS.keys())
+        local_services = set(get_catalog().keys())
         status['current_services'] = len(local_services)
 
         repo_path = __repo_url__.replace('https://github.com/', '').strip('/')
-        raw_url = f"https://raw.githubusercontent.com/{repo_path}/master/enumerate_iam/bruteforce_tests.py"
+        raw_url = f"https://raw.githubusercontent.com/{repo_path}/master/enumerate_iam/catalog.jsonl"
 
         response = requests.get(raw_url, timeout=timeout)
         response.raise_for_status()
-        github_content = response.text
+        github_content = response.content
         github_services = parse_services_from_content(github_content)
         status['github_services'] = len(github_services)
 
@@ -162,65 +161,49 @@ def check_services_status(timeout=5):
 
 def parse_services_from_content(content):
     """
-    Parse service names from bruteforce_tests.py content
+    Parse service names from catalog.jsonl content
     
     Args:
-        content: File content as string
+        content: File content as bytes or string
         
     Returns:
         set: Set of service names
     """
-    services = set()
-    
-    # Simple parser - look for lines like:    "service-name": [
-    import re
-    pattern = r'^\s*"([^"]+)":\s*\['
-    
-    for line in content.split('\n'):
-        match = re.match(pattern, line)
-        if match:
-            service_name = match.group(1)
-            # Exclude the dict name itself
-            if service_name != 'BRUTEFORCE_TESTS':
-                services.add(service_name)
-    
-    return services
+    return parse_catalog_services(content)
 
 
 def download_and_replace_bruteforce(content):
     """
-    Replace the local bruteforce_tests.py with new content
+    Replace the local catalog.jsonl with new content
     
     Args:
-        content: New file content
+        content: New file content (bytes)
         
     Returns:
         bool: True if successful
     """
     try:
-        # Get the path to bruteforce_tests.py
-        import enumerate_iam.bruteforce_tests as bf_module
-        bf_path = bf_module.__file__
-        
+        # Verify it's a valid catalog before touching the local one
+        try:
+            parse_catalog_services(content)
+        except CatalogError:
+            return False
+
         # Create backup
-        backup_path = bf_path + '.backup'
-        shutil.copy2(bf_path, backup_path)
+        backup_path = CATALOG_FILE + '.backup'
+        shutil.copy2(CATALOG_FILE, backup_path)
         
-        # Write new content
-        with open(bf_path, 'w', encoding='utf-8') as f:
+        # Write new content next to the catalog and rename it, the running
+        # process keeps its memory-mapped copy of the old file
+        temp_path = CATALOG_FILE + '.tmp'
+        with open(temp_path, 'wb') as f:
             f.write(content)
-        
-        # Verify it's valid Python
-        try:
-            compile(content, bf_path, 'exec')
-            return True
-        except SyntaxError:
-            # Restore backup if invalid
-            shutil.copy2(backup_path, bf_path)
-            return False
+
+        os.replace(temp_path, CATALOG_FILE)
+        return True
         
     except Exception as e:
-        logging.getLogger().debug(f"Could not replace bruteforce_tests.py: {e}")
+        logging.getLogger().debug(f"Could not replace catalog.jsonl: {e}")
         return False
 
 
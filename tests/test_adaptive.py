@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import unittest
+
+import botocore.exceptions
+
+from enumerate_iam.adaptive import AdaptiveController, get_retry_delay, is_throttling_error
+
+
+def make_client_error(code, status_code=400):
+    return botocore.exceptions.ClientError({'Error': {'Code': code, 'Message': code},
+                                            'ResponseMetadata': {'HTTPStatusCode': status_code}},
+                                           'TestOperation')
+
+
+class ThrottlingErrorTest(unittest.TestCase):
+    def test_throttling_errors(self):
+        self.assertTrue(is_throttling_error(make_client_error('Throttling')))
+        self.assertTrue(is_throttling_error(make_client_error('RequestLimitExceeded')))
+        self.assertTrue(is_throttling_error(make_client_error('SomethingElse', status_code=429)))
+        self.assertFalse(is_throttling_error(make_client_error('AccessDenied')))
+        self.assertFalse(is_throttling_error(ValueError('Throttling')))
+
+    def test_quota_and_conflict_errors(self):
+        self.assertFalse(is_throttling_error(make_client_error('LimitExceededException')))
+        self.assertFalse(is_throttling_error(make_client_error('TransactionInProgressException')))
+        self.assertTrue(is_throttling_error(make_client_error('LimitExceededException', status_code=429)))
+
+    def test_retry_delay(self):
+        for attempt in range(10):
+            self.assertTrue(0 <= get_retry_delay(attempt) <= 20.0)
+
+
+class AdaptiveControllerTest(unittest.TestCase):
+    def test_concurrency_limit(self):
+        controller = AdaptiveController(2)
+        state = {'in_flight': 0, 'peak': 0}
+
+        async def request():
+            await controller.enter_async()
+
+            try:
+                state['in_flight'] += 1
+                state['peak'] = max(state['peak'], state['in_flight'])
+                await asyncio.sleep(0.01)
+                state['in_flight'] -= 1
+            finally:
+                controller.exit()
+
+        async def run():
+            await asyncio.wait_for(asyncio.gather(*[request() for _ in range(10)]), timeout=5)
+
+        asyncio.run(run())
+
+        self.assertEqual(state['peak'], 2)
+        self.assertEqual(controller.in_flight, 0)
+
+    def test_exit_from_another_thread(self):
+        controller = AdaptiveController(1)
+        controller.enter()
+
+        async def run():
+            asyncio.get_running_loop().call_later(0.05, lambda: threading.Thread(target=controller.exit).start())
+            await asyncio.wait_for(controller.enter_async(), timeout=5)
+
+        asyncio.run(run())
+
+        self.assertEqual(controller.in_flight, 1)
+
+    def test_growing_concurrency_wakes_up_waiters(self):
+        controller = AdaptiveController(2)
+        controller.concurrency = 1.0
+        controller.enter()
+
+        async def run():
+            asyncio.get_running_loop().call_later(0.05, controller.on_success)
+            await asyncio.wait_for(controller.enter_async(), timeout=5)
+
+        asyncio.run(run())
+
+        self.assertEqual(controller.in_flight, 2)
+
+    def test_cancelled_waiter(self):
+        controller = AdaptiveController(1)
+        controller.enter()
+
+        async def run():
+            cancelled = asyncio.ensure_future(controller.enter_async())
+            waiting = asyncio.ensure_future(controller.enter_async())
+            await asyncio.sleep(0.01)
+
+            controller.exit()
+            cancelled.cancel()
+
+            await asyncio.wait_for(waiting, timeout=5)
+
+        asyncio.run(run())
+
+        self.assertEqual(controller.in_flight, 1)
+        self.assertEqual(controller.async_waiters, [])
+
+    def test_throttle_decreases_concurrency(self):
+        controller = AdaptiveController(10)
+
+        with self.assertLogs(level='INFO'):
+            controller.on_throttle('ec2', 'describe_vpcs')
+
+        self.assertEqual(int(controller.concurrency), 5)
+        self.assertIsNotNone(controller.rate_limiter)
+
+
+if __name__ == '__main__':
+    unittest.main()
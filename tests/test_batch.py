@@ -0,0 +1,89 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from enumerate_iam.batch import load_credential_file, load_credential_sets, parse_credentials, parse_expiration
+
+REQUEST_FILE = '''HTTP/1.1 200 OK
+Content-Type: application/json
+
+{"IdentityId": "us-east-1:1234", "Credentials": {"AccessKeyId": "ASIAREQUEST", "SecretKey": "secret",
+ "SessionToken": "token", "Expiration": "2030-01-01T00:00:00Z"}}
+'''
+
+
+class BatchCredentialsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, content):
+        filename = os.path.join(self.directory, name)
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+        return filename
+
+    def test_request_file(self):
+        credential_sets = load_credential_file(self.write('request.txt', REQUEST_FILE))
+
+        self.assertEqual(credential_sets, [{'access_key': 'ASIAREQUEST',
+                                            'secret_key': 'secret',
+                                            'session_token': 'token',
+                                            'expiration': parse_expiration('2030-01-01T00:00:00Z')}])
+
+    def test_json_list(self):
+        content = json.dumps([{'AccessKeyId': 'AKIAONE', 'SecretAccessKey': 'one'},
+                              {'AccessKeyId': 'AKIATWO', 'SecretAccessKey': 'two', 'SessionToken': 'token'},
+                              {'AccessKeyId': 'AKIANOSECRET'}])
+
+        credential_sets = load_credential_file(self.write('keys.json', content))
+
+        self.assertEqual([credentials['access_key'] for credentials in credential_sets], ['AKIAONE', 'AKIATWO'])
+        self.assertIsNone(credential_sets[0]['session_token'])
+        self.assertEqual(credential_sets[1]['session_token'], 'token')
+
+    def test_json_lines(self):
+        content = '\n'.join([json.dumps({'AccessKeyId': 'AKIAONE', 'SecretAccessKey': 'one'}),
+                             '',
+                             json.dumps({'Credentials': {'AccessKeyId': 'AKIATWO', 'SecretKey': 'two'}})])
+
+        credential_sets = load_credential_file(self.write('keys.jsonl', content))
+
+        self.assertEqual([credentials['access_key'] for credentials in credential_sets], ['AKIAONE', 'AKIATWO'])
+
+    def test_directory(self):
+        self.write('a.json', json.dumps({'AccessKeyId': 'AKIAONE', 'SecretAccessKey': 'one'}))
+        self.write('b.txt', REQUEST_FILE)
+        self.write('c.json', json.dumps({'AccessKeyId': 'AKIAONE', 'SecretAccessKey': 'duplicate'}))
+        self.write('d.txt', 'no credentials here')
+        self.write('e.json', '{"AccessKeyId": ')
+        self.write('.hidden', json.dumps({'AccessKeyId': 'AKIAHIDDEN', 'SecretAccessKey': 'hidden'}))
+        os.makedirs(os.path.join(self.directory, 'subdirectory'))
+
+        credential_sets = load_credential_sets(self.directory)
+
+        self.assertEqual([credentials['access_key'] for credentials in credential_sets], ['AKIAONE', 'ASIAREQUEST'])
+        self.assertEqual(credential_sets[0]['secret_key'], 'one')
+
+    def test_single_file(self):
+        filename = self.write('request.txt', REQUEST_FILE)
+
+        self.assertEqual([credentials['access_key'] for credentials in load_credential_sets(filename)],
+                         ['ASIAREQUEST'])
+
+    def test_expiration(self):
+        self.assertEqual(parse_expiration(1700000000), 1700000000.0)
+        self.assertEqual(parse_expiration('2030-01-01T00:00:00+00:00'), parse_expiration('2030-01-01T00:00:00Z'))
+        self.assertIsNone(parse_expiration('tomorrow'))
+        self.assertIsNone(parse_credentials({'AccessKeyId': 'AKIA', 'SecretKey': 's'})['expiration'])
+        self.assertIsNone(parse_credentials(['AKIA', 's']))
+
+
+if __name__ == '__main__':
+    unittest.main()
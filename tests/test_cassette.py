@@ -0,0 +1,137 @@
+import os
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import botocore.exceptions
+import botocore.session
+
+from botocore.config import Config
+
+from enumerate_iam.cassette import REDACTED, CassettePlayer, CassetteRecorder
+
+ACCESS_KEY = 'AKIACASSETTETEST'
+
+CALLER_IDENTITY = ('<GetCallerIdentityResponse xmlns="https://sts.amazonaws.com/doc/2011-06-15/">'
+                   '<GetCallerIdentityResult><Arn>arn:aws:iam::123456789012:user/test</Arn>'
+                   '<UserId>%s</UserId><Account>123456789012</Account>'
+                   '<SecretAccessKey>leaked</SecretAccessKey></GetCallerIdentityResult>'
+                   '<ResponseMetadata><RequestId>0</RequestId></ResponseMetadata>'
+                   '</GetCallerIdentityResponse>' % ACCESS_KEY)
+
+
+class STSHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        body = CALLER_IDENTITY.encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('x-amzn-RequestId', '0')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_client(cassette, endpoint_url, service_name='sts'):
+    session = botocore.session.get_session()
+    cassette.register(session.get_component('event_emitter'))
+
+    return session.create_client(service_name,
+                                 region_name='us-east-1',
+                                 endpoint_url=endpoint_url,
+                                 aws_access_key_id=ACCESS_KEY,
+                                 aws_secret_access_key='secret',
+                                 config=Config(retries={'total_max_attempts': 1}))
+
+
+class CassetteTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+        self.server = HTTPServer(('127.0.0.1', 0), STSHandler)
+        self.endpoint_url = 'http://127.0.0.1:%d' % self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def record(self, filename):
+        recorder = CassetteRecorder(filename)
+        make_client(recorder, self.endpoint_url).get_caller_identity()
+        recorder.close()
+
+        return recorder
+
+    def test_record(self):
+        filename = os.path.join(self.directory, 'scan.cassette')
+        recorder = self.record(filename)
+
+        with open(filename, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+
+        self.assertEqual(recorder.recorded, 1)
+        self.assertEqual(len(records), 1)
+
+        record = records[0]
+        self.assertEqual((record['service'], record['operation'], record['region']),
+                         ('sts', 'GetCallerIdentity', 'us-east-1'))
+        self.assertEqual(record['status'], 200)
+        self.assertNotIn('x-amzn-requestid', record['headers'])
+
+        # The access key and the secrets in the body are redacted
+        self.assertNotIn(ACCESS_KEY, record['body'])
+        self.assertNotIn('leaked', record['body'])
+        self.assertIn('<SecretAccessKey>%s</SecretAccessKey>' % REDACTED, record['body'])
+
+    def test_replay(self):
+        filename = os.path.join(self.directory, 'scan.cassette.gz')
+        self.record(filename)
+
+        # Nothing listens on the replay endpoint, every response comes from
+        # the cassette
+        self.server.shutdown()
+        self.server.server_close()
+
+        player = CassettePlayer(filename)
+        client = make_client(player, self.endpoint_url)
+
+        for _ in range(3):
+            response = client.get_caller_identity()
+            self.assertEqual(response['Account'], '123456789012')
+            self.assertEqual(response['UserId'], REDACTED)
+
+        self.assertEqual(player.served, 3)
+
+        # Operations which are not in the cassette fail like an unreachable
+        # endpoint
+        with self.assertRaises(botocore.exceptions.EndpointConnectionError):
+            make_client(player, self.endpoint_url, service_name='iam').list_users()
+
+        self.assertEqual(player.missing, {('iam', 'ListUsers', 'us-east-1')})
+
+    def test_replay_throttling(self):
+        filename = os.path.join(self.directory, 'scan.cassette')
+        self.record(filename)
+
+        player = CassettePlayer(filename, throttle_rate=1.0)
+
+        with self.assertRaises(botocore.exceptions.ClientError) as context:
+            make_client(player, self.endpoint_url).get_caller_identity()
+
+        self.assertEqual(context.exception.response['Error']['Code'], 'Throttling')
+        self.assertEqual(player.throttled, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
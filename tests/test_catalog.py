@@ -0,0 +1,116 @@
+import os
+import hashlib
+import shutil
+import tempfile
+import unittest
+
+from enumerate_iam.catalog import (CatalogError, OperationCatalog, get_catalog, parse_catalog_services,
+                                   serialize_catalog, write_catalog)
+
+SERVICES = {'ec2': ['describe_instances', 'describe_volumes', 'describe_instance_attribute'],
+            'elb': ['describe_load_balancers'],
+            's3': ['list_buckets']}
+
+METADATA = {'ec2': {'describe_instances': {'paginated': True, 'dry_run': True},
+                    'describe_instance_attribute': {'required': ['InstanceId', 'Attribute'],
+                                                    'dry_run': True,
+                                                    'dry_run_params': {'InstanceId': 'i-00000000',
+                                                                       'Attribute': 'kernel'}}},
+            's3': {'list_buckets': {'global': True},
+                   'not_in_the_catalog': {'global': True}}}
+
+
+class CatalogTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'catalog.jsonl')
+        self.catalogs = []
+
+    def tearDown(self):
+        for catalog in self.catalogs:
+            catalog.close()
+
+        shutil.rmtree(self.directory)
+
+    def open(self, filename=None):
+        catalog = OperationCatalog(filename or self.filename)
+        self.catalogs.append(catalog)
+        return catalog
+
+    def test_round_trip(self):
+        write_catalog(SERVICES, self.filename, metadata=METADATA, endpoint_prefixes={'elb': 'elasticloadbalancing'})
+        catalog = self.open()
+
+        self.assertEqual(len(catalog), 3)
+        self.assertEqual(sorted(catalog), ['ec2', 'elb', 's3'])
+        self.assertIn('ec2', catalog)
+        self.assertNotIn('iam', catalog)
+
+        # Operations with required parameters are only tested by a DryRun
+        # probe scan, with their placeholder parameters
+        self.assertEqual(catalog['ec2'], ['describe_instances', 'describe_volumes'])
+        self.assertEqual(catalog.get_operations('ec2', dry_run=True),
+                         ['describe_instance_attribute', 'describe_instances', 'describe_volumes'])
+        self.assertEqual(catalog.get_candidates('ec2'), sorted(SERVICES['ec2']))
+
+        self.assertEqual(catalog.candidate_count, 5)
+        self.assertEqual(catalog.operation_count, 4)
+        self.assertEqual(catalog.get_operation_count(dry_run=True), 5)
+
+        self.assertEqual(catalog.get_endpoint_prefix('elb'), 'elasticloadbalancing')
+        self.assertEqual(catalog.get_endpoint_prefix('ec2'), 'ec2')
+        self.assertEqual(catalog.get_endpoint_prefix('unknown'), 'unknown')
+
+        self.assertEqual(catalog.get_metadata('ec2', 'describe_instances'), {'paginated': True, 'dry_run': True})
+        self.assertEqual(catalog.get_metadata('s3', 'list_buckets'), {'global': True})
+        self.assertEqual(catalog.get_metadata('ec2', 'describe_volumes'), {})
+
+        # Metadata of operations which are not in the catalog is dropped
+        self.assertNotIn('not_in_the_catalog', catalog.to_metadata()['s3'])
+
+        with self.assertRaises(KeyError):
+            catalog.get_operations('iam')
+
+    def test_rewrite_from_catalog(self):
+        write_catalog(SERVICES, self.filename, metadata=METADATA)
+        catalog = self.open()
+
+        services = {service_name: catalog.get_candidates(service_name) for service_name in catalog}
+        copy = os.path.join(self.directory, 'copy.jsonl')
+        write_catalog(services, copy, metadata=catalog.to_metadata())
+
+        self.assertEqual(self.open(copy).digest, catalog.digest)
+
+    def test_digest(self):
+        content = serialize_catalog(SERVICES, metadata=METADATA)
+        write_catalog(SERVICES, self.filename, metadata=METADATA)
+
+        self.assertEqual(self.open().digest, hashlib.sha256(content).hexdigest())
+        self.assertNotEqual(serialize_catalog(SERVICES), content)
+        self.assertEqual(serialize_catalog(SERVICES, metadata=METADATA), content)
+
+    def test_parse_catalog_services(self):
+        content = serialize_catalog(SERVICES)
+
+        self.assertEqual(parse_catalog_services(content), set(SERVICES))
+        self.assertEqual(parse_catalog_services(content.decode('utf-8')), set(SERVICES))
+
+    def test_invalid_catalog(self):
+        with open(self.filename, 'wb') as f:
+            f.write(b'{"format": 99, "index": {}}\n')
+
+        with self.assertRaises(CatalogError):
+            self.open()
+
+        with self.assertRaises(CatalogError):
+            parse_catalog_services('not json')
+
+    def test_package_catalog(self):
+        catalog = get_catalog()
+
+        self.assertIs(catalog, get_catalog())
+        self.assertEqual(sum(len(catalog[service_name]) for service_name in catalog), catalog.operation_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
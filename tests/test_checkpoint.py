@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from enumerate_iam.checkpoint import Checkpoint
+from enumerate_iam.outcomes import ALLOWED, DENIED, ENDPOINT_FAILED, THROTTLED, make_record
+
+
+class CheckpointTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'scan.checkpoint')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, records):
+        checkpoint = Checkpoint(self.filename)
+
+        for record in records:
+            checkpoint.record(record)
+
+        checkpoint.close()
+
+    def resume(self):
+        checkpoint = Checkpoint(self.filename, resume=True)
+        self.addCleanup(checkpoint.close)
+        return checkpoint
+
+    def test_round_trip(self):
+        allowed = make_record('s3', 'list_buckets', 'us-east-1', ALLOWED, {'Buckets': [{'Name': 'a'}]})
+
+        self.write([allowed,
+                    make_record('ec2', 'describe_vpcs', 'eu-west-1', DENIED),
+                    make_record('sqs', 'list_queues', 'us-east-1', THROTTLED),
+                    make_record('omics', 'list_runs', 'us-east-1', ENDPOINT_FAILED)])
+
+        checkpoint = self.resume()
+
+        self.assertTrue(checkpoint.is_finished('s3', 'list_buckets', 'us-east-1'))
+        self.assertTrue(checkpoint.is_finished('ec2', 'describe_vpcs', 'eu-west-1'))
+        self.assertFalse(checkpoint.is_finished('ec2', 'describe_vpcs', 'us-east-1'))
+        self.assertFalse(checkpoint.is_finished('sqs', 'list_queues', 'us-east-1'))
+        self.assertFalse(checkpoint.is_finished('omics', 'list_runs', 'us-east-1'))
+        self.assertEqual(checkpoint.get_allowed(), [allowed])
+        self.assertEqual(checkpoint.get_allowed('eu-west-1'), [])
+
+    def test_resume_appends(self):
+        self.write([make_record('ec2', 'describe_vpcs', 'us-east-1', DENIED)])
+
+        checkpoint = self.resume()
+        checkpoint.record(make_record('ec2', 'describe_subnets', 'us-east-1', DENIED))
+        checkpoint.close()
+
+        checkpoint = self.resume()
+
+        self.assertTrue(checkpoint.is_finished('ec2', 'describe_vpcs', 'us-east-1'))
+        self.assertTrue(checkpoint.is_finished('ec2', 'describe_subnets', 'us-east-1'))
+
+    def test_incomplete_last_line(self):
+        self.write([make_record('ec2', 'describe_vpcs', 'us-east-1', DENIED)])
+
+        with open(self.filename, 'a', encoding='utf-8') as f:
+            f.write('{"key": "ec2.describe_sub')
+
+        self.assertTrue(self.resume().is_finished('ec2', 'describe_vpcs', 'us-east-1'))
+
+    def test_missing_file(self):
+        self.assertFalse(self.resume().is_finished('ec2', 'describe_vpcs', 'us-east-1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import threading
+import time
+import unittest
+
+from enumerate_iam.client_cache import ClientCache, make_client_key
+
+
+class ClientCacheTest(unittest.TestCase):
+    def test_single_flight(self):
+        cache = ClientCache()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def factory():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return object()
+
+        def get():
+            results.append(cache.get_or_create('key', factory))
+
+        threads = [threading.Thread(target=get) for _ in range(8)]
+        threads[0].start()
+        started.wait(5)
+
+        for thread in threads[1:]:
+            thread.start()
+
+        # The other threads count a hit before they wait for the first one
+        deadline = time.monotonic() + 5
+        while cache.stats()['hits'] < 7 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(len(results), 0)
+        release.set()
+
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 8)
+        self.assertEqual(len(set(map(id, results))), 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+        self.assertEqual(cache.stats()['hits'], 7)
+
+    def test_lru_eviction(self):
+        cache = ClientCache(max_size=2)
+
+        first = cache.get_or_create('a', object)
+        cache.get_or_create('b', object)
+
+        # "a" is now the most recently used, "b" is evicted
+        self.assertIs(cache.get_or_create('a', object), first)
+        cache.get_or_create('c', object)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertIs(cache.get_or_create('a', object), first)
+
+        calls = []
+        cache.get_or_create('b', lambda: calls.append(1) or object())
+        self.assertEqual(calls, [1])
+
+    def test_resize(self):
+        cache = ClientCache(max_size=4)
+
+        for key in 'abcd':
+            cache.get_or_create(key, object)
+
+        cache.resize(1)
+
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.stats()['evictions'], 3)
+
+    def test_none_is_not_cached(self):
+        cache = ClientCache()
+        calls = []
+
+        def factory():
+            calls.append(1)
+
+        self.assertIsNone(cache.get_or_create('key', factory))
+        self.assertIsNone(cache.get_or_create('key', factory))
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(cache), 0)
+
+    def test_failed_factory_releases_the_waiters(self):
+        cache = ClientCache()
+
+        def factory():
+            raise ValueError('boom')
+
+        with self.assertRaises(ValueError):
+            cache.get_or_create('key', factory)
+
+        self.assertIsNotNone(cache.get_or_create('key', object))
+
+    def test_client_key(self):
+        key = make_client_key('AKIA', 'secret', None, 'ec2', 'us-east-1')
+
+        self.assertEqual(key, make_client_key('AKIA', 'secret', None, 'ec2', 'us-east-1'))
+        self.assertNotEqual(key, make_client_key('AKIA', 'secret', 'token', 'ec2', 'us-east-1'))
+        self.assertNotIn('secret', key)
+
+
+if __name__ == '__main__':
+    unittest.main()
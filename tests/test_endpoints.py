@@ -0,0 +1,101 @@
+import os
+import unittest
+
+import botocore.exceptions
+
+from enumerate_iam import endpoints
+from enumerate_iam.endpoints import EndpointBreaker
+
+ENDPOINT_DATA = {
+    'partitions': [{
+        'regions': {'us-east-1': {}, 'ap-southeast-4': {}},
+        'services': {
+            'ec2': {'endpoints': {'us-east-1': {}, 'ap-southeast-4': {}}},
+            'cloud9': {'endpoints': {'us-east-1': {}}},
+            'iam': {'isRegionalized': False, 'partitionEndpoint': 'aws-global',
+                    'endpoints': {'aws-global': {}}},
+        },
+    }],
+}
+
+
+class FakeLoader:
+    def load_data(self, name):
+        return ENDPOINT_DATA
+
+
+class FakeBotocoreSession:
+    def __init__(self, scoped_config=None):
+        self.scoped_config = scoped_config or {}
+
+    def get_component(self, name):
+        return FakeLoader()
+
+    def get_config_variable(self, name):
+        return False
+
+    def get_scoped_config(self):
+        return self.scoped_config
+
+
+class FakeSession:
+    def __init__(self, scoped_config=None):
+        self._session = FakeBotocoreSession(scoped_config)
+
+
+class EndpointBreakerTest(unittest.TestCase):
+    def setUp(self):
+        endpoints._ENDPOINT_DATA = None
+        self.environ = {name: os.environ.pop(name) for name in list(os.environ)
+                        if name.startswith('AWS_ENDPOINT_URL')}
+
+    def tearDown(self):
+        endpoints._ENDPOINT_DATA = None
+        os.environ.update(self.environ)
+
+    def test_endpoint_data(self):
+        breaker = EndpointBreaker(FakeSession())
+
+        self.assertFalse(breaker.is_open('ec2', 'ap-southeast-4'))
+        self.assertFalse(breaker.is_open('cloud9', 'us-east-1'))
+        self.assertTrue(breaker.is_open('cloud9', 'ap-southeast-4'))
+        self.assertTrue(breaker.is_open('cloud9', 'ap-southeast-4'))
+        self.assertEqual(breaker.short_circuited, 2)
+
+    def test_global_service_and_unknown_region(self):
+        breaker = EndpointBreaker(FakeSession())
+
+        self.assertFalse(breaker.is_open('iam', 'ap-southeast-4'))
+        self.assertFalse(breaker.is_open('cloud9', 'xx-new-1'))
+        self.assertFalse(breaker.is_open('lambda', 'ap-southeast-4'))
+
+    def test_trip(self):
+        breaker = EndpointBreaker(FakeSession())
+        error = botocore.exceptions.EndpointConnectionError(endpoint_url='https://ec2.us-east-1.amazonaws.com')
+
+        self.assertFalse(breaker.is_open('ec2', 'us-east-1'))
+        breaker.trip('ec2', 'us-east-1', error)
+        breaker.trip('ec2', 'us-east-1', error)
+
+        self.assertTrue(breaker.is_open('ec2', 'us-east-1'))
+        self.assertFalse(breaker.is_open('ec2', 'ap-southeast-4'))
+        self.assertEqual(breaker.tripped, {('ec2', 'us-east-1')})
+
+    def test_endpoint_url_override(self):
+        self.assertTrue(EndpointBreaker(FakeSession()).use_endpoint_data)
+
+        for breaker in (EndpointBreaker(FakeSession(), use_endpoint_data=False),
+                        EndpointBreaker(FakeSession(scoped_config={'endpoint_url': 'http://localhost:4566'}))):
+            self.assertFalse(breaker.use_endpoint_data)
+            self.assertFalse(breaker.is_open('cloud9', 'ap-southeast-4'))
+
+        os.environ['AWS_ENDPOINT_URL_EC2'] = 'http://localhost:4566'
+
+        try:
+            self.assertFalse(EndpointBreaker(FakeSession()).use_endpoint_data)
+        finally:
+            del os.environ['AWS_ENDPOINT_URL_EC2']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+
+import botocore.session
+
+from botocore.validate import ParamValidator
+
+from enumerate_iam.generate_bruteforce_tests import (PLACEHOLDER_STRING, PLACEHOLDER_TIMESTAMP, extract_operations,
+                                                     get_placeholder)
+
+API_JSON = {
+    'operations': {
+        'DescribeInstances': {'input': {'shape': 'DescribeInstancesRequest'}},
+        'DescribeInstanceAttribute': {'input': {'shape': 'DescribeInstanceAttributeRequest'}},
+        'GetConsoleScreenshot': {'input': {'shape': 'GetConsoleScreenshotRequest'}},
+        'ListThings': {},
+        'DescribeStacks': {},
+        'TerminateInstances': {'input': {'shape': 'TerminateInstancesRequest'}},
+        'CreateTargetGroup': {'input': {'shape': 'CreateTargetGroupRequest'}},
+    },
+    'shapes': {
+        'DescribeInstancesRequest': {'type': 'structure', 'members': {'DryRun': {'shape': 'Boolean'}}},
+        'DescribeInstanceAttributeRequest': {
+            'type': 'structure',
+            'required': ['Attribute', 'InstanceId'],
+            'members': {'Attribute': {'shape': 'InstanceAttributeName'},
+                        'InstanceId': {'shape': 'String'},
+                        'DryRun': {'shape': 'Boolean'}},
+        },
+        'GetConsoleScreenshotRequest': {
+            'type': 'structure',
+            'required': ['InstanceId', 'ClientToken'],
+            'members': {'InstanceId': {'shape': 'String'},
+                        'ClientToken': {'shape': 'String', 'idempotencyToken': True}},
+        },
+        'TerminateInstancesRequest': {'type': 'structure', 'members': {'DryRun': {'shape': 'Boolean'}}},
+        'CreateTargetGroupRequest': {
+            'type': 'structure',
+            'required': ['Name'],
+            'members': {'Name': {'shape': 'String'}, 'DryRun': {'shape': 'Boolean'}},
+        },
+        'InstanceAttributeName': {'type': 'string', 'enum': ['instanceType', 'kernel']},
+        'String': {'type': 'string'},
+        'Boolean': {'type': 'boolean'},
+    },
+}
+
+PAGINATORS_JSON = {'pagination': {'DescribeInstances': {'input_token': 'NextToken'}}}
+
+
+class ExtractOperationsTest(unittest.TestCase):
+    def test_read_only_operations(self):
+        operations = extract_operations('ec2', API_JSON, PAGINATORS_JSON)
+
+        # describe_stacks is blacklisted, terminate_instances is not read-only
+        # and create_target_group only contains "get_"
+        self.assertEqual(sorted(operations), ['create_target_group',
+                                              'describe_instance_attribute',
+                                              'describe_instances',
+                                              'get_console_screenshot',
+                                              'list_things'])
+
+    def test_metadata(self):
+        operations = extract_operations('ec2', API_JSON, PAGINATORS_JSON)
+
+        self.assertEqual(operations['describe_instances'], {'paginated': True, 'dry_run': True})
+        self.assertEqual(operations['list_things'], {})
+
+        # Idempotency tokens are filled in by botocore
+        self.assertEqual(operations['get_console_screenshot'], {'required': ['InstanceId']})
+
+    def test_dry_run_params(self):
+        operations = extract_operations('ec2', API_JSON)
+
+        self.assertEqual(operations['describe_instance_attribute'],
+                         {'required': ['Attribute', 'InstanceId'],
+                          'dry_run': True,
+                          'dry_run_params': {'Attribute': 'instanceType',
+                                             'InstanceId': 'i-00000000000000000'}})
+
+        # Not read-only, it is never probed
+        self.assertNotIn('dry_run_params', operations['create_target_group'])
+
+    def test_placeholders(self):
+        shapes = {'Count': {'type': 'integer', 'min': 5},
+                  'Ratio': {'type': 'double'},
+                  'Time': {'type': 'timestamp'},
+                  'Names': {'type': 'list', 'member': {'shape': 'String'}},
+                  'Tags': {'type': 'map'},
+                  'String': {'type': 'string'},
+                  'Filter': {'type': 'structure',
+                             'required': ['Name'],
+                             'members': {'Name': {'shape': 'String'}, 'Values': {'shape': 'Names'}}}}
+
+        self.assertEqual(get_placeholder('s3', 'Count', 'Count', shapes), 5)
+        self.assertEqual(get_placeholder('s3', 'Ratio', 'Ratio', shapes), 1.0)
+        self.assertEqual(get_placeholder('s3', 'Time', 'Time', shapes), PLACEHOLDER_TIMESTAMP)
+        self.assertEqual(get_placeholder('s3', 'Names', 'Names', shapes), [PLACEHOLDER_STRING])
+        self.assertEqual(get_placeholder('s3', 'Tags', 'Tags', shapes), {})
+        self.assertEqual(get_placeholder('s3', 'Filter', 'Filter', shapes), {'Name': PLACEHOLDER_STRING})
+        self.assertEqual(get_placeholder('ec2', 'VpcId', 'String', shapes), 'vpc-00000000000000000')
+        self.assertEqual(get_placeholder('s3', 'VpcId', 'String', shapes), PLACEHOLDER_STRING)
+
+    def test_placeholders_pass_botocore_validation(self):
+        session = botocore.session.get_session()
+        api_json = session.get_component('data_loader').load_service_model('ec2', 'service-2')
+        service_model = session.get_service_model('ec2')
+
+        operations = extract_operations('ec2', api_json)
+        probed = {operation_name: metadata['dry_run_params'] for operation_name, metadata in operations.items()
+                  if 'dry_run_params' in metadata}
+
+        self.assertIn('describe_instance_attribute', probed)
+
+        for api_name in service_model.operation_names:
+            operation_name = botocore.xform_name(api_name)
+
+            if operation_name not in probed:
+                continue
+
+            params = dict(probed[operation_name], DryRun=True)
+            report = ParamValidator().validate(params, service_model.operation_model(api_name).input_shape)
+
+            self.assertFalse(report.has_errors(), f'{operation_name}: {report.generate_report()}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from enumerate_iam.histograms import (CLIENT_CONSTRUCTION, REQUEST, RETRIES, SECONDS_BUCKETS, Histograms,
+                                      MetricsExporter, get_quantile, render_json, render_prometheus)
+from enumerate_iam.metrics import ATTEMPTED, THROTTLE_RETRIES, ScanMetrics
+from enumerate_iam.outcomes import ALLOWED, DENIED, make_record
+
+
+def make_scan():
+    histograms = Histograms()
+    histograms.observe(REQUEST, 'ec2', 'us-east-1', 0.004)
+    histograms.observe(REQUEST, 'ec2', 'us-east-1', 0.02)
+    histograms.observe(REQUEST, 'ec2', 'us-east-1', 60.0)
+    histograms.observe(CLIENT_CONSTRUCTION, 's3', 'us-east-1', 0.3)
+    histograms.observe(RETRIES, 'ec2', 'us-east-1', 2)
+
+    metrics = ScanMetrics()
+    metrics.add_total(10)
+    metrics.record(make_record('ec2', 'describe_vpcs', 'us-east-1', ALLOWED))
+    metrics.record(make_record('s3', 'list_buckets', 'us-east-1', DENIED))
+    metrics.increment(ATTEMPTED, 'ec2', amount=2)
+    metrics.increment(THROTTLE_RETRIES, 'ec2')
+
+    return histograms, metrics
+
+
+class QuantileTest(unittest.TestCase):
+    def test_quantile(self):
+        counts = [0] * (len(SECONDS_BUCKETS) + 1)
+        counts[0] = 50
+        counts[4] = 49
+        counts[-1] = 1
+
+        self.assertEqual(get_quantile(SECONDS_BUCKETS, counts, 0.5), SECONDS_BUCKETS[0])
+        self.assertEqual(get_quantile(SECONDS_BUCKETS, counts, 0.99), SECONDS_BUCKETS[4])
+        self.assertIsNone(get_quantile(SECONDS_BUCKETS, counts, 1.0))
+        self.assertIsNone(get_quantile(SECONDS_BUCKETS, [0] * len(counts), 0.5))
+
+
+class RenderTest(unittest.TestCase):
+    def test_render_json(self):
+        histograms, metrics = make_scan()
+        report = render_json(histograms, metrics)
+
+        self.assertEqual(report['operations'], {'total': 10,
+                                                'counts': {ALLOWED: 1, DENIED: 1, ATTEMPTED: 2, THROTTLE_RETRIES: 1}})
+        self.assertEqual(report['services']['s3'], {DENIED: 1})
+
+        request, = report['histograms'][REQUEST]
+        self.assertEqual((request['service'], request['region'], request['unit']), ('ec2', 'us-east-1', 'seconds'))
+        self.assertEqual(request['count'], 3)
+        self.assertAlmostEqual(request['sum'], 60.024)
+        self.assertEqual(request['p50'], 0.025)
+        self.assertIsNone(request['p99'])
+        self.assertEqual(request['buckets']['0.005'], 1)
+        self.assertEqual(request['buckets']['+Inf'], 1)
+
+        retries, = report['histograms'][RETRIES]
+        self.assertEqual((retries['unit'], retries['p50']), ('count', 2))
+
+        # The report is written as JSON
+        json.dumps(report)
+
+    def test_render_prometheus(self):
+        histograms, metrics = make_scan()
+        lines = render_prometheus(histograms, metrics).splitlines()
+
+        labels = 'service="ec2",region="us-east-1"'
+
+        self.assertIn('# TYPE enumerate_iam_request_seconds histogram', lines)
+        self.assertIn('enumerate_iam_request_seconds_bucket{%s,le="0.005"} 1' % labels, lines)
+        self.assertIn('enumerate_iam_request_seconds_bucket{%s,le="0.025"} 2' % labels, lines)
+        self.assertIn('enumerate_iam_request_seconds_bucket{%s,le="30.0"} 2' % labels, lines)
+        self.assertIn('enumerate_iam_request_seconds_bucket{%s,le="+Inf"} 3' % labels, lines)
+        self.assertIn('enumerate_iam_request_seconds_count{%s} 3' % labels, lines)
+        self.assertIn('enumerate_iam_retries_count{%s} 1' % labels, lines)
+        self.assertIn('enumerate_iam_client_construction_seconds_count{service="s3",region="us-east-1"} 1', lines)
+
+        self.assertIn('enumerate_iam_operations_total{service="ec2",outcome="allowed"} 1', lines)
+        self.assertIn('enumerate_iam_operations_total{service="s3",outcome="denied"} 1', lines)
+        self.assertIn('enumerate_iam_attempted_total{service="ec2"} 2', lines)
+        self.assertIn('enumerate_iam_throttle_retries_total{service="ec2"} 1', lines)
+        self.assertIn('enumerate_iam_operations_expected 10', lines)
+
+    def test_escape_labels(self):
+        histograms = Histograms()
+        histograms.observe(REQUEST, 'a"b\\c', 'us-east-1', 0.1)
+
+        self.assertIn('service="a\\"b\\\\c"', render_prometheus(histograms, ScanMetrics()))
+
+
+class MetricsExporterTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_export_on_stop(self):
+        histograms, metrics = make_scan()
+        json_file = os.path.join(self.directory, 'metrics.json')
+        prometheus_file = os.path.join(self.directory, 'metrics.prom')
+
+        MetricsExporter(histograms, metrics, json_file=json_file, prometheus_file=prometheus_file,
+                        interval=0).start().stop()
+
+        with open(json_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['operations']['total'], 10)
+
+        with open(prometheus_file, 'r', encoding='utf-8') as f:
+            self.assertIn('enumerate_iam_operations_expected 10\n', f.read())
+
+        self.assertEqual(sorted(os.listdir(self.directory)), ['metrics.json', 'metrics.prom'])
+
+
+if __name__ == '__main__':
+    unittest.main()
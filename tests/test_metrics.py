@@ -0,0 +1,121 @@
+import threading
+import unittest
+
+from multiprocessing.dummy import Pool as ThreadPool
+
+from enumerate_iam.histograms import REQUEST, SECONDS_BUCKETS, Histograms
+from enumerate_iam.metrics import ATTEMPTED, ScanMetrics
+from enumerate_iam.outcomes import ALLOWED, DENIED, OUTCOMES, SKIPPED, make_record
+
+
+def run_in_threads(function, count):
+    threads = [threading.Thread(target=function) for _ in range(count)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+
+class ScanMetricsTest(unittest.TestCase):
+    def test_counts(self):
+        metrics = ScanMetrics()
+        metrics.record(make_record('s3', 'list_buckets', 'us-east-1', ALLOWED))
+        metrics.record(make_record('ec2', 'describe_vpcs', 'us-east-1', DENIED))
+        metrics.increment(ATTEMPTED, 's3', amount=2)
+
+        self.assertEqual(metrics.get_counts(), {ALLOWED: 1, DENIED: 1, ATTEMPTED: 2})
+        self.assertEqual(metrics.get_service_counts(), {'s3': {ALLOWED: 1, ATTEMPTED: 2}, 'ec2': {DENIED: 1}})
+
+    def test_shards_of_ended_threads_are_retired(self):
+        metrics = ScanMetrics()
+
+        def work():
+            for _ in range(100):
+                metrics.increment(ATTEMPTED, 's3')
+
+        for _ in range(5):
+            run_in_threads(work, 4)
+
+        self.assertEqual(metrics.get(ATTEMPTED), 2000)
+        self.assertEqual(metrics.shards.shards, [])
+
+    def test_thread_pool(self):
+        metrics = ScanMetrics()
+
+        for _ in range(3):
+            pool = ThreadPool(8)
+            pool.map(lambda _: metrics.increment(ATTEMPTED), range(1000))
+            pool.close()
+            pool.join()
+
+        self.assertEqual(metrics.get(ATTEMPTED), 3000)
+        self.assertEqual(metrics.shards.shards, [])
+
+    def test_reset(self):
+        metrics = ScanMetrics()
+        metrics.add_total(10)
+        metrics.increment(ATTEMPTED)
+        run_in_threads(lambda: metrics.increment(ATTEMPTED), 2)
+
+        metrics.reset()
+
+        self.assertEqual(metrics.get_counts(), {})
+        self.assertEqual(metrics.total, 0)
+
+    def test_report_leaves_skipped_operations_out(self):
+        metrics = ScanMetrics()
+        metrics.add_total(3)
+        metrics.record(make_record('s3', 'list_buckets', 'us-east-1', ALLOWED))
+        metrics.record(make_record('ec2', 'describe_vpcs', 'us-east-1', SKIPPED))
+        metrics.record(make_record('ec2', 'describe_subnets', 'us-east-1', SKIPPED))
+
+        with self.assertLogs(level='INFO') as logs:
+            metrics.report(OUTCOMES)
+
+        self.assertIn('1/3 operations tested: 1 allowed', logs.output[0])
+        self.assertIn('2/3 operations skipped', logs.output[1])
+
+    def test_report_when_everything_was_skipped(self):
+        metrics = ScanMetrics()
+        metrics.add_total(1)
+        metrics.record(make_record('ec2', 'describe_vpcs', 'us-east-1', SKIPPED))
+
+        with self.assertLogs(level='INFO') as logs:
+            metrics.report(OUTCOMES)
+
+        self.assertIn('0/1 operations tested', logs.output[0])
+        self.assertIn('1/1 operations skipped', logs.output[1])
+
+    def test_flag(self):
+        metrics = ScanMetrics()
+
+        self.assertTrue(metrics.set_flag('warned'))
+        self.assertFalse(metrics.set_flag('warned'))
+
+
+class HistogramsTest(unittest.TestCase):
+    def test_merge(self):
+        histograms = Histograms()
+
+        def work():
+            histograms.observe(REQUEST, 's3', 'us-east-1', 0.003)
+            histograms.observe(REQUEST, 's3', 'us-east-1', 60.0)
+
+        histograms.observe(REQUEST, 's3', 'us-east-1', 0.003)
+        run_in_threads(work, 3)
+
+        data = histograms.merge()[(REQUEST, 's3', 'us-east-1')]
+
+        self.assertEqual(data[0], 4)
+        self.assertEqual(data[len(SECONDS_BUCKETS)], 3)
+        self.assertAlmostEqual(data[-1], 4 * 0.003 + 3 * 60.0)
+        self.assertEqual(len(histograms.shards.shards), 1)
+
+        histograms.reset()
+        self.assertEqual(histograms.merge(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
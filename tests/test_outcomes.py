@@ -0,0 +1,60 @@
+import unittest
+
+import botocore.exceptions
+
+from botocore.parsers import ResponseParserError
+
+from enumerate_iam.outcomes import (ALLOWED, DENIED, ENDPOINT_FAILED, EXPIRED, FINISHED_OUTCOMES, INVALID,
+                                    THROTTLED, classify_error, is_dry_run_allowed, make_record)
+
+
+def make_client_error(code):
+    return botocore.exceptions.ClientError({'Error': {'Code': code, 'Message': code}}, 'TestOperation')
+
+
+class ClassifyErrorTest(unittest.TestCase):
+    def test_denied(self):
+        self.assertEqual(classify_error(make_client_error('AccessDenied')), DENIED)
+        self.assertEqual(classify_error(make_client_error('UnauthorizedOperation')), DENIED)
+
+    def test_invalid(self):
+        self.assertEqual(classify_error(botocore.exceptions.ParamValidationError(report='missing')), INVALID)
+        self.assertEqual(classify_error(botocore.exceptions.NoAuthTokenError()), INVALID)
+        self.assertEqual(classify_error(ResponseParserError('bad response')), INVALID)
+
+    def test_endpoint_failed(self):
+        self.assertEqual(classify_error(botocore.exceptions.EndpointConnectionError(endpoint_url='https://x')),
+                         ENDPOINT_FAILED)
+        self.assertEqual(classify_error(botocore.exceptions.ConnectTimeoutError(endpoint_url='https://x')),
+                         ENDPOINT_FAILED)
+        self.assertEqual(classify_error(botocore.exceptions.ReadTimeoutError(endpoint_url='https://x')),
+                         ENDPOINT_FAILED)
+
+    def test_expired(self):
+        for code in ('ExpiredToken', 'InvalidClientTokenId', 'UnrecognizedClientException', 'AuthFailure'):
+            self.assertEqual(classify_error(make_client_error(code)), EXPIRED)
+
+    def test_dry_run_allowed(self):
+        self.assertTrue(is_dry_run_allowed(make_client_error('DryRunOperation')))
+        self.assertFalse(is_dry_run_allowed(make_client_error('UnauthorizedOperation')))
+
+
+class FinishedOutcomesTest(unittest.TestCase):
+    def test_network_outcomes_are_tested_again(self):
+        self.assertEqual(FINISHED_OUTCOMES, {ALLOWED, DENIED, INVALID})
+        self.assertNotIn(ENDPOINT_FAILED, FINISHED_OUTCOMES)
+        self.assertNotIn(THROTTLED, FINISHED_OUTCOMES)
+
+    def test_make_record(self):
+        self.assertEqual(make_record('s3', 'list_buckets', 'us-east-1', ALLOWED, {'Buckets': []}),
+                         {'key': 's3.list_buckets',
+                          'service': 's3',
+                          'operation': 'list_buckets',
+                          'region': 'us-east-1',
+                          'outcome': ALLOWED,
+                          'result': {'Buckets': []}})
+        self.assertNotIn('result', make_record('s3', 'list_buckets', 'us-east-1', DENIED))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import time
+import socket
+import threading
+import unittest
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import botocore.session
+
+from botocore.config import Config
+
+from enumerate_iam.prefetch import DNSCache, get_override_address, warm_connection
+
+CALLER_IDENTITY = ('<GetCallerIdentityResponse xmlns="https://sts.amazonaws.com/doc/2011-06-15/">'
+                   '<GetCallerIdentityResult><Arn>arn:aws:iam::123456789012:user/test</Arn>'
+                   '<UserId>AIDATEST</UserId><Account>123456789012</Account></GetCallerIdentityResult>'
+                   '<ResponseMetadata><RequestId>0</RequestId></ResponseMetadata>'
+                   '</GetCallerIdentityResponse>').encode('utf-8')
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = []
+
+    def setup(self):
+        super().setup()
+        self.connections.append(self.client_address)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml')
+        self.send_header('Content-Length', str(len(CALLER_IDENTITY)))
+        self.end_headers()
+        self.wfile.write(CALLER_IDENTITY)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeClient:
+    """
+    A client whose http session has none of the internals warm_connection()
+    relies on
+    """
+    class meta:
+        endpoint_url = 'https://sts.amazonaws.com'
+
+    class _endpoint:
+        http_session = object()
+
+
+class WarmConnectionTest(unittest.TestCase):
+    def setUp(self):
+        KeepAliveHandler.connections = []
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        self.client = botocore.session.get_session().create_client(
+            'sts',
+            region_name='us-east-1',
+            endpoint_url='http://127.0.0.1:%d' % self.server.server_port,
+            aws_access_key_id='AKIATEST',
+            aws_secret_access_key='secret',
+            config=Config(retries={'total_max_attempts': 1}))
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def wait_for_connections(self, count):
+        deadline = time.monotonic() + 5
+
+        while len(KeepAliveHandler.connections) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_first_request_uses_the_warm_connection(self):
+        warm_connection(self.client)
+        self.wait_for_connections(1)
+
+        self.assertEqual(len(KeepAliveHandler.connections), 1)
+
+        self.assertEqual(self.client.get_caller_identity()['Account'], '123456789012')
+        self.assertEqual(self.client.get_caller_identity()['Account'], '123456789012')
+
+        self.assertEqual(len(KeepAliveHandler.connections), 1)
+
+    def test_missing_internals(self):
+        with self.assertRaises(AttributeError):
+            warm_connection(FakeClient())
+
+
+class DNSCacheTest(unittest.TestCase):
+    def test_install_and_uninstall(self):
+        original = socket.getaddrinfo
+        cache = DNSCache()
+
+        self.assertIsNone(cache.resolve('localhost', 443))
+        cache.install()
+
+        try:
+            self.assertIsNot(socket.getaddrinfo, original)
+            self.assertEqual(socket.getaddrinfo('localhost', 443), cache.answers[('localhost', 443)])
+
+            # Not prefetched, answered by the original function
+            self.assertTrue(socket.getaddrinfo('localhost', 80))
+        finally:
+            cache.uninstall()
+
+        self.assertIs(socket.getaddrinfo, original)
+
+        # Uninstalling twice keeps the original function
+        cache.uninstall()
+        self.assertIs(socket.getaddrinfo, original)
+
+    def test_family_and_type(self):
+        cache = DNSCache()
+        cache.answers[('example.test', 443)] = [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('192.0.2.1', 443))]
+        cache.install()
+
+        try:
+            self.assertEqual(socket.getaddrinfo('example.test', 443, socket.AF_INET, socket.SOCK_STREAM),
+                             cache.answers[('example.test', 443)])
+        finally:
+            cache.uninstall()
+
+
+class OverrideAddressTest(unittest.TestCase):
+    def test_override_address(self):
+        self.assertEqual(get_override_address('http://localhost:4566'), ('localhost', 4566))
+        self.assertEqual(get_override_address('https://aws.example.test/path'), ('aws.example.test', 443))
+        self.assertEqual(get_override_address('http://aws.example.test'), ('aws.example.test', 80))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from enumerate_iam.rate_limiter import (HierarchicalRateLimiter, RateLimiter, build_rate_limiter,
+                                        parse_service_rate_limit)
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_burst_up_to_capacity(self):
+        limiter = RateLimiter(5)
+
+        for _ in range(5):
+            self.assertEqual(limiter.try_acquire(), 0.0)
+
+        wait = limiter.try_acquire()
+        self.assertTrue(0 < wait <= 0.2)
+
+
+class HierarchicalRateLimiterTest(unittest.TestCase):
+    def test_region_service_and_global_buckets(self):
+        rate_limiter = HierarchicalRateLimiter(100, {'ec2@us-east-1': 10, 'ec2': 20})
+
+        limiters = rate_limiter.get_limiters('ec2', 'us-east-1')
+        self.assertEqual([limiter.rate for limiter in limiters], [10.0, 20.0, 100.0])
+
+        # The other regions of ec2 only share the service bucket
+        limiters = rate_limiter.get_limiters('ec2', 'eu-west-1')
+        self.assertEqual([limiter.rate for limiter in limiters], [20.0, 100.0])
+        self.assertIs(limiters[0], rate_limiter.get_limiters('ec2', 'us-east-1')[1])
+
+        self.assertEqual([limiter.rate for limiter in rate_limiter.get_limiters('s3', 'us-east-1')], [100.0])
+
+    def test_default_service_rate(self):
+        rate_limiter = HierarchicalRateLimiter(service_rates={'*': 50, 'ec2': 5})
+
+        ec2 = rate_limiter.get_limiters('ec2', 'us-east-1')
+        s3 = rate_limiter.get_limiters('s3', 'us-east-1')
+        sqs = rate_limiter.get_limiters('sqs', 'us-east-1')
+
+        self.assertEqual([limiter.rate for limiter in ec2], [5.0])
+        self.assertEqual([limiter.rate for limiter in s3], [50.0])
+
+        # Every service gets its own bucket at the default rate
+        self.assertIsNot(s3[0], sqs[0])
+
+    def test_limiters_are_built_once(self):
+        rate_limiter = HierarchicalRateLimiter(service_rates={'ec2': 5})
+
+        self.assertIs(rate_limiter.get_limiters('ec2', 'us-east-1'),
+                      rate_limiter.get_limiters('ec2', 'us-east-1'))
+
+    def test_disabled(self):
+        self.assertIsNone(build_rate_limiter())
+        self.assertIsNone(build_rate_limiter(0, {'ec2': 0}))
+        self.assertIsNotNone(build_rate_limiter(service_rate_limits={'ec2@us-east-1': 1}))
+
+
+class ParseServiceRateLimitTest(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(parse_service_rate_limit('ec2=20'), ('ec2', 20.0))
+        self.assertEqual(parse_service_rate_limit('ec2@us-east-1=10'), ('ec2@us-east-1', 10.0))
+        self.assertEqual(parse_service_rate_limit('*=2.5'), ('*', 2.5))
+        self.assertEqual(parse_service_rate_limit(' s3 =1'), ('s3', 1.0))
+
+    def test_invalid(self):
+        for spec in ('ec2', '=10', 'ec2=fast'):
+            with self.assertRaises(ValueError):
+                parse_service_rate_limit(spec)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from enumerate_iam.regions import ALL_REGIONS, parse_regions, resolve_regions
+
+KNOWN_REGIONS = ['us-east-1', 'eu-west-1', 'ap-southeast-4', 'me-central-1']
+
+
+class FakeSession:
+    def get_available_regions(self, service_name):
+        return list(KNOWN_REGIONS)
+
+
+class FakeEC2Client:
+    def __init__(self, regions=None, error=None):
+        self.regions = regions
+        self.error = error
+
+    def describe_regions(self):
+        if self.error is not None:
+            raise self.error
+
+        return {'Regions': [{'RegionName': region} for region in self.regions]}
+
+
+class ResolveRegionsTest(unittest.TestCase):
+    def test_named_regions_without_duplicates(self):
+        self.assertEqual(resolve_regions(FakeSession(), ['eu-west-1', 'us-east-1', 'eu-west-1']),
+                         ['eu-west-1', 'us-east-1'])
+
+    def test_all_regions_without_credentials(self):
+        self.assertEqual(resolve_regions(FakeSession(), [ALL_REGIONS]), KNOWN_REGIONS)
+
+    def test_all_regions_are_the_enabled_regions(self):
+        ec2_client = FakeEC2Client(regions=['us-east-1', 'eu-west-1'])
+
+        self.assertEqual(resolve_regions(FakeSession(), ['eu-west-1', ALL_REGIONS], ec2_client=ec2_client),
+                         ['eu-west-1', 'us-east-1'])
+
+    def test_all_regions_when_describe_regions_is_denied(self):
+        ec2_client = FakeEC2Client(error=Exception('UnauthorizedOperation'))
+
+        with self.assertLogs(level='WARNING'):
+            self.assertEqual(resolve_regions(FakeSession(), [ALL_REGIONS], ec2_client=ec2_client), KNOWN_REGIONS)
+
+    def test_parse_regions(self):
+        self.assertEqual(parse_regions(' us-east-1, ,all'), ['us-east-1', 'all'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from enumerate_iam.outcomes import ALLOWED, DENIED, ENDPOINT_FAILED
+from enumerate_iam.result_cache import READ, REFRESH, WRITE, ResultCache, get_cached_result
+from enumerate_iam.result_detail import FULL, PERMISSION, SUMMARY
+
+IDENTITY = {'Account': '123456789012', 'Arn': 'arn:aws:iam::123456789012:user/scanner'}
+RESPONSE = {'Buckets': [{'Name': 'a'}, {'Name': 'b'}]}
+
+
+def make_record(service_name, operation_name, outcome, result=None, region='us-east-1'):
+    return {'key': '%s.%s' % (service_name, operation_name),
+            'service': service_name,
+            'operation': operation_name,
+            'region': region,
+            'outcome': outcome,
+            'result': result}
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'results.sqlite3')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def store(self, records, **kwargs):
+        cache = ResultCache(self.filename, mode=WRITE)
+        identity_cache = cache.open(IDENTITY, 'catalog', **kwargs)
+
+        for record in records:
+            identity_cache.record(record)
+
+        identity_cache.flush()
+        cache.close()
+
+    def load(self, mode=READ, identity=IDENTITY, catalog_digest='catalog', **kwargs):
+        cache = ResultCache(self.filename, mode=mode)
+        self.addCleanup(cache.close)
+        return cache.open(identity, catalog_digest, **kwargs)
+
+    def test_round_trip(self):
+        self.store([make_record('s3', 'list_buckets', ALLOWED, RESPONSE),
+                    make_record('ec2', 'describe_vpcs', DENIED)])
+
+        identity_cache = self.load()
+
+        self.assertEqual(len(identity_cache), 2)
+        self.assertTrue(identity_cache.is_finished('ec2', 'describe_vpcs', 'us-east-1'))
+        self.assertFalse(identity_cache.is_finished('ec2', 'describe_vpcs', 'eu-west-1'))
+        self.assertEqual(identity_cache.get_allowed(), [make_record('s3', 'list_buckets', ALLOWED, RESPONSE)])
+
+    def test_network_outcomes_are_not_stored(self):
+        self.store([make_record('s3', 'list_buckets', ENDPOINT_FAILED)])
+
+        self.assertEqual(len(self.load()), 0)
+
+    def test_key(self):
+        self.store([make_record('s3', 'list_buckets', DENIED)], endpoint_url='http://127.0.0.1:5000')
+
+        other_user = dict(IDENTITY, Arn='arn:aws:iam::123456789012:user/other')
+
+        self.assertEqual(len(self.load(endpoint_url='http://127.0.0.1:5000')), 1)
+        self.assertEqual(len(self.load()), 0)
+        self.assertEqual(len(self.load(identity=other_user, endpoint_url='http://127.0.0.1:5000')), 0)
+        self.assertEqual(len(self.load(catalog_digest='other', endpoint_url='http://127.0.0.1:5000')), 0)
+
+    def test_dry_run_outcomes_are_not_reused_by_a_normal_scan(self):
+        self.store([make_record('ec2', 'describe_vpcs', ALLOWED, {'DryRun': True})], dry_run=True)
+
+        self.assertEqual(len(self.load()), 0)
+        self.assertEqual(self.load(dry_run=True).get_allowed(),
+                         [make_record('ec2', 'describe_vpcs', ALLOWED, {'DryRun': True})])
+
+    def test_summary_of_a_full_result(self):
+        summary = {'size': 120, 'keys': {'Buckets': 2}}
+        record = dict(make_record('s3', 'list_buckets', ALLOWED, RESPONSE), summary=summary)
+
+        self.store([record], result_detail=FULL)
+
+        self.assertEqual(self.load(result_detail=FULL).get_allowed(), [record])
+        self.assertEqual(self.load(result_detail=SUMMARY).get_allowed(),
+                         [make_record('s3', 'list_buckets', ALLOWED, summary)])
+
+    def test_less_detailed_results_are_not_reused(self):
+        self.store([make_record('s3', 'list_buckets', ALLOWED, True)], result_detail=PERMISSION)
+
+        self.assertEqual(len(self.load(result_detail=PERMISSION)), 1)
+        self.assertEqual(len(self.load(result_detail=FULL)), 0)
+
+    def test_modes(self):
+        self.store([make_record('s3', 'list_buckets', DENIED)])
+
+        self.assertEqual(len(self.load(mode=REFRESH)), 0)
+
+        identity_cache = self.load(mode=READ)
+        identity_cache.record(make_record('ec2', 'describe_vpcs', DENIED))
+        identity_cache.flush()
+
+        self.assertEqual(len(self.load()), 1)
+
+    def test_ttl(self):
+        self.store([make_record('s3', 'list_buckets', DENIED)])
+
+        cache = ResultCache(self.filename, mode=READ, ttl=-1)
+        self.addCleanup(cache.close)
+
+        self.assertEqual(len(cache.open(IDENTITY, 'catalog')), 0)
+
+
+class GetCachedResultTest(unittest.TestCase):
+    def test_permission(self):
+        self.assertIs(get_cached_result(RESPONSE, FULL, PERMISSION), True)
+
+    def test_same_detail(self):
+        self.assertEqual(get_cached_result(RESPONSE, FULL, FULL), RESPONSE)
+
+    def test_summary_of_a_full_result(self):
+        self.assertEqual(get_cached_result(RESPONSE, FULL, SUMMARY), {'keys': {'Buckets': 2}})
+
+    def test_stored_summary_of_a_full_result(self):
+        summary = {'size': 120, 'keys': {'Buckets': 2}}
+
+        self.assertEqual(get_cached_result(RESPONSE, FULL, SUMMARY, summary), summary)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from enumerate_iam.result_detail import FULL, PERMISSION, SUMMARY, get_response_size, get_result, summarize_response
+
+RESPONSE = {'ResponseMetadata': {'RequestId': 'f00',
+                                 'HTTPStatusCode': 200,
+                                 'HTTPHeaders': {'content-length': '1234'}},
+            'Items': [1, 2, 3],
+            'Owner': {'Id': 'abc', 'Name': 'owner'},
+            'NextToken': 'token',
+            'Count': 3}
+
+
+class SummarizeResponseTest(unittest.TestCase):
+    def test_summary(self):
+        self.assertEqual(summarize_response(RESPONSE),
+                         {'size': 1234,
+                          'keys': {'Items': 3, 'Owner': 2, 'NextToken': 5, 'Count': None}})
+
+    def test_without_metadata(self):
+        response = dict(RESPONSE)
+        del response['ResponseMetadata']
+
+        self.assertNotIn('size', summarize_response(response))
+        self.assertEqual(summarize_response(response)['keys']['Items'], 3)
+
+    def test_not_a_dict(self):
+        self.assertEqual(summarize_response(True), {})
+
+    def test_invalid_size(self):
+        self.assertIsNone(get_response_size({'ResponseMetadata': {'HTTPHeaders': {'content-length': 'x'}}}))
+        self.assertIsNone(get_response_size({}))
+
+
+class GetResultTest(unittest.TestCase):
+    def test_permission(self):
+        self.assertIs(get_result(RESPONSE, PERMISSION), True)
+
+    def test_summary(self):
+        self.assertEqual(get_result(RESPONSE, SUMMARY), summarize_response(RESPONSE))
+
+    def test_full(self):
+        result = get_result(dict(RESPONSE), FULL)
+
+        self.assertNotIn('ResponseMetadata', result)
+        self.assertEqual(result['Items'], [1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import time
+import unittest
+
+from enumerate_iam.scheduler import (EXPIRATION_MARGIN, DeadlineScheduler, get_deadline, get_operation_rank,
+                                     get_service_priority, prioritize)
+
+
+class FakeCatalog:
+    def __init__(self, services):
+        self.services = services
+
+    def __iter__(self):
+        return iter(self.services)
+
+    def get_operations(self, service_name, dry_run=False):
+        return list(self.services[service_name])
+
+
+class GetDeadlineTest(unittest.TestCase):
+    def test_no_deadline(self):
+        self.assertIsNone(get_deadline())
+
+    def test_short_time_budget_has_no_margin(self):
+        self.assertEqual(get_deadline(time_budget=25, now=1000), 1025)
+        self.assertEqual(get_deadline(time_budget=5, now=1000), 1005)
+
+    def test_expiration_margin(self):
+        self.assertEqual(get_deadline(expiration=2000, now=1000), 2000 - EXPIRATION_MARGIN)
+
+    def test_earliest(self):
+        self.assertEqual(get_deadline(expiration=2000, time_budget=60, now=1000), 1060)
+        self.assertEqual(get_deadline(expiration=1050, time_budget=600, now=1000), 1050 - EXPIRATION_MARGIN)
+
+
+class DeadlineSchedulerTest(unittest.TestCase):
+    def test_short_budget_leaves_time(self):
+        scheduler = DeadlineScheduler(get_deadline(time_budget=25))
+
+        self.assertFalse(scheduler.is_expired())
+        self.assertTrue(20 < scheduler.get_time_left() <= 25)
+
+    def test_expired(self):
+        self.assertTrue(DeadlineScheduler(time.time() - 1).is_expired())
+
+    def test_estimate(self):
+        scheduler = DeadlineScheduler(time.time() + 100)
+        scheduler.set_total(10)
+
+        remaining, needed, time_left = scheduler.estimate()
+        self.assertEqual(remaining, 10)
+        self.assertIsNone(needed)
+        self.assertTrue(time_left > 90)
+
+        scheduler.start -= 2.0
+        for _ in range(4):
+            scheduler.record_completed()
+
+        remaining, needed, _ = scheduler.estimate()
+        self.assertEqual(remaining, 6)
+        self.assertAlmostEqual(needed, 3.0, delta=0.1)
+
+    def test_skipped(self):
+        scheduler = DeadlineScheduler(time.time() - 1)
+        scheduler.record_skipped('ec2', 'describe_vpcs')
+        scheduler.record_skipped('ec2', 'describe_subnets')
+        scheduler.record_skipped('s3', 'list_buckets')
+
+        self.assertEqual(scheduler.get_skipped_count(), 3)
+
+        with self.assertLogs(level='WARNING') as logs:
+            scheduler.report_skipped()
+
+        self.assertIn('skipped 3 operations across 2 services', logs.output[0])
+
+
+class PrioritizeTest(unittest.TestCase):
+    def test_service_priority(self):
+        self.assertEqual(get_service_priority('iam'), 0)
+        self.assertEqual(get_service_priority('ec2'), 1)
+        self.assertEqual(get_service_priority('pricing'), 2)
+        self.assertEqual(get_service_priority('xray'), 3)
+        self.assertEqual(get_service_priority('sdb'), 4)
+
+    def test_operation_rank(self):
+        self.assertLess(get_operation_rank('list_users'), get_operation_rank('describe_vpcs'))
+        self.assertLess(get_operation_rank('describe_vpcs'), get_operation_rank('get_user'))
+        self.assertLess(get_operation_rank('get_user'), get_operation_rank('search_things'))
+
+    def test_prioritize(self):
+        catalog = FakeCatalog({'sdb': ['list_domains'],
+                               'xray': ['get_groups', 'list_tags'],
+                               'ec2': ['describe_vpcs', 'get_console_output'],
+                               'iam': ['get_user', 'list_users']})
+
+        ordered = prioritize(catalog)
+
+        self.assertEqual(ordered[:2], [('iam', 'list_users'), ('iam', 'get_user')])
+        self.assertEqual(ordered[2], ('ec2', 'describe_vpcs'))
+        self.assertEqual(ordered[-1], ('sdb', 'list_domains'))
+        self.assertEqual(len(ordered), 7)
+
+    def test_same_priority_services_are_interleaved(self):
+        catalog = FakeCatalog({'xray': ['list_a', 'list_b'], 'pipes': ['list_c', 'list_d']})
+
+        services = [service_name for service_name, _ in prioritize(catalog)]
+
+        self.assertNotEqual(services[0], services[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from enumerate_iam.updater import (FAILED, RUNNING, RUNNING_TIMEOUT, UP_TO_DATE, UPDATED, get_state_file, git_pull,
+                                   is_due, load_state, pop_update_notice, save_state, start_update_check)
+
+
+def git(cwd, *args):
+    subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com'] + list(args),
+                   cwd=cwd, check=True, capture_output=True)
+
+
+class UpdateStateTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = get_state_file(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        save_state(self.filename, {'checked_at': 10, 'result': UPDATED})
+
+        self.assertEqual(load_state(self.filename), {'checked_at': 10, 'result': UPDATED})
+
+    def test_missing_or_invalid_state(self):
+        self.assertEqual(load_state(self.filename), {})
+
+        with open(self.filename, 'w', encoding='utf-8') as f:
+            f.write('[1, 2')
+
+        self.assertEqual(load_state(self.filename), {})
+
+    def test_is_due(self):
+        self.assertTrue(is_due({}, 60, now=1000))
+        self.assertFalse(is_due({'checked_at': 990}, 60, now=1000))
+        self.assertTrue(is_due({'checked_at': 900}, 60, now=1000))
+        # The clock was set back
+        self.assertTrue(is_due({'checked_at': 2000}, 60, now=1000))
+
+    def test_is_due_when_running_check_was_abandoned(self):
+        # The launch which started the pull exited before it finished
+        self.assertFalse(is_due({'checked_at': 1000, 'result': RUNNING}, 86400, now=1000 + RUNNING_TIMEOUT - 1))
+        self.assertTrue(is_due({'checked_at': 1000, 'result': RUNNING}, 86400, now=1000 + RUNNING_TIMEOUT))
+        self.assertFalse(is_due({'checked_at': 1000, 'result': UP_TO_DATE}, 86400, now=1000 + RUNNING_TIMEOUT))
+
+    def test_update_notice_is_reported_once(self):
+        save_state(self.filename, {'checked_at': 10, 'result': UPDATED, 'output': 'Fast-forward', 'reported': False})
+
+        self.assertEqual(pop_update_notice(self.directory)['output'], 'Fast-forward')
+        self.assertIsNone(pop_update_notice(self.directory))
+
+    def test_no_notice(self):
+        self.assertIsNone(pop_update_notice(self.directory))
+
+        save_state(self.filename, {'checked_at': 10, 'result': RUNNING})
+        self.assertIsNone(pop_update_notice(self.directory))
+
+        save_state(self.filename, {'checked_at': 10, 'result': UP_TO_DATE, 'reported': True})
+        self.assertIsNone(pop_update_notice(self.directory))
+
+    def test_check_is_not_due(self):
+        save_state(self.filename, {'checked_at': 0, 'result': UP_TO_DATE})
+
+        thread = start_update_check(self.directory, interval=60)
+        self.assertIsNotNone(thread)
+        self.assertIsNone(start_update_check(self.directory, interval=60))
+
+        # Not a git repository
+        thread.join()
+        self.assertEqual(load_state(self.filename)['result'], FAILED)
+
+
+@unittest.skipIf(shutil.which('git') is None, 'git is not installed')
+class GitPullTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.origin = os.path.join(self.directory, 'origin')
+        self.clone = os.path.join(self.directory, 'clone')
+
+        os.mkdir(self.origin)
+        git(self.origin, 'init', '-q', '-b', 'master')
+        self.commit('first')
+        git(self.directory, 'clone', '-q', self.origin, self.clone)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def commit(self, content):
+        with open(os.path.join(self.origin, 'file.txt'), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+        git(self.origin, 'add', 'file.txt')
+        git(self.origin, 'commit', '-q', '-m', content)
+
+    def test_up_to_date(self):
+        self.assertEqual(git_pull(self.clone)[0], UP_TO_DATE)
+
+    def test_updated(self):
+        self.commit('second')
+
+        self.assertEqual(git_pull(self.clone)[0], UPDATED)
+
+        with open(os.path.join(self.clone, 'file.txt'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'second')
+
+    def test_not_a_repository(self):
+        self.assertEqual(git_pull(self.directory)[0], FAILED)
+
+
+if __name__ == '__main__':
+    unittest.main()